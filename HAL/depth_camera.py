@@ -1,3 +1,5 @@
+import time
+
 import pyrealsense2 as rs
 import numpy as np
 import cv2
@@ -25,17 +27,25 @@ class RealSenseCamera:
         
         # 获取内参
         self.intrinsics = None
+
+        # 最近一帧的(设备时间戳秒, 主机接收时间time.monotonic())，供sensor_sync做时间对齐
+        self.last_timestamps = None
         
-    def get_rgb_frame(self):
-        """获取彩色图像帧"""
+    def get_rgb_frame(self, trace=None):
+        """
+        获取彩色图像帧（只取彩色帧，不做深度对齐）
+
+        参数:
+            trace: 可选，basic_functional.tracing.Trace，记录'acquire'（取到帧）
+        """
         # 等待一对连贯的帧
         frames = self.pipeline.wait_for_frames()
-        
-        # 对齐深度帧与颜色帧
-        aligned_frames = self.align.process(frames)
-        
-        # 获取颜色帧
-        color_frame = aligned_frames.get_color_frame()
+        self.last_timestamps = (frames.get_timestamp() / 1000.0, time.monotonic())
+        if trace is not None:
+            trace.mark('acquire')
+
+        # 获取颜色帧（对齐到彩色流不改变彩色帧本身，无需align.process）
+        color_frame = frames.get_color_frame()
         
         if not color_frame:
             return None
@@ -47,6 +57,36 @@ class RealSenseCamera:
         # 转换为numpy数组并返回
         return np.asanyarray(color_frame.get_data())
     
+    def get_aligned_frames(self, trace=None):
+        """
+        一次等待同时获取对齐后的彩色图像和原始深度图
+
+        参数:
+            trace: 可选，basic_functional.tracing.Trace，记录'acquire'（取到帧）与'align'（对齐完成）
+
+        返回:
+            (color_image, depth_image) - BGR图像与z16原始深度(uint16，乘以depth_scale为米)；
+            获取失败返回(None, None)。帧时间戳保存在self.last_timestamps
+        """
+        frames = self.pipeline.wait_for_frames()
+        self.last_timestamps = (frames.get_timestamp() / 1000.0, time.monotonic())
+        if trace is not None:
+            trace.mark('acquire')
+        aligned_frames = self.align.process(frames)
+        color_frame = aligned_frames.get_color_frame()
+        aligned_depth_frame = aligned_frames.get_depth_frame()
+        if trace is not None:
+            trace.mark('align')
+
+        if not color_frame or not aligned_depth_frame:
+            return None, None
+
+        # 保存内参（首次调用时）
+        if self.intrinsics is None:
+            self.intrinsics = color_frame.profile.as_video_stream_profile().intrinsics
+
+        return np.asanyarray(color_frame.get_data()), np.asanyarray(aligned_depth_frame.get_data())
+
     def get_depth_frame(self, min_depth=0.1, max_depth=5.0):
         """
         获取深度图像帧，并只显示指定深度范围内的内容
@@ -0,0 +1,354 @@
+"""
+达妙(DM)系列IMU高速串口/USB驱动
+
+数据帧（主动输出模式，每帧19字节，小端）:
+    0x55 0xAA | 从机ID | 寄存器 | float32 x3 | CRC16 | 0x0A
+    寄存器: 0x01加速度(m/s^2)  0x02角速度(rad/s)  0x03欧拉角(度)
+    CRC16覆盖帧头到数据的前16字节；多项式与初值见CRC16_POLY/CRC16_INIT，
+    若与所用固件手册不一致，只需修改这两个常量。
+
+所有完整帧一次性用np.frombuffer + 结构化dtype解码，帧头/帧尾/CRC校验全部向量化，
+没有逐字节的Python循环；样本带主机单调时间戳写入预分配的环形缓冲区。
+
+用法:
+    imu = DMIMU()
+    imu.open('/dev/ttyACM0', 921600)
+    imu.start()
+    samples = imu.buffer.latest(100)      # 最近100个样本（结构化数组）
+    python -m HAL.dm_imu                  # 用pty模拟设备测试1kHz持续接收
+"""
+import os
+import threading
+import time
+
+import numpy as np
+import serial
+
+HEADER = (0x55, 0xAA)
+TAIL = 0x0A
+PACKET_SIZE = 19
+CRC_SPAN = 16             # 参与CRC计算的字节数
+CRC16_POLY = 0x1021
+CRC16_INIT = 0xFFFF
+
+REG_ACCEL = 0x01
+REG_GYRO = 0x02
+REG_EULER = 0x03
+
+PACKET_DTYPE = np.dtype([
+    ('header', np.uint8, (2,)),
+    ('slave_id', np.uint8),
+    ('reg', np.uint8),
+    ('data', '<f4', (3,)),
+    ('crc', '<u2'),
+    ('tail', np.uint8),
+])
+assert PACKET_DTYPE.itemsize == PACKET_SIZE
+
+SAMPLE_DTYPE = np.dtype([
+    ('t', np.float64),        # 主机单调时间戳(time.monotonic)
+    ('slave_id', np.uint8),
+    ('reg', np.uint8),
+    ('data', np.float32, (3,)),
+])
+
+
+def _crc16_table(poly):
+    table = np.zeros(256, dtype=np.uint16)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) if crc & 0x8000 else (crc << 1)
+        table[i] = crc & 0xFFFF
+    return table
+
+_CRC_TABLE = _crc16_table(CRC16_POLY)
+
+
+def crc16_rows(rows):
+    """
+    对N×L字节矩阵的每一行计算CRC16（逐列循环L次，每次处理全部N行）
+    :return: 长度为N的uint16数组
+    """
+    crc = np.full(rows.shape[0], CRC16_INIT, dtype=np.uint16)
+    for col in range(rows.shape[1]):
+        idx = (crc >> 8) ^ rows[:, col]
+        crc = (crc << 8) ^ _CRC_TABLE[idx]
+    return crc
+
+
+def decode_packets(buf):
+    """
+    解码缓冲区中的全部完整帧
+
+    参数:
+        buf: bytes/bytearray - 串口累积数据
+
+    返回:
+        (packets, ends, consumed, crc_errors)
+        packets: PACKET_DTYPE结构化数组
+        ends: 各帧结束位置在buf中的偏移（用于推算时间戳）
+        consumed: 可从buf头部丢弃的字节数（其后的数据可能是下一帧的开头）
+        crc_errors: 帧头帧尾正确但CRC错误的候选帧数
+    """
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    n = arr.size - PACKET_SIZE + 1
+    if n <= 0:
+        return np.empty(0, PACKET_DTYPE), np.empty(0, np.int64), 0, 0
+
+    starts = np.flatnonzero(
+        (arr[:n] == HEADER[0]) & (arr[1:n + 1] == HEADER[1]) & (arr[PACKET_SIZE - 1:] == TAIL)
+    )
+    rows = arr[starts[:, None] + np.arange(PACKET_SIZE)]
+    received = rows[:, CRC_SPAN].astype(np.uint16) | (rows[:, CRC_SPAN + 1].astype(np.uint16) << 8)
+    valid = crc16_rows(rows[:, :CRC_SPAN]) == received
+    crc_errors = int(valid.size - np.count_nonzero(valid))
+    starts, rows = starts[valid], rows[valid]
+
+    # 去掉与前一帧重叠的候选（数据中恰好出现帧头时）
+    if starts.size > 1:
+        keep = np.diff(starts, prepend=-PACKET_SIZE) >= PACKET_SIZE
+        starts, rows = starts[keep], rows[keep]
+
+    packets = np.ascontiguousarray(rows).view(PACKET_DTYPE).reshape(-1)
+    ends = starts + PACKET_SIZE
+    last_end = int(ends[-1]) if ends.size else 0
+    consumed = max(last_end, arr.size - (PACKET_SIZE - 1))
+    return packets, ends, consumed, crc_errors
+
+
+def encode_packets(regs, data, slave_id=1):
+    """
+    编码N帧（用于模拟设备和测试）
+    :param regs: 长度为N的寄存器编号
+    :param data: N×3 float数组
+    :return: bytes
+    """
+    regs = np.asarray(regs, dtype=np.uint8)
+    packets = np.zeros(regs.size, dtype=PACKET_DTYPE)
+    packets['header'] = HEADER
+    packets['slave_id'] = slave_id
+    packets['reg'] = regs
+    packets['data'] = data
+    packets['tail'] = TAIL
+    raw = packets.view(np.uint8).reshape(-1, PACKET_SIZE)
+    packets['crc'] = crc16_rows(raw[:, :CRC_SPAN])
+    return packets.tobytes()
+
+
+class ImuRingBuffer:
+    """
+    预分配的IMU样本环形缓冲区（SAMPLE_DTYPE），写满后覆盖最旧样本
+
+    参数:
+        capacity: int - 样本容量，默认65536（1kHz约65秒）
+    """
+
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.samples = np.zeros(capacity, dtype=SAMPLE_DTYPE)
+        self.total = 0              # 累计写入样本数
+        self._lock = threading.Lock()
+
+    def push(self, samples):
+        """批量写入样本（最多两段切片拷贝）"""
+        total = samples.size
+        if total == 0:
+            return
+        # 超过容量时只写入最后capacity个，但total仍按实际样本数累计，
+        # 写入位置跳过被丢弃的部分，保证latest()的顺序与total一致
+        skipped = max(total - self.capacity, 0)
+        samples = samples[skipped:]
+        n = samples.size
+        with self._lock:
+            pos = (self.total + skipped) % self.capacity
+            first = min(n, self.capacity - pos)
+            self.samples[pos:pos + first] = samples[:first]
+            if first < n:
+                self.samples[:n - first] = samples[first:]
+            self.total += total
+
+    def latest(self, n=None, reg=None):
+        """
+        按时间顺序返回最近n个样本的拷贝；reg不为None时只返回该寄存器的样本
+        """
+        with self._lock:
+            count = min(self.total, self.capacity)
+            n = count if n is None else min(n, count)
+            end = self.total % self.capacity
+            idx = (end - n + np.arange(n)) % self.capacity
+            out = self.samples[idx]
+        if reg is not None:
+            out = out[out['reg'] == reg]
+        return out
+
+
+class DMIMU:
+    """
+    DM IMU驱动：批量读取串口数据、向量化解码并写入环形缓冲区
+
+    参数:
+        capacity: int - 环形缓冲区容量
+        byte_time: float - 每字节传输时间（秒），用于把一次读取中较早的帧的时间戳
+                   往前推算；None时按10位/字节和波特率计算，USB虚拟串口可设为0
+    """
+
+    def __init__(self, capacity=1 << 16, byte_time=None):
+        self.ser = None
+        self.buffer = ImuRingBuffer(capacity)
+        self.byte_time = byte_time
+        self._rx = bytearray()
+        self._thread = None
+        self._running = False
+        # 统计
+        self.packets = 0
+        self.crc_errors = 0
+        self.bytes_read = 0
+
+    def open(self, port, baudrate=921600):
+        """打开串口，成功返回True"""
+        try:
+            self.ser = serial.Serial(port=port, baudrate=baudrate, timeout=0.01)
+        except Exception as e:
+            print(f"\r\033[031m打开IMU串口失败:{e}\033[0m")
+            return False
+        if self.byte_time is None:
+            self.byte_time = 10.0 / baudrate
+        return True
+
+    def poll(self):
+        """
+        读取当前可用的全部数据并解码，返回本次新增的样本数
+        （无数据时最多阻塞串口超时时间10ms）
+        """
+        data = self.ser.read(self.ser.in_waiting or 1)
+        t_read = time.monotonic()
+        if not data:
+            return 0
+        self.bytes_read += len(data)
+        self._rx += data
+
+        packets, ends, consumed, crc_errors = decode_packets(self._rx)
+        self.crc_errors += crc_errors
+        if packets.size:
+            samples = np.empty(packets.size, dtype=SAMPLE_DTYPE)
+            # 帧结束得越早，到达主机的时间越早
+            samples['t'] = t_read - (len(self._rx) - ends) * self.byte_time
+            samples['slave_id'] = packets['slave_id']
+            samples['reg'] = packets['reg']
+            samples['data'] = packets['data']
+            self.buffer.push(samples)
+            self.packets += packets.size
+        del self._rx[:consumed]
+        return packets.size
+
+    def _run(self):
+        while self._running:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"IMU读取异常：{e}")
+                time.sleep(0.01)
+
+    def start(self):
+        """在后台线程中持续接收"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def close(self):
+        """停止接收并关闭串口"""
+        self.stop()
+        if self.ser and self.ser.is_open:
+            self.ser.close()
+        self.ser = None
+
+
+class PtyImuEmulator:
+    """
+    基于pty的IMU模拟设备：按rate_hz轮流发送加速度/角速度/欧拉角帧，无需硬件（仅Linux/macOS）
+
+    参数:
+        rate_hz: float - 总帧率，默认1000
+        corrupt_every: int - 每隔多少帧插入一帧CRC错误的帧，0表示不插入
+
+    用法:
+        emu = PtyImuEmulator(1000)
+        emu.start()
+        imu.open(emu.port)
+    """
+
+    def __init__(self, rate_hz=1000, corrupt_every=0):
+        self.rate_hz = rate_hz
+        self.corrupt_every = corrupt_every
+        import tty      # pty/tty仅POSIX可用，驱动本身只依赖pyserial
+        self.master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self.sent = 0
+        self._running = False
+        self._thread = None
+
+    def _frames(self, first, count):
+        k = np.arange(first, first + count)
+        regs = REG_ACCEL + k % 3
+        t = k / self.rate_hz
+        data = np.stack([np.sin(t), np.cos(t), k.astype(np.float64)], axis=1)
+        raw = bytearray(encode_packets(regs, data))
+        if self.corrupt_every:
+            for i in np.flatnonzero(k % self.corrupt_every == self.corrupt_every - 1):
+                raw[i * PACKET_SIZE + CRC_SPAN] ^= 0xFF
+        return bytes(raw)
+
+    def _run(self):
+        t0 = time.perf_counter()
+        while self._running:
+            # 按时间计算应发帧数，一次写出，避免依赖sleep精度
+            due = int((time.perf_counter() - t0) * self.rate_hz)
+            if due > self.sent:
+                os.write(self.master, self._frames(self.sent, due - self.sent))
+                self.sent = due
+            time.sleep(0.001)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        os.close(self.master)
+        os.close(self._slave)
+
+
+# 示例：模拟设备1kHz持续发送，验证驱动的接收速率
+if __name__ == "__main__":
+    import sys
+
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    emu = PtyImuEmulator(rate_hz=1000, corrupt_every=500)
+    imu = DMIMU(byte_time=0)
+    emu.start()
+    if not imu.open(emu.port, 921600):
+        sys.exit(1)
+    imu.start()
+    time.sleep(duration)
+    imu.stop()
+    emu._running = False
+    time.sleep(0.01)
+    while imu.poll():
+        pass
+    latest = imu.buffer.latest(3)
+    print(f"发送 {emu.sent} 帧 | 接收 {imu.packets} 帧 ({imu.packets / duration:.0f} Hz) | "
+          f"CRC错误 {imu.crc_errors} | 字节 {imu.bytes_read}")
+    print(f"最新样本: {latest}")
+    imu.close()
+    emu.stop()
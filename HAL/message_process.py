@@ -4,7 +4,17 @@ import time
 import serial
 import serial.tools.list_ports
 import sys
+import os
+import json
+import threading
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+if not __package__:
+    # 直接运行python HAL/message_process.py时，把仓库根目录加入导入路径
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from basic_functional.fast_log import get_logger
+
+log = get_logger('serial')
 running = True
 joystick = None
 check_funcs = {135,245,13,19}
@@ -165,6 +175,7 @@ class SerialCommunicator:
     def __init__(self):
         self.ser = None
         self.default_checksum_type = None  # 默认无校验
+        self.last_read_time = None  # 最近一帧读完时的主机时间time.monotonic()，供sensor_sync对齐
 
     def open(self, port, baudrate, bytesize=8, parity='N', stopbits=1):
         """打开串口
@@ -188,16 +199,19 @@ class SerialCommunicator:
             print(f"\r\033[031m打开串口失败:{e}\033[0m")
             return False
         
-    def send(self):
+    def send(self, trace=None):
+        """
+        发送msg
+        :param trace: 可选，basic_functional.tracing.Trace，写出后记录'transmit'
+        """
         #self.ser.write(self.default_header)
-        for  data_msg in msg:
-            # 将整数转换为十六进制
-            
-            byte_data = bytes([data_msg])
-
-            self.ser.write(byte_data)
-            print(byte_data,end = '')
-        print("",end="\r")
+        # 先整帧取快照再一次写出：其他线程（如按键发布）同时修改msg时不会发出半新半旧的帧
+        frame = bytes(msg)
+        self.ser.write(frame)
+        if trace is not None:
+            trace.mark('transmit')
+        # 日志由后台线程写出，限频避免终端I/O拖慢发送循环
+        log.info("send %s", frame, every=0.5)
         #self.ser.write(self.default_footer)
         
     def read(self, size=20, check_values=None):
@@ -212,19 +226,19 @@ class SerialCommunicator:
         # 校验check_values参数合法性
         required_check_indices = {0, 5, 13, 19}  # 固定校验位位置
         if not check_values or not isinstance(check_values, dict):
-            print("错误：check_values必须是包含校验位的字典")
+            log.error("check_values必须是包含校验位的字典", every=1.0)
             return False ,msg_get
         if set(check_values.keys()) != required_check_indices:
-            print(f"错误：check_values必须包含键{required_check_indices}")
+            log.error("check_values必须包含键%s", required_check_indices, every=1.0)
             return False ,msg_get
         for idx, val in check_values.items():
             if not isinstance(val, int) or not (0 <= val <= 255):
-                print(f"错误：校验位{idx}的值必须是0-255的整数")
+                log.error("校验位%d的值必须是0-255的整数", idx, every=1.0)
                 return False ,msg_get
         
         # 检查串口状态
         if not (self.ser and self.ser.is_open):
-            print("串口未打开")
+            log.error("串口未打开", every=1.0)
             return False ,msg_get
         
         try:
@@ -234,32 +248,44 @@ class SerialCommunicator:
                 remaining = 20 - len(raw_data)
                 chunk = self.ser.read(remaining)  # 读取剩余所需字节
                 if not chunk:  # 无数据（超时或断开）
-                    print(f"警告：仅读取到{len(raw_data)}字节（需20字节）")
+                    log.warning("仅读取到%d字节（需20字节）", len(raw_data), every=0.5)
                     return False ,msg_get   # 返回错误
                 raw_data += chunk
+            self.last_read_time = time.monotonic()
             
             # 校验所有预设校验位
             all_check_passed = True
             for idx in required_check_indices:
                 if raw_data[idx] != check_values[idx]:
-                    print(f"校验位{idx}不匹配：接收值={msg_get[idx]}, 预设值={check_values[idx]}")
+                    log.warning("校验位%d不匹配：接收值=%d, 预设值=%d", idx, raw_data[idx], check_values[idx], every=0.5)
                     all_check_passed = False
 
             # 根据校验结果返回对应数据
             if all_check_passed:
-                print("所有校验位匹配，校验通过")
+                log.debug("所有校验位匹配，校验通过", every=1.0)
                 # 将原始数据逐个字节写入msg_get（转换为int值）
                 for i in range(20):
                     msg_get[i] = raw_data[i]  # raw_data[i]为单个字节，转为0-255的int
                 return True , msg_get  # 返回填充后的数组
             else:
-                print("校验失败，返回原始数据")
+                log.warning("校验失败 %s", raw_data, every=0.5)
                 return True , msg_get  # 返回0数据
         
         except Exception as e:
-            print(f"读取数据异常：{e}")
+            log.error("读取数据异常：%s", e, every=1.0)
             return None
         
+    def open_auto(self, check_values, baudrate=115200, **kwargs):
+        """
+        自动识别下位机串口并打开，参数见discover_port
+        :return: 打开成功返回端口名，未找到或打开失败返回None
+        """
+        port = discover_port(check_values, baudrate=baudrate, **kwargs)
+        if port is None:
+            print("\r\033[031m未找到符合协议的串口\033[0m")
+            return None
+        return port if self.open(port, baudrate) else None
+
     def close(self):
         """关闭串口"""
         if self.ser and self.ser.is_open:
@@ -392,5 +418,123 @@ def com_switch(com):
                 return com
         time.sleep(0.1)
 
+# ---------------------- 串口自动识别 ----------------------
+FRAME_SIZE = 20
+PORT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".mcms_port_cache.json")
+
+def find_frame(data, check_values, size=FRAME_SIZE):
+    """
+    在字节流中查找第一个校验位全部匹配的完整帧（向量化，无逐字节循环）
+    :param data: bytes/bytearray
+    :param check_values: 校验位字典，如{0: val0, 5: val5, 13: val13, 19: val19}
+    :return: 帧起始偏移，未找到返回-1
+    """
+    arr = np.frombuffer(bytes(data), dtype=np.uint8)
+    n = arr.size - size + 1
+    if n <= 0:
+        return -1
+    ok = np.ones(n, dtype=bool)
+    for idx, val in check_values.items():
+        ok &= arr[idx:idx + n] == val
+    hits = np.flatnonzero(ok)
+    return int(hits[0]) if hits.size else -1
+
+def _port_key(port_info):
+    """USB设备的稳定标识 VID:PID:序列号；非USB设备返回None"""
+    if getattr(port_info, "vid", None) is None:
+        return None
+    return f"{port_info.vid:04X}:{port_info.pid:04X}:{port_info.serial_number or ''}"
+
+def _load_port_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_port_cache(path, cache):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"警告：无法写入串口缓存{path}：{e}")
+
+def _probe_port(device, baudrate, check_values, listen_time, stop_event):
+    """打开一个候选串口并监听listen_time秒，收到校验通过的帧则返回端口名"""
+    try:
+        ser = serial.Serial(port=device, baudrate=baudrate, timeout=0.005)
+    except Exception:
+        return None
+    try:
+        buf = bytearray()
+        deadline = time.perf_counter() + listen_time
+        while not stop_event.is_set() and time.perf_counter() < deadline:
+            chunk = ser.read(ser.in_waiting or 1)
+            if not chunk:
+                continue
+            buf += chunk
+            if find_frame(buf, check_values) >= 0:
+                return device
+            # 只保留最后不足一帧的数据
+            del buf[:-(FRAME_SIZE - 1)]
+        return None
+    except Exception:
+        return None
+    finally:
+        ser.close()
+
+def discover_port(check_values, baudrate=115200, listen_time=0.05, ports=None,
+                  cache_path=PORT_CACHE_PATH):
+    """
+    自动识别正在发送本协议帧的下位机串口
+
+    枚举serial.tools.list_ports中的全部串口，在线程池上同时打开并监听，任一端口
+    在listen_time内收到校验位{0,5,13,19}全部匹配的20字节帧即返回，其余探测立即停止。
+    识别结果按USB VID:PID:序列号缓存，下次优先单独验证缓存中的设备
+    （即使重启后设备名从ttyUSB0变为ttyUSB1也能命中）。
+
+    :param check_values: 校验位字典，格式同SerialCommunicator.read()
+    :param baudrate: 波特率
+    :param listen_time: 每个端口的最长监听时间（秒），应略大于下位机发帧周期
+    :param ports: 可选，候选端口名列表；默认枚举全部串口
+    :param cache_path: 缓存文件路径，None表示不使用缓存
+    :return: 识别到的端口名，未找到返回None
+    """
+    if ports is None:
+        infos = list(serial.tools.list_ports.comports())
+        ports = [info.device for info in infos]
+        keys = {info.device: _port_key(info) for info in infos}
+    else:
+        keys = {}
+    if not ports:
+        print("无串口设备。")
+        return None
+
+    cache = _load_port_cache(cache_path) if cache_path else {}
+    stop_event = threading.Event()
+
+    # 缓存命中的设备先单独验证
+    cached = [p for p in ports if keys.get(p) in cache]
+    for device in cached:
+        if _probe_port(device, baudrate, check_values, listen_time, stop_event):
+            return device
+
+    found = None
+    candidates = [p for p in ports if p not in cached]
+    if candidates:
+        with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+            futures = [pool.submit(_probe_port, p, baudrate, check_values, listen_time, stop_event)
+                       for p in candidates]
+            for future in as_completed(futures):
+                found = future.result()
+                if found:
+                    stop_event.set()
+                    break
+
+    if found is not None and cache_path and keys.get(found):
+        cache[keys[found]] = {"device": found, "baudrate": baudrate}
+        _save_port_cache(cache_path, cache)
+    return found
+
 if __name__ == "__main__":
     print("测试message_process模块")
\ No newline at end of file
@@ -1,8 +1,10 @@
 from pynput import keyboard
+from pynput import mouse as pynput_mouse
 from pynput.mouse import Controller
 import time
 import threading
 import platform
+from collections import namedtuple
 
 # ---------------------- 全局初始化（线程安全+跨平台） ----------------------
 # 线程锁（保障按键数组更新安全）
@@ -30,6 +32,78 @@ center_x, center_y, screen_width, screen_height = get_screen_info()
 key_array = [127, 127, 127, 127]  # 四位数组：[上下, 左右, 预留, 预留]
 pressed_keys = {'w': False, 's': False, 'a': False, 'd': False}
 
+# 按键状态快照：seq每次变化加1，keys为不可变元组
+KeySnapshot = namedtuple('KeySnapshot', ['seq', 'keys', 'timestamp'])
+
+# 20字节串口帧的校验位下标（见message_process.py），按键字段不能占用
+FRAME_CHECK_INDICES = (0, 5, 13, 19)
+
+class KeyboardInputSource:
+    """
+    按键状态发布器：key_array每次变化都生成一个带序号的不可变快照
+
+    读者无需加锁即可取得最新快照（snapshot属性是一次引用读取）；bind_frame()把按键值
+    在变化瞬间直接写进发送帧（如message_process.msg），按键在下一个发送周期就能上线，
+    而不必等调用方下一次轮询复制。
+
+    用法:
+        from HAL import message_process as mp
+        keyboard_source.bind_frame(mp.msg, reserved=[1, 2])   # 写入msg[15:19]，避开PID控制通道msg[1]、msg[2]
+    """
+
+    def __init__(self, keys):
+        self._lock = threading.Lock()
+        self.snapshot = KeySnapshot(0, tuple(keys), time.monotonic())
+        self._frames = []  # [(帧, 切片)]
+
+    def publish(self, keys):
+        """发布新的按键状态；与当前快照相同时不做任何事。返回当前快照"""
+        keys = tuple(keys)
+        with self._lock:
+            current = self.snapshot
+            if keys == current.keys:
+                return current
+            snapshot = KeySnapshot(current.seq + 1, keys, time.monotonic())
+            # 切片赋值是一次原子操作，发送端不会看到只更新了一半的按键字段
+            for frame, fields in self._frames:
+                frame[fields] = keys
+            self.snapshot = snapshot
+        return snapshot
+
+    def bind_frame(self, frame, start=15, reserved=()):
+        """
+        绑定发送帧：此后每次按键变化都直接写入frame[start:start+4]，并立即写入当前值
+
+        参数:
+            frame: list - 发送帧，如message_process.msg
+            start: int - 按键字段在帧中的起始下标，默认15（msg[14:19]为空闲字段）
+            reserved: 可迭代对象 - 其他模块写入的下标（如PID控制通道），按键字段不能与其重叠
+
+        异常:
+            ValueError - 按键字段超出帧范围，或与校验位、reserved重叠；此时不绑定
+        """
+        end = start + len(self.snapshot.keys)
+        if start < 0 or end > len(frame):
+            raise ValueError(f"按键字段frame[{start}:{end}]超出{len(frame)}字节帧")
+        fields = range(start, end)
+        check = sorted(set(fields) & set(FRAME_CHECK_INDICES))
+        if check:
+            raise ValueError(f"按键字段frame[{start}:{end}]与校验位{check}重叠")
+        taken = sorted(set(fields) & set(reserved))
+        if taken:
+            raise ValueError(f"按键字段frame[{start}:{end}]与已占用的下标{taken}重叠")
+        fields = slice(start, end)
+        with self._lock:
+            frame[fields] = self.snapshot.keys
+            self._frames.append((frame, fields))
+
+    def unbind_frame(self, frame):
+        """解除帧绑定"""
+        with self._lock:
+            self._frames = [(f, fields) for f, fields in self._frames if f is not frame]
+
+keyboard_source = KeyboardInputSource(key_array)
+
 def update_key_array():
     """更新按键数组（WS/AD互斥处理）"""
     with key_lock:
@@ -52,6 +126,9 @@ def update_key_array():
             key_array[1] = 0
         else:
             key_array[1] = 127
+        
+        # 发布快照（持锁发布，保证快照顺序与key_array的修改顺序一致）
+        keyboard_source.publish(key_array)
 
 def on_key_press(key):
     """按键按下回调"""
@@ -100,11 +177,101 @@ def move_mouse_relative(dx, dy):
     mouse.position = (target_x, target_y)
     return (round(target_x, 1), round(target_y, 1))
 
+class MouseDeltaCapture:
+    """
+    事件驱动的鼠标相对位移采集
+
+    由pynput.mouse.Listener在每个移动事件中累加相对位移（只在极短的临界区内加锁），
+    控制循环可以以任意频率调用drain()取走自上次以来的总位移，两次轮询之间的
+    运动不会丢失，读取开销为一次加锁和几次赋值。
+
+    recenter=True时为指针锁定模式：指针偏离屏幕中心超过recenter_margin像素后，
+    用move_mouse_relative()把它拉回中心并立即以中心为参考位置；回中产生的移动事件
+    按坐标识别后忽略，即使该事件丢失或与其他移动合并也不会产生跳变，
+    因此指针不会卡在屏幕边缘。
+
+    参数:
+        recenter: bool - 是否启用指针锁定（回中）模式
+        recenter_margin: float - 触发回中的偏离距离（像素）
+
+    用法:
+        capture = MouseDeltaCapture(recenter=True)
+        capture.start()
+        dx, dy, events = capture.drain()
+    """
+
+    def __init__(self, recenter=False, recenter_margin=200):
+        self.recenter = recenter
+        self.recenter_margin = recenter_margin
+        self._lock = threading.Lock()
+        self._dx = 0.0
+        self._dy = 0.0
+        self._events = 0
+        self._last = None        # 上一个事件的指针位置
+        self._warp_target = None # 回中移动的目标位置，对应事件不计入位移
+        self._listener = None
+
+    def _on_move(self, x, y):
+        warp = self._warp_target
+        if warp is not None:
+            # 回中后的第一个事件：坐标与回中目标一致的就是回中本身产生的事件，直接忽略；
+            # 不一致说明该事件已丢失或与真实移动合并，按正常事件以回中目标为参考计算位移
+            self._warp_target = None
+            if abs(x - warp[0]) <= 1 and abs(y - warp[1]) <= 1:
+                return
+        last = self._last
+        self._last = (x, y)
+        if last is None:
+            return
+        with self._lock:
+            self._dx += x - last[0]
+            self._dy += y - last[1]
+            self._events += 1
+
+        if self.recenter and (abs(x - center_x) > self.recenter_margin
+                              or abs(y - center_y) > self.recenter_margin):
+            # 参考位置立即设为回中后的位置，不依赖监听器能否收到回中产生的事件
+            warp = move_mouse_relative(round(center_x) - x, round(center_y) - y)
+            self._last = self._warp_target = warp
+
+    def start(self):
+        """启动监听线程；回中模式下先把指针移到屏幕中心"""
+        if self.recenter:
+            current_x, current_y = mouse.position
+            self._warp_target = move_mouse_relative(round(center_x) - current_x,
+                                                    round(center_y) - current_y)
+        self._last = mouse.position
+        self._listener = pynput_mouse.Listener(on_move=self._on_move)
+        self._listener.start()
+        return self._listener
+
+    def stop(self):
+        """停止监听线程"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def drain(self):
+        """
+        取走并清零累计的相对位移
+
+        返回:
+            (dx, dy, events) - 自上次drain以来的总位移（右/下为正）和移动事件数
+        """
+        with self._lock:
+            dx, dy, events = self._dx, self._dy, self._events
+            self._dx = self._dy = 0.0
+            self._events = 0
+        return dx, dy, events
+
 # ---------------------- 主程序（实时输出+功能演示） ----------------------
 def main():
     # 启动键盘监听器（异步线程）
     key_listener = keyboard.Listener(on_press=on_key_press, on_release=on_key_release)
     key_listener.start()
+    # 事件驱动的鼠标增量采集（不回中，避免演示时抢占指针）
+    mouse_capture = MouseDeltaCapture()
+    mouse_capture.start()
 
     print("=" * 80)
     print(f"屏幕信息：{screen_width}×{screen_height} 像素 | 中心位置：({center_x:.1f}, {center_y:.1f})")
@@ -112,7 +279,8 @@ def main():
     print("1. WSAD按键控制四位数组：[上下(W=255/S=0), 左右(D=255/A=0), 127, 127]（同时按对应位=127）")
     print("2. 实时输出鼠标与中心的相对距离（dx, dy）")
     print("3. 调用 move_mouse_relative(dx, dy) 实现鼠标相对移动")
-    print("4. 按 ESC 键退出程序")
+    print("4. 事件驱动累计两次刷新之间的鼠标增量（MouseDeltaCapture.drain）")
+    print("5. 按 ESC 键退出程序")
     print("=" * 80)
 
     # 可选：测试自定义鼠标移动（取消注释即可）
@@ -129,14 +297,18 @@ def main():
                 current_keys = key_array.copy()
             # 读取鼠标相对距离
             mouse_offset = get_mouse_center_offset()
+            # 读取两次刷新之间的累计增量
+            delta_x, delta_y, events = mouse_capture.drain()
 
-            # 格式化输出（清晰显示两项核心数据）
-            print(f"\r按键数组：{current_keys} | 鼠标-中心相对距离：dx={mouse_offset[0]:6.1f}px, dy={mouse_offset[1]:6.1f}px", end="")
+            # 格式化输出（清晰显示核心数据）
+            print(f"\r按键数组：{current_keys} | 鼠标-中心相对距离：dx={mouse_offset[0]:6.1f}px, dy={mouse_offset[1]:6.1f}px"
+                  f" | 增量：{delta_x:6.1f}, {delta_y:6.1f} ({events}次事件)", end="")
             time.sleep(0.1)
     except KeyboardInterrupt:
         pass
     finally:
         # 优雅退出
+        mouse_capture.stop()
         key_listener.stop()
         key_listener.join()
         print("\n\n程序已退出！")
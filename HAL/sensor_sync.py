@@ -0,0 +1,284 @@
+"""
+多传感器时间对齐缓冲
+
+相机帧、下位机反馈(SerialCommunicator.read)和IMU样本各自到达、时钟不同。
+每个数据流保存在一个带时间戳的定长环形缓冲区中，所有时间统一为主机单调时间
+(time.monotonic())，可按任意时刻做最近邻/线性插值查询（二分查找，O(log n)）。
+
+设备自带时间戳（如RealSense帧时间、带计数器的下位机帧）时，用ClockOffsetEstimator
+在线估计"主机时间 - 设备时间"的偏移：传输延迟只会让偏移变大，因此取滑动窗口内的
+最小值作为估计，把设备时间换算到主机时间轴后再入库，消除传输抖动。
+
+内存有界：每个流容量固定（capacity），另可用max_age按时间淘汰旧数据。
+
+用法:
+    sync = SensorSync()
+    sync.add_stream('imu_gyro', shape=(3,), capacity=4096, max_age=2.0)
+    sync.add_stream('mcu', shape=(20,), capacity=256)
+    sync.push('mcu', msg_get, t=sc.last_read_time)
+    ...
+    state = sync.query(frame_time, mode='linear', tolerance=0.02)
+    # {'imu_gyro': array([...]), 'mcu': array([...])}，缺失或超出容差的流为None
+"""
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class ClockOffsetEstimator:
+    """
+    设备时钟到主机时钟的偏移估计（滑动窗口最小值，单调队列实现，摊还O(1)）
+
+    参数:
+        window: float - 窗口长度（主机时间，秒），需覆盖若干个低延迟样本；
+                窗口同时限制了对时钟漂移的跟踪速度
+    """
+
+    def __init__(self, window=2.0):
+        self.window = window
+        self._q = deque()   # (host_t, offset)，offset单调递增
+        self.samples = 0
+
+    def observe(self, device_t, host_t):
+        """记录一对(设备时间, 主机接收时间)，返回当前偏移估计"""
+        offset = host_t - device_t
+        q = self._q
+        while q and q[-1][1] >= offset:
+            q.pop()
+        q.append((host_t, offset))
+        while q[0][0] < host_t - self.window:
+            q.popleft()
+        self.samples += 1
+        return q[0][1]
+
+    @property
+    def offset(self):
+        """当前偏移估计（秒），尚无样本时为None"""
+        return self._q[0][1] if self._q else None
+
+    def to_host(self, device_t):
+        """把设备时间换算为主机时间"""
+        return device_t + self._q[0][1]
+
+
+class SensorStream:
+    """
+    单个数据流的时间戳环形缓冲区
+
+    参数:
+        name: str - 流名称
+        shape: tuple - 单个样本的形状，标量为()
+        capacity: int - 最多保存的样本数
+        max_age: float - 可选，比最新样本早max_age秒以上的样本被淘汰
+        dtype: 样本数据类型，默认float64
+        clock_window: float - 设备时钟偏移估计的窗口（秒）
+    """
+
+    def __init__(self, name, shape=(), capacity=1024, max_age=None, dtype=np.float64,
+                 clock_window=2.0):
+        self.name = name
+        self.capacity = capacity
+        self.max_age = max_age
+        self._t = np.zeros(capacity)
+        self._v = np.zeros((capacity,) + tuple(shape), dtype=dtype)
+        self._first = 0       # 最旧有效样本的绝对序号
+        self._next = 0        # 下一个样本的绝对序号
+        self.clock = ClockOffsetEstimator(clock_window)
+        self.dropped = 0      # 时间戳倒退而被丢弃的样本数
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._next - self._first
+
+    def push(self, value, t=None, device_t=None):
+        """
+        写入一个样本
+
+        参数:
+            value: 样本数据
+            t: 主机接收时间，默认time.monotonic()
+            device_t: 可选，设备时间（秒）；给出时更新时钟偏移，并以换算后的主机时间入库
+        返回:
+            bool - 时间戳早于已有最新样本时丢弃并返回False
+        """
+        if t is None:
+            t = time.monotonic()
+        with self._lock:
+            if device_t is not None:
+                self.clock.observe(device_t, t)
+                t = self.clock.to_host(device_t)
+            if self._next > self._first and t < self._t[(self._next - 1) % self.capacity]:
+                self.dropped += 1
+                return False
+            slot = self._next % self.capacity
+            self._t[slot] = t
+            self._v[slot] = value
+            self._next += 1
+            self._evict(t)
+        return True
+
+    def push_many(self, values, t):
+        """批量写入按时间排序的样本（如DMIMU一次解码出的样本），t为主机时间数组"""
+        t = np.asarray(t, np.float64)
+        values = np.asarray(values)
+        if t.size == 0:
+            return
+        if t.size > self.capacity:
+            t, values = t[-self.capacity:], values[-self.capacity:]
+        with self._lock:
+            if self._next > self._first:
+                keep = t >= self._t[(self._next - 1) % self.capacity]
+                if not keep.all():
+                    self.dropped += int(t.size - np.count_nonzero(keep))
+                    t, values = t[keep], values[keep]
+            n = t.size
+            if n == 0:
+                return
+            slots = (self._next + np.arange(n)) % self.capacity
+            self._t[slots] = t
+            self._v[slots] = values
+            self._next += n
+            self._evict(t[-1])
+
+    def _evict(self, newest):
+        self._first = max(self._first, self._next - self.capacity)
+        if self.max_age is not None:
+            self._first = self._search(newest - self.max_age)
+
+    def _search(self, t):
+        """返回第一个时间不早于t的样本的绝对序号（在环形缓冲区的两段上分别二分查找）"""
+        first, count, cap = self._first, self._next - self._first, self.capacity
+        if count == 0:
+            return first
+        start = first % cap
+        len1 = min(count, cap - start)
+        seg1 = self._t[start:start + len1]
+        if len1 == count or t <= seg1[-1]:
+            return first + int(np.searchsorted(seg1, t, 'left'))
+        seg2 = self._t[:count - len1]
+        return first + len1 + int(np.searchsorted(seg2, t, 'left'))
+
+    def _sample(self, index):
+        slot = index % self.capacity
+        return self._t[slot], self._v[slot].copy()
+
+    def latest(self):
+        """返回(时间, 数据)，为空时返回None"""
+        with self._lock:
+            if self._next == self._first:
+                return None
+            return self._sample(self._next - 1)
+
+    def at(self, t, mode='nearest', tolerance=None):
+        """
+        查询t时刻的数据
+
+        参数:
+            t: 主机时间
+            mode: 'nearest' 最近样本 | 'previous' 不晚于t的最后一个样本 | 'linear' 线性插值
+                  （t超出已有数据范围时取端点样本）
+            tolerance: 可选，所用样本与t的最大时间差（秒），超出返回None
+        返回:
+            (样本时间, 数据) 或 None；linear模式的样本时间即t
+        """
+        with self._lock:
+            if self._next == self._first:
+                return None
+            i = self._search(t)
+            lo = max(i - 1, self._first)
+            hi = min(i, self._next - 1)
+            t_lo, t_hi = self._t[lo % self.capacity], self._t[hi % self.capacity]
+
+            if mode == 'previous':
+                # 第一个晚于t的样本的前一个，时间恰好等于t的样本也算在内
+                j = self._search(np.nextafter(t, np.inf)) - 1
+                if j < self._first:
+                    return None
+                result = self._sample(j)
+            elif mode == 'nearest' or lo == hi or t_hi == t_lo:
+                result = self._sample(lo if abs(t - t_lo) <= abs(t_hi - t) else hi)
+            elif mode == 'linear':
+                w = (t - t_lo) / (t_hi - t_lo)
+                v_lo, v_hi = self._v[lo % self.capacity], self._v[hi % self.capacity]
+                value = v_lo + (v_hi - v_lo) * w
+                gap = min(abs(t - t_lo), abs(t_hi - t))
+                if tolerance is not None and gap > tolerance:
+                    return None
+                return t, value
+            else:
+                raise ValueError(f"不支持的查询模式: {mode}")
+        if tolerance is not None and abs(result[0] - t) > tolerance:
+            return None
+        return result
+
+    def between(self, t0, t1):
+        """返回[t0, t1]内的全部样本 (时间数组, 数据数组)，如一帧曝光期间的IMU数据"""
+        with self._lock:
+            i0, i1 = self._search(t0), self._search(np.nextafter(t1, np.inf))
+            slots = np.arange(i0, i1) % self.capacity
+            return self._t[slots], self._v[slots]
+
+
+class SensorSync:
+    """
+    多个SensorStream的集合，按同一主机时刻查询所有流
+
+    用法见模块说明
+    """
+
+    def __init__(self):
+        self.streams = {}
+
+    def add_stream(self, name, **kwargs):
+        """新增数据流，参数见SensorStream，返回该流"""
+        stream = SensorStream(name, **kwargs)
+        self.streams[name] = stream
+        return stream
+
+    def push(self, name, value, t=None, device_t=None):
+        return self.streams[name].push(value, t=t, device_t=device_t)
+
+    def query(self, t, names=None, mode='linear', tolerance=None):
+        """
+        查询各流在t时刻的数据
+
+        返回:
+            dict - 流名称 -> 数据；无数据或超出容差的流为None
+        """
+        names = self.streams if names is None else names
+        result = {}
+        for name in names:
+            found = self.streams[name].at(t, mode=mode, tolerance=tolerance)
+            result[name] = None if found is None else found[1]
+        return result
+
+    def stats(self):
+        """各流的样本数、丢弃数与时钟偏移估计"""
+        return {
+            name: {'size': len(s), 'dropped': s.dropped, 'clock_offset': s.clock.offset}
+            for name, s in self.streams.items()
+        }
+
+
+# 示例：模拟1kHz IMU与带20ms传输抖动的相机时间戳，查询每帧对应的IMU数据
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    sync = SensorSync()
+    imu = sync.add_stream('gyro', shape=(3,), capacity=4096, max_age=2.0)
+    cam = sync.add_stream('frame_id', capacity=256)
+
+    t0 = time.monotonic()
+    ts = t0 + np.arange(3000) / 1000.0
+    imu.push_many(np.stack([np.sin(ts), np.cos(ts), ts - t0], axis=1), ts)
+    for k in range(180):
+        device_t = k / 60.0                                    # 相机时钟从0开始
+        host_t = t0 + device_t + 0.002 + rng.exponential(0.008)  # 2ms固定延迟+抖动
+        cam.push(k, t=host_t, device_t=device_t)
+
+    print(f"估计偏移 - 真实偏移: {(cam.clock.offset - t0) * 1000:.2f} ms（含固定传输延迟）")
+    frame_t, frame_id = cam.latest()
+    gyro = imu.at(frame_t, mode='linear', tolerance=0.005)
+    print(f"帧{int(frame_id)} @ {frame_t - t0:.4f}s -> gyro {gyro[1] if gyro else None}")
+    print(sync.stats())
@@ -31,50 +31,312 @@ def calculate_gray_variance(image, bbox):
     
     return variance, mean_gray
 
-def process_yolo_results(images, yolo_results):
-    """处理YOLO识别结果，计算各框内灰度方差并提取最大方差框的中心坐标"""
-    image = images
-    if image is None:
-        raise FileNotFoundError(f"无法读取图像")
-    
-    center = []
-    max_variance = -1
-    max_bbox = None
-    
-    # 处理每个识别框
+def calculate_gray_variance_batch(image, bboxes):
+    """
+    批量计算多个YOLO识别框内的灰度均值和方差
+
+    整帧只转换一次灰度，并用积分图（像素和、像素平方和）在O(1)内求出每个框的
+    均值与方差，N个框的计算全部向量化，重叠框不会重复扫描像素。
+
+    参数:
+        image: BGR图像或灰度图
+        bboxes: N×4 (x1, y1, x2, y2) 或 N×6 (x1, y1, x2, y2, conf, cls) 的数组/列表
+
+    返回:
+        (variances, means) - 长度为N的float64数组；面积为0的框对应nan
+    """
+    boxes = np.asarray(bboxes, dtype=np.float64)
+    if boxes.ndim == 1:
+        boxes = boxes.reshape(1, -1)
+    if boxes.size == 0:
+        return np.empty(0), np.empty(0)
+    if boxes.ndim != 2 or boxes.shape[1] not in (4, 6):
+        raise ValueError(f"不支持的边界框格式: {boxes.shape}")
+
+    height, width = image.shape[:2]
+
+    # 与calculate_gray_variance一致：坐标截断取整，再裁剪到图像范围内
+    coords = boxes[:, :4].astype(np.int64)
+    x1, x2 = np.clip(coords[:, 0], 0, width), np.clip(coords[:, 2], 0, width)
+    y1, y2 = np.clip(coords[:, 1], 0, height), np.clip(coords[:, 3], 0, height)
+    x2, y2 = np.maximum(x2, x1), np.maximum(y2, y1)
+    area = ((x2 - x1) * (y2 - y1)).astype(np.float64)
+    if not area.any():
+        return np.full(len(boxes), np.nan), np.full(len(boxes), np.nan)
+
+    # 灰度转换和积分图只覆盖所有框的并集外接矩形
+    rx1, ry1, rx2, ry2 = x1.min(), y1.min(), x2.max(), y2.max()
+    region = image[ry1:ry2, rx1:rx2]
+    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if len(region.shape) == 3 else region
+    # 8位图像的像素和用int32精确且比float64积分快一个数量级；平方和需要float64
+    sums, sq_sums = cv2.integral2(gray, sdepth=cv2.CV_32S, sqdepth=cv2.CV_64F)
+    x1, x2, y1, y2 = x1 - rx1, x2 - rx1, y1 - ry1, y2 - ry1
+
+    box_sum = (sums[y2, x2] - sums[y1, x2] - sums[y2, x1] + sums[y1, x1]).astype(np.float64)
+    box_sq = sq_sums[y2, x2] - sq_sums[y1, x2] - sq_sums[y2, x1] + sq_sums[y1, x1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = box_sum / area
+        variances = np.maximum(box_sq / area - means * means, 0.0)
+    variances[area == 0] = np.nan
+    return variances, means
+
+def select_max_variance(image, bboxes):
+    """
+    对N个xyxy框批量打分，返回灰度方差最大的框的中心坐标
+
+    返回:
+        (center, max_variance, index) - center为[x, y]；没有有效框时返回([], -1, None)
+    """
+    boxes = np.asarray(bboxes, dtype=np.float64)
+    if boxes.ndim == 1:
+        boxes = boxes.reshape(1, -1)
+    variances, _ = calculate_gray_variance_batch(image, boxes)
+    valid = ~np.isnan(variances)
+    if not valid.any():
+        return [], -1, None
+    index = int(np.argmax(np.where(valid, variances, -np.inf)))
+    x1, y1, x2, y2 = boxes[index, :4]
+    center = [float((x1 + x2) / 2), float((y1 + y2) / 2)]
+    return center, float(variances[index]), index
+
+def collect_yolo_boxes(yolo_results, classes=None, conf_threshold=0.0):
+    """
+    把YOLO识别结果整理为N×4的xyxy数组，并按类别和置信度过滤
+
+    YOLOv8结果整块读取r.boxes.data，每个结果只做一次设备到主机的拷贝，不再逐框调用.cpu()。
+    data的前4列为xyxy、最后两列为conf和cls，中间是否有track()的id列都不影响，
+    因此predict()与track()的结果都适用。
+    列表/数组格式的框照常支持。
+
+    参数:
+        yolo_results: YOLOv8结果列表，或[x1, y1, x2, y2(, conf, cls)]框列表/N×4、N×6数组
+        classes: 可选，保留的类别编号集合；只对带类别信息的框生效
+        conf_threshold: float - 最低置信度；只对带置信度的框生效
+
+    返回:
+        numpy.ndarray - N×4 float64 xyxy数组
+    """
+    chunks = []
+    plain = []  # 列表格式的框，最后一次性转换
     for r in yolo_results:
-        # 尝试转换不同格式的边界框
         if hasattr(r, 'boxes'):
-            # YOLOv8 格式
-            for box in r.boxes:
-                bbox = box.xyxy[0].cpu().numpy()  # 获取 xyxy 格式
-                variance, _ = calculate_gray_variance(image, bbox)
-                
-                # 更新最大方差及其对应的框
-                if variance > max_variance:
-                    max_variance = variance
-                    max_bbox = bbox
+            # YOLOv8 格式：整块张量一次拷贝到主机
+            if r.boxes is None:
+                continue
+            # predict()为6列(xyxy, conf, cls)，track()为7列(xyxy, id, conf, cls)
+            d = r.boxes.data
+            d = np.asarray(d.cpu().numpy() if hasattr(d, 'cpu') else d, dtype=np.float64)
+            d = d.reshape(-1, d.shape[-1])
+            chunks.append(np.column_stack((d[:, :4], d[:, -2], d[:, -1])))
         else:
-            # 假设是 [x, y, w, h] 格式
-            variance, _ = calculate_gray_variance(image, r)
-            if variance > max_variance:
-                max_variance = variance
-                max_bbox = r
-    
-    # 计算最大方差框的中心坐标
-    if max_bbox is not None:
-        if len(max_bbox) == 4:  # xyxy 格式
-            x1, y1, x2, y2 = max_bbox
-            center_x = (x1 + x2) / 2
-            center_y = (y1 + y2) / 2
-        else:  # xywh 格式
-            x, y, w, h = max_bbox
-            center_x = x + w / 2
-            center_y = y + h / 2
-        center = [center_x, center_y]
+            plain.append(r)
+    if plain:
+        boxes = np.asarray(plain, dtype=np.float64)
+        chunks.append(boxes.reshape(-1, boxes.shape[-1]))
+    if not chunks:
+        return np.empty((0, 4))
+
+    out = []
+    for boxes in chunks:
+        if boxes.shape[1] >= 6:
+            keep = boxes[:, 4] >= conf_threshold
+            if classes is not None:
+                keep &= np.isin(boxes[:, 5], list(classes))
+            boxes = boxes[keep]
+        out.append(boxes[:, :4])
+    return np.concatenate(out)
+
+def process_yolo_results(images, yolo_results, classes=None, conf_threshold=0.0):
+    """
+    处理YOLO识别结果，计算各框内灰度方差并提取最大方差框的中心坐标
+
+    参数:
+        images: BGR图像
+        yolo_results: YOLOv8结果列表，或xyxy框列表（见collect_yolo_boxes）
+        classes: 可选，只在这些类别的框中挑选
+        conf_threshold: float - 最低置信度
+
+    返回:
+        (center, max_variance) - 没有有效框时为([], -1)
+    """
+    image = images
+    if image is None:
+        raise FileNotFoundError(f"无法读取图像")
     
+    bboxes = collect_yolo_boxes(yolo_results, classes, conf_threshold)
+    if len(bboxes) == 0:
+        return [], -1
+    center, max_variance, _ = select_max_variance(image, bboxes)
     return center, max_variance
 
+def box_iou_matrix(boxes_a, boxes_b):
+    """两组xyxy框的IoU矩阵（M×N），全部向量化"""
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+    iw = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    ih = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = iw * ih
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        iou = inter / (area_a + area_b - inter)
+    return np.nan_to_num(iou)
+
+def _greedy_match(score, threshold, rows_free, cols_free):
+    """按score从大到小贪心配对，只考虑空闲的行/列，返回[(行, 列)]"""
+    pairs = []
+    if score.size == 0:
+        return pairs
+    masked = np.where(rows_free[:, None] & cols_free[None, :], score, -np.inf)
+    order = np.argsort(masked, axis=None)[::-1]
+    for flat in order:
+        if masked.flat[flat] < threshold:
+            break
+        i, j = divmod(int(flat), score.shape[1])
+        if rows_free[i] and cols_free[j]:
+            rows_free[i] = cols_free[j] = False
+            pairs.append((i, j))
+    return pairs
+
+class _Track:
+    """跨帧目标记录"""
+    __slots__ = ('box', 'variance', 'scored_frame', 'missed')
+
+    def __init__(self, box, variance, frame):
+        self.box = box
+        self.variance = variance
+        self.scored_frame = frame
+        self.missed = 0
+
+class VarianceTargetTracker:
+    """
+    跨帧保持灰度方差最大的目标，只对新出现或明显变化的框重新打分
+
+    每帧先用IoU把识别框与已有轨迹关联（IoU不足时再按中心距离关联），
+    IoU不低于reuse_iou且打分未超过rescore_interval帧的框直接沿用缓存方差，
+    其余框合并为一次calculate_gray_variance_batch调用。选中的目标带迟滞：
+    只有其他目标的方差超过当前目标(1 + switch_margin)倍时才切换，避免输出在框间跳变。
+
+    参数:
+        iou_threshold: float - 关联所需最小IoU，默认0.3
+        reuse_iou: float - 沿用缓存方差所需最小IoU（框基本未动），默认0.85
+        center_tol: float - IoU关联失败时，中心距离/框对角线小于该值仍视为同一目标，默认0.5
+        max_missed: int - 轨迹连续丢失多少帧后删除，默认3
+        rescore_interval: int - 缓存方差最长沿用帧数，默认15
+        switch_margin: float - 切换目标所需的方差相对优势，默认0.2
+        classes / conf_threshold: 同process_yolo_results
+
+    用法:
+        tracker = VarianceTargetTracker()
+        center, variance = tracker.update(frame, yolo_results)
+    """
+
+    def __init__(self, iou_threshold=0.3, reuse_iou=0.85, center_tol=0.5, max_missed=3,
+                 rescore_interval=15, switch_margin=0.2, classes=None, conf_threshold=0.0):
+        self.iou_threshold = iou_threshold
+        self.reuse_iou = reuse_iou
+        self.center_tol = center_tol
+        self.max_missed = max_missed
+        self.rescore_interval = rescore_interval
+        self.switch_margin = switch_margin
+        self.classes = classes
+        self.conf_threshold = conf_threshold
+        self.reset()
+
+    def reset(self):
+        """清空所有轨迹"""
+        self.tracks = []
+        self.selected = None
+        self.frame = 0
+        self.rescored = 0   # 本帧重新打分的框数
+        self.reused = 0     # 本帧沿用缓存的框数
+
+    def _associate(self, boxes):
+        """返回与boxes等长的列表：每个框对应的轨迹（或None）及IoU"""
+        n = len(boxes)
+        matched = [None] * n
+        ious = np.zeros(n)
+        if not self.tracks or n == 0:
+            return matched, ious
+        track_boxes = np.stack([t.box for t in self.tracks])
+        iou = box_iou_matrix(track_boxes, boxes)
+        rows_free = np.ones(len(self.tracks), bool)
+        cols_free = np.ones(n, bool)
+        pairs = _greedy_match(iou, self.iou_threshold, rows_free, cols_free)
+
+        # IoU关联失败的（快速移动或框尺寸突变），按归一化中心距离再关联一次
+        if rows_free.any() and cols_free.any():
+            tc = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+            bc = (boxes[:, :2] + boxes[:, 2:]) / 2
+            diag = np.hypot(track_boxes[:, 2] - track_boxes[:, 0], track_boxes[:, 3] - track_boxes[:, 1])
+            dist = np.linalg.norm(tc[:, None, :] - bc[None, :, :], axis=2) / np.maximum(diag, 1e-6)[:, None]
+            pairs += _greedy_match(-dist, -self.center_tol, rows_free, cols_free)
+
+        for i, j in pairs:
+            matched[j] = self.tracks[i]
+            ious[j] = iou[i, j]
+        return matched, ious
+
+    def update(self, image, yolo_results):
+        """
+        输入一帧及其识别结果，返回跟踪目标的中心坐标
+
+        返回:
+            (center, variance) - 与process_yolo_results相同；没有目标时为([], -1)
+        """
+        self.frame += 1
+        boxes = collect_yolo_boxes(yolo_results, self.classes, self.conf_threshold)
+        matched, ious = self._associate(boxes)
+
+        # 需要重新打分：新框、位置变化较大的框、缓存过期的框
+        need = [
+            j for j, track in enumerate(matched)
+            if track is None or ious[j] < self.reuse_iou
+            or self.frame - track.scored_frame >= self.rescore_interval
+        ]
+        self.rescored = len(need)
+        self.reused = len(boxes) - len(need)
+        if need:
+            variances, _ = calculate_gray_variance_batch(image, boxes[need])
+        else:
+            variances = ()
+
+        current = []
+        for j, variance in zip(need, variances):
+            track = matched[j]
+            if track is None:
+                track = _Track(boxes[j], variance, self.frame)
+                self.tracks.append(track)
+            else:
+                track.variance = variance
+                track.scored_frame = self.frame
+            matched[j] = track
+        for j, track in enumerate(matched):
+            track.box = boxes[j]
+            track.missed = 0
+            current.append(track)
+
+        # 本帧未匹配到的轨迹计为丢失，超限删除
+        seen = set(map(id, current))
+        for track in self.tracks:
+            if id(track) not in seen:
+                track.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+
+        candidates = [t for t in current if not np.isnan(t.variance)]
+        if not candidates:
+            self.selected = None
+            return [], -1
+        best = max(candidates, key=lambda t: t.variance)
+        selected = self.selected
+        if (selected is None or selected.missed > 0 or np.isnan(selected.variance)
+                or best.variance > selected.variance * (1 + self.switch_margin)):
+            selected = best
+        self.selected = selected
+
+        x1, y1, x2, y2 = selected.box
+        return [float((x1 + x2) / 2), float((y1 + y2) / 2)], float(selected.variance)
+
 # 示例用法
 if __name__ == "__main__":
     # 示例图像路径
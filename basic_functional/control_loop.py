@@ -0,0 +1,138 @@
+import threading
+import time
+
+from basic_functional.histogram import LatencyHistogram
+
+
+class ControlLoop:
+    """
+    固定频率控制循环调度器
+
+    以time.perf_counter()绝对截止时间驱动：每个周期先粗睡眠到截止时间前spin秒，
+    再忙等到截止时间，醒来后把实测周期dt传给step(dt)，例如直接转发给
+    ProportionalPID.update(current, target, dt=dt)。step超过下一个截止时间即记为超时，
+    错过的周期直接跳过（不会为了追赶而连续快速执行），截止时间仍按原相位对齐。
+
+    统计（均为LatencyHistogram，单位秒）:
+        jitter   - 实际唤醒时间与截止时间之差
+        dt       - 相邻两次step之间的实测周期
+        step     - step自身耗时
+        overrun  - 超时周期中，step结束时间超出下一截止时间的量
+
+    参数:
+        rate_hz: float - 控制频率
+        step: 函数 - 每个周期调用step(dt)；返回False时循环退出
+        spin: float - 截止时间前转为忙等的提前量（秒），默认0.5ms；设为0则只用sleep
+
+    用法:
+        pid = ProportionalPID()
+        loop = ControlLoop(100, lambda dt: send(pid.update(read_target(), dt=dt)))
+        loop.start()          # 后台线程运行；也可直接loop.run()阻塞运行
+        ...
+        loop.stop()
+        print(loop.stats())
+    """
+
+    def __init__(self, rate_hz, step, spin=0.0005):
+        if rate_hz <= 0:
+            raise ValueError("rate_hz必须为正数")
+        self.period = 1.0 / rate_hz
+        self.step = step
+        self.spin = spin
+        self.jitter = LatencyHistogram()
+        self.dt = LatencyHistogram()
+        self.step_time = LatencyHistogram()
+        self.overrun = LatencyHistogram()
+        self.cycles = 0
+        self.overruns = 0
+        self.skipped = 0      # 因超时被跳过的周期数
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _wait_until(self, deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin:
+            # Event.wait兼作可中断的睡眠
+            self._stop.wait(remaining - self.spin)
+        while time.perf_counter() < deadline:
+            pass
+
+    def run(self, max_cycles=None):
+        """在当前线程运行，直到stop()、step返回False或达到max_cycles"""
+        self._stop.clear()
+        period = self.period
+        next_deadline = time.perf_counter() + period
+        last_wake = None
+        while not self._stop.is_set():
+            self._wait_until(next_deadline)
+            if self._stop.is_set():
+                break
+            wake = time.perf_counter()
+            self.jitter.record(wake - next_deadline)
+            dt = period if last_wake is None else wake - last_wake
+            last_wake = wake
+            self.dt.record(dt)
+
+            keep_going = self.step(dt)
+            done = time.perf_counter()
+            self.step_time.record(done - wake)
+            self.cycles += 1
+
+            next_deadline += period
+            if done > next_deadline:
+                # 超时：记录超出量，并跳过已错过的周期，保持原相位
+                self.overruns += 1
+                self.overrun.record(done - next_deadline)
+                missed = int((done - next_deadline) / period) + 1
+                self.skipped += missed
+                next_deadline += missed * period
+
+            if keep_going is False or (max_cycles is not None and self.cycles >= max_cycles):
+                break
+
+    def start(self):
+        """在后台守护线程中运行"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=1.0):
+        """请求退出并等待后台线程结束"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """返回可JSON序列化的统计摘要（时间单位：秒）"""
+        return {
+            'rate_hz': 1.0 / self.period,
+            'cycles': self.cycles,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'jitter': self.jitter.summary(),
+            'dt': self.dt.summary(),
+            'step': self.step_time.summary(),
+            'overrun': self.overrun.summary(),
+        }
+
+
+# 示例：100Hz运行PID，模拟偶发的视觉卡顿
+if __name__ == "__main__":
+    import json
+    import random
+
+    from basic_functional.pid_new import ProportionalPID
+
+    pid = ProportionalPID(nominal_dt=0.01)
+    state = {'x': 50.0}
+
+    def step(dt):
+        u = pid.update(state['x'], dt=dt)
+        state['x'] += 0.05 * u * dt / 0.01
+        if random.random() < 0.02:
+            time.sleep(0.025)  # 模拟视觉或串口阻塞
+
+    loop = ControlLoop(100, step)
+    loop.run(max_cycles=300)
+    print(json.dumps(loop.stats(), indent=2))
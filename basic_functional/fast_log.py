@@ -0,0 +1,289 @@
+"""
+非阻塞、限频的结构化日志，用于替换控制热路径中的print
+
+调用方只做级别判断、限频判断和一次deque.append（不格式化字符串、不做I/O）；
+格式化和写出由后台线程批量完成，终端或管道再慢也不会阻塞控制循环。
+
+- 级别过滤: DEBUG < INFO < WARNING < ERROR，低于logger.level的记录直接返回
+- 限频: 按调用处（即格式字符串）限频，every秒内只输出一次，被抑制的条数附在下一次输出中
+- 队列有界: 写不过来时丢弃最旧的记录并计数
+- 事后转储: 可选的二进制环形缓冲区（NumPy结构化数组）保存最近的全部记录，
+  包括被限频抑制的，出问题后用dump()写成.npz，用load_dump()还原为文本
+
+用法:
+    from basic_functional.fast_log import get_logger
+    log = get_logger('pid')
+    log.info("pid output: %.1f", output, every=0.5)
+    log.warning("校验位%d不匹配", idx)
+
+    log.enable_ring(4096)          # 开启事后转储
+    log.dump('pid_postmortem.npz')
+"""
+import atexit
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+RING_ARGS = 4       # 每条记录在环形缓冲区中保存的参数个数
+RAW_BYTES = 24      # bytes参数或其他参数str()的最大保存长度（可容纳20字节串口帧）
+# 参数类型标记，按参数原来的位置保存，load_dump据此还原
+ARG_NONE, ARG_INT, ARG_FLOAT, ARG_BYTES, ARG_TEXT, ARG_BIGINT = range(6)
+RING_DTYPE = np.dtype([
+    ('t', np.float64),                  # time.time()
+    ('level', np.uint8),
+    ('site', np.uint16),                # 格式字符串编号
+    ('kinds', np.uint8, (RING_ARGS,)),  # 各参数的类型ARG_*
+    ('values', np.float64, (RING_ARGS,)),   # 数值参数
+    ('raw', np.uint8, (RING_ARGS, RAW_BYTES)),  # bytes参数，或其他参数的str()（UTF-8），超长截断
+    ('raw_len', np.uint8, (RING_ARGS,)),
+])
+# 超出该范围的整数转为float64会丢失精度，按十进制文本保存（ARG_BIGINT）
+_EXACT_INT = 1 << 53
+
+
+class _Writer:
+    """后台写出线程：定期取走队列中的全部记录，格式化后一次写出"""
+
+    def __init__(self, stream=None, max_queue=10000, interval=0.05):
+        self.stream = stream
+        self.interval = interval
+        self.queue = deque(maxlen=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self._thread = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def put(self, record):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(record)
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='fast_log', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """立即写出队列中的全部记录（可在任意线程调用，如程序退出前）"""
+        lines = []
+        queue = self.queue
+        while queue:
+            try:
+                lines.append(_format(queue.popleft()))
+            except IndexError:
+                break
+        if not lines:
+            return
+        stream = self.stream or sys.stdout
+        try:
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+        except Exception:
+            pass
+        self.written += len(lines)
+
+
+def _format(record):
+    t, level, name, template, args, suppressed = record
+    try:
+        message = template % args if args else template
+    except Exception:
+        message = f"{template} {args!r}"
+    stamp = time.strftime('%H:%M:%S', time.localtime(t)) + f'.{int(t % 1 * 1000):03d}'
+    line = f"{stamp} {LEVEL_NAMES.get(level, level)} {name}: {message}"
+    if suppressed:
+        line += f" (已抑制{suppressed}条)"
+    return line
+
+
+_writer = _Writer()
+atexit.register(_writer.flush)
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+
+class FastLogger:
+    """
+    日志记录器，通常通过get_logger(name)获取
+
+    参数:
+        name: str - 名称，出现在每条输出中
+        level: int - 输出级别，默认INFO
+        every: float - 默认限频间隔（秒），0表示不限频；单次调用可用every=覆盖
+    """
+
+    def __init__(self, name, level=INFO, every=0.0):
+        self.name = name
+        self.level = level
+        self.every = every
+        self._last = {}         # 格式字符串 -> [上次输出时间, 抑制条数]
+        self._ring = None
+        self._ring_next = 0
+        self._sites = {}        # 格式字符串 -> 编号（环形缓冲区用）
+
+    def log(self, level, template, *args, every=None):
+        if self._ring is not None:
+            self._ring_record(level, template, args)
+        if level < self.level:
+            return
+        every = self.every if every is None else every
+        suppressed = 0
+        if every:
+            now = time.monotonic()
+            state = self._last.get(template)
+            if state is None:
+                self._last[template] = [now, 0]
+            elif now - state[0] < every:
+                state[1] += 1
+                return
+            else:
+                suppressed = state[1]
+                state[0], state[1] = now, 0
+        _writer.put((time.time(), level, self.name, template, args, suppressed))
+
+    def debug(self, template, *args, every=None):
+        self.log(DEBUG, template, *args, every=every)
+
+    def info(self, template, *args, every=None):
+        self.log(INFO, template, *args, every=every)
+
+    def warning(self, template, *args, every=None):
+        self.log(WARNING, template, *args, every=every)
+
+    def error(self, template, *args, every=None):
+        self.log(ERROR, template, *args, every=every)
+
+    def is_enabled(self, level):
+        """参数计算本身较贵时，可先判断再调用"""
+        return level >= self.level
+
+    # ---------------------- 事后转储环形缓冲区 ----------------------
+    def enable_ring(self, capacity=4096):
+        """开启二进制环形缓冲区，保存最近capacity条记录（不受级别和限频影响）"""
+        self._ring = np.zeros(capacity, dtype=RING_DTYPE)
+        self._ring_next = 0
+
+    def _ring_record(self, level, template, args):
+        site = self._sites.get(template)
+        if site is None:
+            site = self._sites[template] = len(self._sites)
+        slot = self._ring[self._ring_next % self._ring.size]
+        slot['t'] = time.time()
+        slot['level'] = level
+        slot['site'] = site
+        kinds, values = slot['kinds'], slot['values']
+        kinds[:] = ARG_NONE
+        for k, arg in enumerate(args[:RING_ARGS]):
+            if isinstance(arg, (float, np.floating)) or (
+                    isinstance(arg, (int, np.integer)) and -_EXACT_INT <= arg <= _EXACT_INT):
+                kinds[k] = ARG_FLOAT if isinstance(arg, (float, np.floating)) else ARG_INT
+                values[k] = arg
+                continue
+            if isinstance(arg, (bytes, bytearray)):
+                kind, raw = ARG_BYTES, bytes(arg[:RAW_BYTES])
+            else:
+                raw = str(arg).encode('utf-8')
+                # 放得下的大整数按数值还原，放不下的与其他类型一样截断为文本
+                kind = ARG_BIGINT if isinstance(arg, (int, np.integer)) and len(raw) <= RAW_BYTES else ARG_TEXT
+                raw = raw[:RAW_BYTES]
+            kinds[k] = kind
+            slot['raw'][k, :len(raw)] = np.frombuffer(raw, np.uint8)
+            slot['raw_len'][k] = len(raw)
+        self._ring_next += 1
+
+    def dump(self, path):
+        """把环形缓冲区按时间顺序写入.npz（records + sites），未开启时返回False"""
+        if self._ring is None:
+            return False
+        n = min(self._ring_next, self._ring.size)
+        order = (self._ring_next - n + np.arange(n)) % self._ring.size
+        sites = [None] * len(self._sites)
+        for template, index in self._sites.items():
+            sites[index] = template
+        np.savez(path, records=self._ring[order], sites=np.array(sites, dtype=object),
+                 name=self.name)
+        return True
+
+
+def load_dump(path):
+    """
+    读取dump()写出的文件，返回文本行列表
+
+    参数按原来的顺序和类型还原后代入格式字符串；bytes和其他类型的参数最多保留RAW_BYTES字节，
+    超过RING_ARGS个参数的记录无法格式化，输出格式字符串和已保存的参数
+    """
+    data = np.load(path, allow_pickle=True)
+    sites = list(data['sites'])
+    name = str(data['name'])
+    lines = []
+    for r in data['records']:
+        template = sites[r['site']]
+        values = []
+        for kind, value, raw, raw_len in zip(r['kinds'], r['values'], r['raw'], r['raw_len']):
+            if kind == ARG_INT:
+                values.append(int(value))
+            elif kind == ARG_FLOAT:
+                values.append(float(value))
+            elif kind == ARG_BYTES:
+                values.append(raw[:raw_len].tobytes())
+            elif kind == ARG_BIGINT:
+                values.append(int(raw[:raw_len].tobytes()))
+            elif kind == ARG_TEXT:
+                # 截断可能切在多字节字符中间
+                values.append(raw[:raw_len].tobytes().decode('utf-8', 'ignore'))
+        try:
+            message = template % tuple(values)
+        except Exception:
+            message = f"{template} {values}"
+        lines.append(_format((float(r['t']), int(r['level']), name, message, (), 0)))
+    return lines
+
+
+def get_logger(name, level=None, every=None):
+    """获取（必要时创建）名为name的共享logger，level/every不为None时更新其设置"""
+    with _loggers_lock:
+        logger = _loggers.get(name)
+        if logger is None:
+            logger = _loggers[name] = FastLogger(name)
+    if level is not None:
+        logger.level = level
+    if every is not None:
+        logger.every = every
+    return logger
+
+
+def set_level(level):
+    """统一设置所有已创建logger的级别"""
+    for logger in _loggers.values():
+        logger.level = level
+
+
+def set_stream(stream):
+    """修改输出目标（默认sys.stdout），如改为文件对象"""
+    _writer.stream = stream
+
+
+def flush():
+    """立即写出所有待输出的记录"""
+    _writer.flush()
+
+
+def stats():
+    """队列长度、已写出条数和因队列满丢弃的条数"""
+    return {'queued': len(_writer.queue), 'written': _writer.written, 'dropped': _writer.dropped}
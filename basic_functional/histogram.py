@@ -0,0 +1,122 @@
+import math
+
+
+class LatencyHistogram:
+    """
+    HDR风格的对数-线性直方图（固定内存，记录一次只需几次整数运算）
+
+    数值先按unit换算为整数（默认微秒），小于2^precision_bits的值逐个计数，
+    更大的值每个二进制量级再细分2^(precision_bits-1)个桶，相对误差不超过
+    2^-(precision_bits-1)（默认5位约6%）。超过max_value的值计入最后一个桶。
+
+    参数:
+        unit: float - 记录单位（秒），默认1e-6即微秒
+        precision_bits: int - 有效二进制位数，默认5
+        max_value: float - 可区分的最大值（秒），默认60
+
+    用法:
+        hist = LatencyHistogram()
+        hist.record(0.0012)          # 记录1.2ms
+        hist.percentile(99)          # 返回秒
+    """
+
+    __slots__ = ('unit', 'precision_bits', '_sub', '_half', 'counts', 'count',
+                 'total', 'min', 'max', '_max_index')
+
+    def __init__(self, unit=1e-6, precision_bits=5, max_value=60.0):
+        self.unit = unit
+        self.precision_bits = precision_bits
+        self._sub = 1 << precision_bits
+        self._half = self._sub >> 1
+        self._max_index = self._index(int(max_value / unit))
+        self.counts = [0] * (self._max_index + 1)
+        self.reset()
+
+    def reset(self):
+        """清空所有计数"""
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, v):
+        if v < self._sub:
+            return v if v > 0 else 0
+        shift = v.bit_length() - self.precision_bits
+        return self._sub + (shift - 1) * self._half + ((v >> shift) - self._half)
+
+    def _lower_bound(self, index):
+        """桶下界（整数单位）"""
+        if index < self._sub:
+            return index
+        shift, offset = divmod(index - self._sub, self._half)
+        return (self._half + offset) << (shift + 1)
+
+    def _upper_bound(self, index):
+        if index < self._sub:
+            return index
+        shift = (index - self._sub) // self._half + 1
+        return self._lower_bound(index) + (1 << shift) - 1
+
+    def record(self, value):
+        """记录一个数值（秒）"""
+        index = self._index(int(value / self.unit))
+        if index > self._max_index:
+            index = self._max_index
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """把另一个同配置直方图的计数并入本直方图"""
+        if other.unit != self.unit or other.precision_bits != self.precision_bits:
+            raise ValueError("只能合并unit和precision_bits相同的直方图")
+        for i, c in enumerate(other.counts[:len(self.counts)]):
+            self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, p):
+        """返回第p百分位数（秒，取所在桶的中点）；没有数据时返回None"""
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                mid = (self._lower_bound(index) + self._upper_bound(index)) / 2
+                return min(max(mid * self.unit, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def buckets(self):
+        """返回非空桶列表 [(下界秒, 上界秒, 计数)]"""
+        return [
+            (self._lower_bound(i) * self.unit, (self._upper_bound(i) + 1) * self.unit, c)
+            for i, c in enumerate(self.counts) if c
+        ]
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        """返回可直接JSON序列化的统计摘要（单位：秒）"""
+        result = {
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+        }
+        for p in percentiles:
+            result[f'p{p:g}'] = self.percentile(p)
+        return result
@@ -1,5 +1,14 @@
+from basic_functional.fast_log import get_logger
+
+log = get_logger('pid')
+
+# dt/nominal_dt的合理范围；超出时（首帧dt接近0、卡顿后dt过大、时钟异常）按标称周期计算，
+# 否则微分项会被放大上万倍、积分项一次累加过多，控制量出现单周期尖峰
+DT_RATIO_RANGE = (0.1, 10.0)
+
+
 class ProportionalPID:
-    def __init__(self, kp=0.5, ki=0.1, kd=0.2, deadband=0.1, max_output=127):
+    def __init__(self, kp=0.5, ki=0.1, kd=0.2, deadband=0.1, max_output=127, nominal_dt=0.01):
         """
         初始化PID控制器参数
         
@@ -9,30 +18,35 @@ class ProportionalPID:
         kd - 微分系数
         deadband - 死区范围，在目标位置±deadband内不做调整
         max_output - 输出的最大值，对应遥控器的最大偏移量
+        nominal_dt - 整定增益时的控制周期（秒），update()传入dt时据此换算积分和微分项
         """
         self.kp = kp
         self.ki = ki
         self.kd = kd
         self.deadband = deadband
         self.max_output = max_output
+        self.nominal_dt = nominal_dt
         
         # 初始化内部状态
         self.error_sum = 0  # 积分项累加值
         self.last_error = 0  # 上一次的误差值
         self.last_output = 127  # 默认输出值，对应遥控器的中立位置
     
-    def update(self, current:float, target=0.0):
+    def update(self, current:float, target=0.0, dt=None):
         """
         根据当前位置和目标位置更新PID控制器并计算输出
         
         参数:
         current_x - 当前识别到的物体x坐标（左正右负）
         target_x - 目标x坐标，默认为0（车体正前方）
+        dt - 距上次更新的实际时间（秒）；None时按固定周期计算（原行为），
+             否则积分按dt/nominal_dt加权、微分按其倒数缩放，周期抖动不再改变等效增益；
+             dt/nominal_dt超出DT_RATIO_RANGE时视为异常，按标称周期计算
         
         返回:
         对应遥控器的输出值（0-255）
         """
-        print("pid controller working",end="")
+        log.debug("pid controller working", every=1.0)
         current = -current
         # 计算误差
         error = target - current
@@ -46,12 +60,19 @@ class ProportionalPID:
         # 计算PID各项
         p_term = self.kp * error
         
+        # 实际周期与标称周期之比，超出合理范围时按标称周期
+        ratio = 1.0
+        if dt is not None:
+            ratio = dt / self.nominal_dt
+            if not DT_RATIO_RANGE[0] <= ratio <= DT_RATIO_RANGE[1]:
+                ratio = 1.0
+        
         # 积分项计算与限制
-        self.error_sum += error
+        self.error_sum += error * ratio
         i_term = self.ki * self.error_sum
         
         # 微分项计算
-        d_term = self.kd * (error - self.last_error)
+        d_term = self.kd * (error - self.last_error) / ratio
         self.last_error = error
         
         # 计算PID总输出
@@ -60,7 +81,7 @@ class ProportionalPID:
         # 将PID输出映射到遥控器范围（0-255）
         # 注意：输出为负时表示向右，对应遥控器值减小；输出为正时表示向左，对应遥控器值增加
         output = 127 - pid_output  # 基础值减去PID输出
-        print(f"\033[032mpid output: {output}\033[0m",end="")
+        log.info("pid output: %.2f", output, every=0.5)
         
         # 限制输出范围
         if output < 0:
@@ -0,0 +1,141 @@
+import numpy as np
+
+from basic_functional.pid import DT_RATIO_RANGE
+
+# 输出约定（按通道选择）
+MODE_REMOTE = 0     # 同pid.py：current取反，输出127 - pid并限幅到0-255，死区内输出127
+MODE_SYMMETRIC = 1  # 同pid_new.py：输出±max_output，积分限幅±integral_limit，死区内保持上次输出
+
+
+class PIDBank:
+    """
+    向量化多通道PID控制器组
+
+    增益、积分、上次误差等状态都保存为长度为N的NumPy数组，一次update()同时推进
+    全部N个控制器（如偏航、俯仰、底盘和多个机械臂关节，或仿真中的多台机器人）。
+    每个通道的计算结果与对应的ProportionalPID.update()逐位一致。
+
+    参数（标量会广播到全部通道，也可传入长度为N的序列）:
+        n: int - 通道数，None时由其余参数中最长的序列决定
+        kp, ki, kd: 比例/积分/微分系数
+        deadband: 死区范围，误差绝对值不超过该值时清空积分
+        max_output: MODE_SYMMETRIC通道的输出限幅
+        mode: MODE_REMOTE 或 MODE_SYMMETRIC
+        integral_limit: MODE_SYMMETRIC通道的积分限幅，默认1000（同pid_new.py）
+        nominal_dt: 整定增益时的控制周期（秒），update()传入dt时使用
+        names: 可选，通道名称列表，便于按名字取值
+
+    用法:
+        bank = PIDBank(kp=[0.5, 0.3], ki=0.1, kd=0.2, mode=[MODE_REMOTE, MODE_SYMMETRIC],
+                       names=['yaw', 'pitch'])
+        outputs = bank.update([dx, dy])
+    """
+
+    def __init__(self, n=None, kp=0.5, ki=0.1, kd=0.2, deadband=0.1, max_output=127,
+                 mode=MODE_REMOTE, integral_limit=1000, nominal_dt=0.01, names=None):
+        params = dict(kp=kp, ki=ki, kd=kd, deadband=deadband, max_output=max_output,
+                      integral_limit=integral_limit, nominal_dt=nominal_dt)
+        if n is None:
+            sizes = [np.size(v) for v in list(params.values()) + [mode]]
+            n = len(names) if names is not None else max(sizes)
+        self.n = n
+        for key, value in params.items():
+            setattr(self, key, np.broadcast_to(np.asarray(value, np.float64), (n,)).copy())
+        self.mode = np.broadcast_to(np.asarray(mode, np.int8), (n,)).copy()
+        if names is not None and len(names) != n:
+            raise ValueError(f"names长度{len(names)}与通道数{n}不一致")
+        self.names = list(names) if names is not None else None
+
+        self.error_sum = np.zeros(n)   # 积分项累加值
+        self.last_error = np.zeros(n)  # 上一次的误差值
+        self.last_output = np.full(n, 127.0)  # 初始中值
+        self._refresh_mode()
+
+    @classmethod
+    def from_controllers(cls, controllers, names=None):
+        """
+        由已有的ProportionalPID对象构造控制器组（pid_new.py的对象按对称模式处理）
+        """
+        modes = [MODE_SYMMETRIC if type(c).__module__.endswith('pid_new') else MODE_REMOTE
+                 for c in controllers]
+        bank = cls(
+            n=len(controllers),
+            kp=[c.kp for c in controllers], ki=[c.ki for c in controllers],
+            kd=[c.kd for c in controllers], deadband=[c.deadband for c in controllers],
+            max_output=[c.max_output for c in controllers], mode=modes,
+            nominal_dt=[getattr(c, 'nominal_dt', 0.01) for c in controllers], names=names,
+        )
+        bank.error_sum[:] = [c.error_sum for c in controllers]
+        bank.last_error[:] = [c.last_error for c in controllers]
+        bank.last_output[:] = [c.last_output for c in controllers]
+        return bank
+
+    def _refresh_mode(self):
+        """mode修改后调用，更新缓存的通道掩码"""
+        self._remote = self.mode == MODE_REMOTE
+        self._symmetric = ~self._remote
+
+    def index(self, name):
+        """按名称返回通道下标"""
+        return self.names.index(name)
+
+    def update(self, current, target=0.0, dt=None):
+        """
+        同时更新全部通道并计算输出
+
+        参数:
+            current: 长度为N的当前值（或标量，广播到全部通道）
+            target: 长度为N的目标值，默认0
+            dt: 距上次更新的实际时间（秒）；None时按固定周期计算，否则同ProportionalPID.update()
+
+        返回:
+            numpy.ndarray - 长度为N的输出；MODE_REMOTE通道为0-255，MODE_SYMMETRIC通道为±max_output
+        """
+        current = np.asarray(current, np.float64)
+        remote = self._remote
+
+        # 遥控器模式与pid.py一致，先对current取反
+        error = target - np.where(remote, -current, current)
+        active = np.abs(error) > self.deadband
+
+        # 实际周期与标称周期之比，超出DT_RATIO_RANGE的通道按标称周期
+        ratio = 1.0
+        if dt is not None:
+            ratio = np.asarray(dt, np.float64) / self.nominal_dt
+            ratio = np.where((ratio >= DT_RATIO_RANGE[0]) & (ratio <= DT_RATIO_RANGE[1]), ratio, 1.0)
+
+        # 死区内清空积分；对称模式积分限幅
+        error_sum = np.where(active, self.error_sum + error * ratio, 0.0)
+        np.copyto(error_sum, np.clip(error_sum, -self.integral_limit, self.integral_limit),
+                  where=self._symmetric)
+        self.error_sum = error_sum
+
+        d_term = self.kd * (error - self.last_error) / ratio
+        np.copyto(self.last_error, error, where=active)
+        pid_output = self.kp * error + self.ki * error_sum + d_term
+
+        output = np.where(
+            remote,
+            np.clip(127 - pid_output, 0, 255),
+            np.clip(pid_output, -self.max_output, self.max_output),
+        )
+        # 死区内：遥控器模式输出127，对称模式保持上次输出
+        np.copyto(output, np.where(remote, 127.0, self.last_output), where=~active)
+        # 只有对称模式记录上次输出（pid.py中该行被注释）
+        np.copyto(self.last_output, output, where=active & self._symmetric)
+        return output
+
+    def reset(self, channels=None):
+        """
+        重置内部状态
+
+        参数:
+            channels: 可选，通道下标（或名称）列表；None表示全部通道
+        """
+        if channels is None:
+            idx = slice(None)
+        else:
+            idx = [self.index(c) if isinstance(c, str) else c for c in channels]
+        self.error_sum[idx] = 0
+        self.last_error[idx] = 0
+        self.last_output[idx] = 127
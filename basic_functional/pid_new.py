@@ -1,16 +1,22 @@
+# dt/nominal_dt的合理范围，超出时按标称周期计算，定义见pid.py
+from basic_functional.pid import DT_RATIO_RANGE
+
+
 class ProportionalPID:
-    def __init__(self, kp=0.5, ki=0.1, kd=0.2, deadband=0.1, max_output=127):
+    def __init__(self, kp=0.5, ki=0.1, kd=0.2, deadband=0.1, max_output=127, nominal_dt=0.01):
         self.kp = kp
         self.ki = ki
         self.kd = kd
         self.deadband = deadband
         self.max_output = max_output
+        self.nominal_dt = nominal_dt  # 整定增益时的控制周期（秒）
         
         self.error_sum = 0  # 积分项累加值
         self.last_error = 0  # 上一次的误差值
         self.last_output = 127  # 初始中值
     
-    def update(self, current: float, target=0.0):
+    def update(self, current: float, target=0.0, dt=None):
+        # dt为距上次更新的实际时间（秒）；None时按固定周期计算，否则积分/微分按dt/nominal_dt换算
         error = target - current  # 误差计算对称（正负误差同等处理）
         
         if abs(error) <= self.deadband:
@@ -20,13 +26,19 @@ class ProportionalPID:
         # 比例项：正负误差对称放大（左侧误差正→输出正；右侧误差负→输出负）
         p_term = self.kp * error
         
+        ratio = 1.0
+        if dt is not None:
+            ratio = dt / self.nominal_dt
+            if not DT_RATIO_RANGE[0] <= ratio <= DT_RATIO_RANGE[1]:
+                ratio = 1.0
+        
         # 积分项：正负误差累积对称（左侧正误差累积→输出增加；右侧负误差累积→输出减少）
-        self.error_sum += error
+        self.error_sum += error * ratio
         self.error_sum = max(-1000, min(self.error_sum, 1000))  # 积分限幅（对称范围）
         i_term = self.ki * self.error_sum
         
         # 微分项：正负变化率对称抑制（左侧向中心移动→误差减小→微分负；右侧向中心移动→误差增大→微分正）
-        d_term = self.kd * (error - self.last_error)
+        d_term = self.kd * (error - self.last_error) / ratio
         self.last_error = error
         
         # 输出：允许正负值（左侧输出正，右侧输出负）
@@ -0,0 +1,166 @@
+"""
+离线被控对象仿真：在一次NumPy数组计算中并行评估成千上万组PID参数
+
+控制器直接使用PIDBank（每组参数一个通道），因此死区清零积分、127 - output映射与
+0-255限幅、对称模式积分限幅等行为与机器人上的ProportionalPID完全一致。
+
+用法:
+    python -m basic_functional.pid_sim     # 示例：一阶+延迟对象上的12000组参数扫描
+"""
+import time
+
+import numpy as np
+
+from basic_functional.pid_bank import MODE_REMOTE, MODE_SYMMETRIC, PIDBank
+
+RESULT_DTYPE = np.dtype([
+    ('kp', np.float64),
+    ('ki', np.float64),
+    ('kd', np.float64),
+    ('deadband', np.float64),
+    ('settling_time', np.float64),  # 秒，未稳定为inf
+    ('overshoot', np.float64),      # 相对阶跃幅值的超调比例
+    ('iae', np.float64),            # 误差绝对值积分
+    ('final_error', np.float64),
+])
+
+PLANTS = ('first', 'second', 'integrator')
+
+
+def gain_grid(kp, ki, kd, deadband=0.1):
+    """
+    生成参数网格（笛卡尔积），返回四个等长的一维数组 (kp, ki, kd, deadband)
+    """
+    grids = np.meshgrid(np.atleast_1d(kp), np.atleast_1d(ki), np.atleast_1d(kd),
+                        np.atleast_1d(deadband), indexing='ij')
+    return tuple(g.ravel().astype(np.float64) for g in grids)
+
+
+def simulate(kp, ki, kd, deadband=0.1, mode=MODE_REMOTE, setpoint=100.0, initial=0.0,
+             duration=3.0, dt=0.01, plant='first', gain=1.0, tau=0.1, omega=10.0, zeta=0.7,
+             delay=0.0, u_limit=None, max_output=127, pass_dt=False, settle_band=0.02,
+             return_trajectory=False):
+    """
+    对G组参数同时仿真一次阶跃响应
+
+    被控对象（u为控制器输出相对中立位的偏移）:
+        'first'      一阶惯性 tau*y' = gain*u - y（精确离散化）
+        'second'     二阶 y'' + 2*zeta*omega*y' + omega^2*y = gain*omega^2*u
+        'integrator' 积分 y' = gain*u（如底盘偏航角）
+    控制器输出先经过delay秒的纯延迟，再按u_limit饱和。
+
+    控制器约定:
+        MODE_REMOTE（pid.py）: update(y, target=-setpoint)，u = output - 127
+            （pid.py对current取反，所以当误差为target + y时系统收敛到y = -target）
+        MODE_SYMMETRIC（pid_new.py）: update(y, target=setpoint)，u = output
+
+    参数:
+        kp, ki, kd, deadband: 长度为G的数组（或标量），可用gain_grid生成
+        mode: 控制器输出约定
+        setpoint / initial: 阶跃目标与初始值
+        duration / dt: 仿真时长与控制周期（秒）
+        delay: 纯延迟（秒），按dt取整
+        u_limit: 执行器饱和（对u），None表示只受控制器自身限幅
+        max_output: MODE_SYMMETRIC的输出限幅
+        pass_dt: 是否把dt传给update()（即dt感知模式，nominal_dt取dt）
+        settle_band: 稳定判据，误差不超过阶跃幅值的该比例
+        return_trajectory: 是否同时返回完整轨迹（steps×G，注意内存）
+
+    返回:
+        numpy.recarray - RESULT_DTYPE，每组参数一条；return_trajectory时返回(结果, 轨迹)
+    """
+    if plant not in PLANTS:
+        raise ValueError(f"不支持的被控对象: {plant}，可选: {PLANTS}")
+    kp, ki, kd, deadband = np.broadcast_arrays(*(np.asarray(v, np.float64) for v in (kp, ki, kd, deadband)))
+    g = kp.size
+    bank = PIDBank(n=g, kp=kp.ravel(), ki=ki.ravel(), kd=kd.ravel(), deadband=deadband.ravel(),
+                   max_output=max_output, mode=mode, nominal_dt=dt)
+    target = -setpoint if mode == MODE_REMOTE else setpoint
+    offset = 127.0 if mode == MODE_REMOTE else 0.0
+    steps = int(round(duration / dt))
+    delay_steps = int(round(delay / dt))
+
+    y = np.full(g, float(initial))
+    v = np.zeros(g)                           # 二阶对象的速度
+    u_delay = np.zeros((max(delay_steps, 1), g))
+    alpha = 1.0 - np.exp(-dt / tau)           # 一阶对象精确离散化系数
+
+    step_size = abs(setpoint - initial) or 1.0
+    direction = 1.0 if setpoint >= initial else -1.0
+    band = settle_band * step_size
+    iae = np.zeros(g)
+    peak = np.full(g, -np.inf)
+    last_outside = np.zeros(g)
+    trajectory = np.empty((steps, g)) if return_trajectory else None
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        for k in range(steps):
+            output = bank.update(y, target, dt=dt if pass_dt else None)
+            u = output - offset
+            if delay_steps:
+                slot = k % delay_steps
+                u, u_delay[slot] = u_delay[slot].copy(), u
+            if u_limit is not None:
+                np.clip(u, -u_limit, u_limit, out=u)
+
+            if plant == 'first':
+                y += alpha * (gain * u - y)
+            elif plant == 'second':
+                v += dt * (gain * omega * omega * u - 2 * zeta * omega * v - omega * omega * y)
+                y += dt * v
+            else:
+                y += dt * gain * u
+
+            error = setpoint - y
+            abs_error = np.abs(error)
+            iae += abs_error * dt
+            np.maximum(peak, direction * (y - setpoint), out=peak)
+            last_outside = np.where(abs_error > band, (k + 1) * dt, last_outside)
+            if trajectory is not None:
+                trajectory[k] = y
+
+    results = np.empty(g, dtype=RESULT_DTYPE)
+    results['kp'], results['ki'], results['kd'], results['deadband'] = (
+        kp.ravel(), ki.ravel(), kd.ravel(), deadband.ravel())
+    # 最后一个采样仍在误差带外，或数值发散，视为未稳定
+    settled = (np.abs(setpoint - y) <= band) & np.isfinite(y)
+    results['settling_time'] = np.where(settled, last_outside, np.inf)
+    results['overshoot'] = np.maximum(peak, 0) / step_size
+    results['iae'] = np.where(np.isfinite(iae), iae, np.inf)
+    results['final_error'] = setpoint - y
+    results = results.view(np.recarray)
+    if return_trajectory:
+        return results, trajectory
+    return results
+
+
+def best(results, n=10, key='iae', max_overshoot=None):
+    """
+    按key从小到大返回前n组参数，可选过滤超调过大或未稳定的组
+
+    参数:
+        results: simulate的返回值
+        key: 'iae' 或 'settling_time' 或 'overshoot'
+        max_overshoot: 可选，超调上限（比例）
+    """
+    keep = np.isfinite(results['settling_time'])
+    if max_overshoot is not None:
+        keep &= results['overshoot'] <= max_overshoot
+    candidates = results[keep]
+    order = np.argsort(candidates[key], kind='stable')[:n]
+    return candidates[order]
+
+
+# 示例：一阶惯性+40ms延迟对象，扫描12000组参数
+if __name__ == "__main__":
+    kp, ki, kd, db = gain_grid(np.linspace(0.05, 2.0, 20), np.linspace(0, 0.2, 20),
+                               np.linspace(0, 1.0, 10), [0.1, 1.0, 3.0])
+    for mode, name in ((MODE_REMOTE, 'pid.py'), (MODE_SYMMETRIC, 'pid_new.py')):
+        t0 = time.perf_counter()
+        res = simulate(kp, ki, kd, db, mode=mode, setpoint=50.0, plant='first', tau=0.15,
+                       delay=0.04, u_limit=100, duration=3.0, dt=0.01)
+        elapsed = time.perf_counter() - t0
+        print(f"{name}: {kp.size}组参数，仿真{elapsed:.2f}s")
+        for r in best(res, n=5, max_overshoot=0.1):
+            print(f"  kp={r.kp:.3f} ki={r.ki:.3f} kd={r.kd:.3f} deadband={r.deadband:.1f} | "
+                  f"settling={r.settling_time:.2f}s overshoot={r.overshoot:.1%} IAE={r.iae:.2f}")
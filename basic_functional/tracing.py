@@ -0,0 +1,157 @@
+"""
+帧级延迟追踪：从相机取到帧到对应的msg字节写出串口
+
+每帧一个Trace，携带帧号，在采集、对齐、分割、PID、发送等位置依次打时间戳(mark)。
+帧结束时Tracer把相邻时间戳之差计入以后一个mark命名的直方图（如'align'为采集→对齐、
+'detect.queue'为在检测队列中的等待时间），首尾之差计入端到端直方图。
+直方图使用LatencyHistogram（HDR风格，固定内存），可随时导出为JSON，或通过本地HTTP
+端点以文本查看。
+
+关闭时Tracer.begin()返回None，各处只做一次`if trace is not None`判断，没有其他开销。
+
+用法:
+    tracer = Tracer()
+    trace = tracer.begin(frame_id)          # 关闭时为None
+    color, depth = cam.get_aligned_frames(trace=trace)
+    ...
+    if trace is not None:
+        trace.mark('segment')
+    sc.send(trace=trace)
+    tracer.finish(trace)
+    print(tracer.report())                  # 或 tracer.dump_json('trace.json') / tracer.serve(8765)
+"""
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from basic_functional.histogram import LatencyHistogram
+
+
+class Trace:
+    """单帧的时间戳记录（time.perf_counter()，秒）"""
+
+    __slots__ = ('frame_id', 'marks')
+
+    def __init__(self, frame_id):
+        self.frame_id = frame_id
+        self.marks = []
+
+    def mark(self, stage, t=None):
+        """记录到达stage的时刻；第一个mark为该帧的起点"""
+        self.marks.append((stage, time.perf_counter() if t is None else t))
+
+
+class Tracer:
+    """
+    汇总各帧Trace的延迟直方图
+
+    参数:
+        enabled: bool - 是否开启；关闭时begin()返回None
+        keep: int - 保留最近多少帧的原始时间戳（导出JSON时附带）
+    """
+
+    def __init__(self, enabled=True, keep=64):
+        self.enabled = enabled
+        self.stages = {}                        # mark名 -> LatencyHistogram
+        self.end_to_end = LatencyHistogram()
+        self.recent = deque(maxlen=keep)
+        self.frames = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def begin(self, frame_id):
+        """开始追踪一帧；关闭时返回None"""
+        if not self.enabled:
+            return None
+        return Trace(frame_id)
+
+    def finish(self, trace):
+        """帧处理结束（如写出串口后）调用，把各段耗时计入直方图"""
+        if trace is None or len(trace.marks) < 2:
+            return
+        marks = trace.marks
+        with self._lock:
+            for (_, t_prev), (stage, t) in zip(marks, marks[1:]):
+                hist = self.stages.get(stage)
+                if hist is None:
+                    hist = self.stages[stage] = LatencyHistogram()
+                hist.record(t - t_prev)
+            self.end_to_end.record(marks[-1][1] - marks[0][1])
+            self.recent.append((trace.frame_id, marks))
+            self.frames += 1
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.end_to_end.reset()
+            self.recent.clear()
+            self.frames = 0
+
+    def summary(self):
+        """可JSON序列化的摘要（单位：秒）；stages按各mark首次出现的顺序排列"""
+        with self._lock:
+            return {
+                'frames': self.frames,
+                'end_to_end': self.end_to_end.summary(),
+                'stages': {name: hist.summary() for name, hist in self.stages.items()},
+                'recent': [
+                    {'frame_id': frame_id,
+                     'marks': [(stage, t - marks[0][1]) for stage, t in marks]}
+                    for frame_id, marks in self.recent
+                ],
+            }
+
+    def dump_json(self, path):
+        """把摘要写入JSON文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+
+    def report(self):
+        """文本表格（单位：毫秒）"""
+        s = self.summary()
+        lines = [f"frames: {s['frames']}",
+                 f"{'stage':<20}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"]
+        rows = list(s['stages'].items()) + [('end_to_end', s['end_to_end'])]
+        for name, h in rows:
+            if not h['count']:
+                continue
+            lines.append(f"{name:<20}{h['count']:>8}" + ''.join(
+                f"{h[k] * 1000:>10.3f}" for k in ('p50', 'p90', 'p99', 'max')))
+        return '\n'.join(lines)
+
+    def serve(self, port=8765, host='127.0.0.1'):
+        """
+        在后台线程启动本地HTTP端点：GET / 返回文本表格，GET /json 返回JSON摘要
+        :return: 实际监听的端口（port=0时由系统分配）
+        """
+        tracer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/json'):
+                    body = json.dumps(tracer.summary(), ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    body = tracer.report().encode('utf-8')
+                    content_type = 'text/plain; charset=utf-8'
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self):
+        """关闭HTTP端点"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
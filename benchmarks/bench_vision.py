@@ -0,0 +1,295 @@
+"""
+视觉热点函数基准测试（无需相机，可在无图形环境运行）
+
+用法:
+    python -m benchmarks.bench_vision                      # 合成帧，全部分辨率
+    python -m benchmarks.bench_vision --frames path/to/dir # 使用录制的图片或视频
+    python -m benchmarks.bench_vision --save-baseline      # 把本次结果存为基线
+    python -m benchmarks.bench_vision --quick              # 仅VGA、少量迭代
+
+每个用例输出延迟分位数(p50/p90/p99)、吞吐量和峰值内存，结果写入JSON；
+若存在基线文件，则逐项比较p50，超过阈值的用例标记为回归并以退出码1结束。
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from basic_functional.anti_light import (calculate_gray_variance, calculate_gray_variance_batch,
+                                         process_yolo_results)
+from image_detection.basic_image_process import DenoiseEngine, TemporalDenoiser, denoise_image
+from image_detection.blob_detect import extract_blobs
+from image_detection.color_detect import extract_blue_regions, extract_red_regions
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'latest.json')
+
+RESOLUTIONS = {
+    'vga': (480, 640),
+    '720p': (720, 1280),
+    '1080p': (1080, 1920),
+}
+BOX_COUNTS = (1, 10, 50)
+
+
+# ---------------------- 测试帧 ----------------------
+def synthetic_frame(height, width, seed=0):
+    """生成可复现的测试帧：噪声背景 + 红/蓝目标 + 高亮反光块"""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(20, 90, (height, width, 3), dtype=np.uint8)
+    scale = width / 640
+    for i in range(6):
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        radius = int((20 + 10 * i) * scale)
+        color = (40, 40, 200) if i % 2 == 0 else (200, 60, 40)
+        cv2.circle(frame, center, radius, color, -1)
+    for _ in range(4):
+        x, y = int(rng.integers(0, width - 40)), int(rng.integers(0, height - 40))
+        frame[y:y + int(20 * scale), x:x + int(30 * scale)] = 240
+    return frame
+
+
+def load_recorded_frames(path, limit=16):
+    """读取录制素材：图片目录或视频文件，返回BGR帧列表"""
+    frames = []
+    if os.path.isdir(path):
+        for name in sorted(glob.glob(os.path.join(path, '*'))):
+            frame = cv2.imread(name)
+            if frame is not None:
+                frames.append(frame)
+            if len(frames) >= limit:
+                break
+    else:
+        cap = cv2.VideoCapture(path)
+        while len(frames) < limit:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+    if not frames:
+        raise FileNotFoundError(f"无法从 {path} 读取任何帧")
+    return frames
+
+
+def make_boxes(height, width, count, seed=0):
+    """生成count个相互重叠的xyxy框（模拟YOLO输出）"""
+    rng = np.random.default_rng(seed)
+    w = rng.integers(width // 10, width // 3, count)
+    h = rng.integers(height // 10, height // 3, count)
+    x1 = rng.integers(0, width - w)
+    y1 = rng.integers(0, height - h)
+    return np.stack([x1, y1, x1 + w, y1 + h], axis=1).astype(np.float32)
+
+
+# ---------------------- 用例定义 ----------------------
+def build_cases(frames_by_res, box_counts):
+    """
+    返回用例列表 [(用例名, 分辨率名, 每次调用处理的像素数, 函数)]
+
+    frames_by_res: {分辨率名: 帧列表}，函数按调用次数轮换使用帧
+    """
+    cases = []
+    for res, frames in frames_by_res.items():
+        height, width = frames[0].shape[:2]
+        pixels = height * width
+        masks = [extract_red_regions(image=f, show=False) for f in frames]
+
+        def cycle(items):
+            state = {'i': 0}
+
+            def nxt():
+                state['i'] = (state['i'] + 1) % len(items)
+                return items[state['i']]
+            return nxt
+
+        nf, nm = cycle(frames), cycle(masks)
+        cases.append(('extract_red_regions', res, pixels,
+                      lambda nf=nf: extract_red_regions(image=nf(), show=False)))
+        cases.append(('extract_blue_regions', res, pixels,
+                      lambda nf=nf: extract_blue_regions(image=nf(), show=False)))
+        cases.append(('extract_blobs', res, pixels,
+                      lambda nm=nm: extract_blobs(nm(), min_area=50, top_k=5)))
+        for method in ('median', 'gaussian', 'bilateral'):
+            cases.append((f'denoise_image[{method}]', res, pixels,
+                          lambda nf=nf, m=method: denoise_image(None, nf(), method=m)))
+        # 非局部均值在大分辨率下单次就要数百毫秒，只测VGA
+        if res == 'vga':
+            cases.append(('denoise_image[non_local_means]', res, pixels,
+                          lambda nf=nf: denoise_image(None, nf(), method='non_local_means')))
+        engine = DenoiseEngine(method='non_local_means', color_order='bgr')
+        if res == 'vga':
+            cases.append(('DenoiseEngine[full]', res, pixels,
+                          lambda nf=nf, e=engine: e.denoise(nf())))
+        rois = make_boxes(height, width, 3)
+        cases.append(('DenoiseEngine[rois=3]', res, pixels,
+                      lambda nf=nf, e=engine, r=rois: e.denoise(nf(), rois=r)))
+        cases.append(('TemporalDenoiser', res, pixels,
+                      lambda nf=nf, t=TemporalDenoiser(): t.update(nf())))
+        for count in box_counts:
+            boxes = make_boxes(height, width, count)
+            box_list = [list(b) for b in boxes]
+            cases.append((f'calculate_gray_variance[boxes={count}]', res, pixels,
+                          lambda nf=nf, bl=box_list: [calculate_gray_variance(nf(), b) for b in bl]))
+            cases.append((f'calculate_gray_variance_batch[boxes={count}]', res, pixels,
+                          lambda nf=nf, b=boxes: calculate_gray_variance_batch(nf(), b)))
+            cases.append((f'process_yolo_results[boxes={count}]', res, pixels,
+                          lambda nf=nf, bl=box_list: process_yolo_results(nf(), bl)))
+    return cases
+
+
+# ---------------------- 测量 ----------------------
+def measure(fn, min_iters, min_time, warmup):
+    """运行fn直到同时满足最少次数和最短时间，返回每次调用耗时(秒)数组"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    t_end = time.perf_counter() + min_time
+    while len(samples) < min_iters or time.perf_counter() < t_end:
+        t0 = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - t0)
+    return np.asarray(samples, dtype=np.float64) * 1e-9
+
+
+def peak_memory(fn):
+    """单独运行一次fn，返回期间Python/NumPy分配的峰值内存(字节)"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def run_cases(cases, min_iters, min_time, warmup):
+    results = {}
+    for name, res, pixels, fn in cases:
+        samples = measure(fn, min_iters, min_time, warmup)
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+        mean = float(samples.mean())
+        key = f'{name}@{res}'
+        results[key] = {
+            'function': name,
+            'resolution': res,
+            'iterations': int(samples.size),
+            'mean_ms': mean * 1e3,
+            'p50_ms': p50 * 1e3,
+            'p90_ms': p90 * 1e3,
+            'p99_ms': p99 * 1e3,
+            'calls_per_s': 1.0 / mean,
+            'mpix_per_s': pixels / mean / 1e6,
+            'peak_mem_kb': peak_memory(fn) / 1024,
+        }
+        r = results[key]
+        print(f"{key:<50} p50={r['p50_ms']:8.3f}ms p99={r['p99_ms']:8.3f}ms "
+              f"{r['calls_per_s']:8.1f}/s peak={r['peak_mem_kb']:9.1f}KB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    与基线比较p50延迟
+
+    返回:
+        回归列表 [(用例, 基线p50, 当前p50, 变化比例)]
+    """
+    regressions = []
+    for key, r in results.items():
+        b = baseline.get(key)
+        if b is None:
+            continue
+        change = r['p50_ms'] / b['p50_ms'] - 1.0
+        r['baseline_p50_ms'] = b['p50_ms']
+        r['change'] = change
+        if change > threshold:
+            regressions.append((key, b['p50_ms'], r['p50_ms'], change))
+    return regressions
+
+
+def environment():
+    return {
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'cv2_threads': cv2.getNumThreads(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="image_detection / anti_light 基准测试")
+    parser.add_argument('--frames', help="录制素材（图片目录或视频文件），默认使用合成帧")
+    parser.add_argument('--resolutions', default=','.join(RESOLUTIONS),
+                        help="逗号分隔的分辨率: vga,720p,1080p")
+    parser.add_argument('--min-iters', type=int, default=20)
+    parser.add_argument('--min-time', type=float, default=0.5, help="每个用例最短测量时间(秒)")
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--threads', type=int, help="cv2.setNumThreads，固定线程数以便复现")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="把本次结果写为基线")
+    parser.add_argument('--threshold', type=float, default=0.10, help="p50变慢超过该比例视为回归")
+    parser.add_argument('--filter', help="只运行名称包含该子串的用例")
+    parser.add_argument('--quick', action='store_true', help="只测VGA，迭代次数减少")
+    args = parser.parse_args(argv)
+
+    if args.threads is not None:
+        cv2.setNumThreads(args.threads)
+    resolutions = ['vga'] if args.quick else args.resolutions.split(',')
+    if args.quick:
+        args.min_iters, args.min_time = 5, 0.1
+
+    recorded = load_recorded_frames(args.frames) if args.frames else None
+    frames_by_res = {}
+    for res in resolutions:
+        height, width = RESOLUTIONS[res]
+        if recorded is not None:
+            frames_by_res[res] = [cv2.resize(f, (width, height)) for f in recorded]
+        else:
+            frames_by_res[res] = [synthetic_frame(height, width, seed) for seed in range(4)]
+
+    cases = build_cases(frames_by_res, BOX_COUNTS)
+    if args.filter:
+        cases = [c for c in cases if args.filter in c[0]]
+    results = run_cases(cases, args.min_iters, args.min_time, args.warmup)
+
+    report = {
+        'environment': environment(),
+        'source': args.frames or 'synthetic',
+        'results': results,
+    }
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)['results'], args.threshold)
+        report['regressions'] = [r[0] for r in regressions]
+
+    out_path = args.baseline if args.save_baseline else args.output
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"结果已写入 {out_path}")
+
+    for key, base, cur, change in regressions:
+        print(f"\033[031m回归: {key} p50 {base:.3f}ms -> {cur:.3f}ms (+{change:.0%})\033[0m")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+无硬件的端到端系统基准测试（仅Linux）
+
+把合成或录制的相机帧 → color_detect(show=False) → extract_blobs → ProportionalPID →
+SerialCommunicator串成闭环，串口接在pty上的下位机模拟器(独立进程)：模拟器按20字节协议
+解析每一帧，把校验位换成FEEDBACK_CHECK后原样回传，主机read()到回传帧才算一个周期结束。
+
+每个场景以最快速度运行固定次数，输出持续循环频率、各段与端到端延迟分位数、CPU占用和RSS。
+不依赖相机、串口设备和时间相关的PID参数（dt=None），不同机器上的结果可以直接比较。
+pty没有波特率限制，串口一段测的是软件开销。
+
+用法:
+    python -m benchmarks.system_bench                       # 全部场景
+    python -m benchmarks.system_bench --quick               # 仅VGA场景、少量迭代
+    python -m benchmarks.system_bench --frames path/to/dir  # 使用录制的图片或视频
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import select
+import sys
+import time
+
+import cv2
+
+from basic_functional.fast_log import WARNING, get_logger
+from basic_functional.histogram import LatencyHistogram
+from basic_functional.pid import ProportionalPID
+from benchmarks.bench_vision import environment, load_recorded_frames, synthetic_frame
+from HAL import message_process as mp
+from image_detection.blob_detect import extract_blobs, target_offset
+from image_detection.color_detect import extract_blue_regions, extract_red_regions
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'system_latest.json')
+
+# 模拟下位机回传帧的校验位
+FEEDBACK_CHECK = {0: 0xA5, 5: 0x5A, 13: 0x3C, 19: 0xC3}
+
+SCENARIOS = {
+    'vga_red': {'resolution': (480, 640), 'color': 'red'},
+    'vga_blue': {'resolution': (480, 640), 'color': 'blue'},
+    '720p_red': {'resolution': (720, 1280), 'color': 'red'},
+    '1080p_red': {'resolution': (1080, 1920), 'color': 'red'},
+}
+EXTRACTORS = {'red': extract_red_regions, 'blue': extract_blue_regions}
+
+
+# ---------------------- 下位机模拟器 ----------------------
+def _emulator_loop(master_fd, rx_check, stop_event, frames_seen):
+    """子进程：解析主机发来的20字节帧并回传反馈帧"""
+    buf = bytearray()
+    while not stop_event.is_set():
+        ready, _, _ = select.select([master_fd], [], [], 0.1)
+        if not ready:
+            continue
+        try:
+            buf += os.read(master_fd, 4096)
+        except OSError:
+            break
+        while len(buf) >= mp.FRAME_SIZE:
+            start = mp.find_frame(buf, rx_check)
+            if start < 0:
+                # 保留可能是下一帧开头的尾部字节
+                del buf[:len(buf) - mp.FRAME_SIZE + 1]
+                break
+            frame = bytearray(buf[start:start + mp.FRAME_SIZE])
+            del buf[:start + mp.FRAME_SIZE]
+            for idx, val in FEEDBACK_CHECK.items():
+                frame[idx] = val
+            os.write(master_fd, frame)
+            frames_seen.value += 1
+
+
+class McuEmulator:
+    """
+    pty上的下位机模拟器，运行在fork出的子进程中，避免与主循环争用GIL
+
+    参数:
+        rx_check: dict - 主机发送帧的校验位，用于帧同步
+    """
+
+    def __init__(self, rx_check):
+        import tty      # 仅POSIX，main()已检查平台
+        self.rx_check = rx_check
+        self.master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        ctx = multiprocessing.get_context('fork')
+        self._stop = ctx.Event()
+        self.frames_seen = ctx.Value('L', 0)
+        self._process = ctx.Process(target=_emulator_loop, daemon=True,
+                                    args=(self.master, rx_check, self._stop, self.frames_seen))
+
+    def start(self):
+        self._process.start()
+
+    def stop(self):
+        self._stop.set()
+        self._process.join(timeout=2)
+        os.close(self.master)
+        os.close(self._slave)
+
+
+# ---------------------- 资源统计 ----------------------
+def cpu_seconds(children=False):
+    """本进程（children=True时为已结束的子进程）累计CPU时间（秒）"""
+    import resource     # 仅POSIX，main()已检查平台
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def rss_bytes():
+    """当前常驻内存（/proc/self/statm）"""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _ms(summary):
+    return {k: (v * 1000 if isinstance(v, float) else v) for k, v in summary.items()}
+
+
+# ---------------------- 闭环 ----------------------
+def run_scenario(sc, frames, color, iterations, warmup):
+    """
+    运行一个场景：帧 → 颜色分割 → 连通域 → PID → 发送 → 读取回传
+
+    返回:
+        dict - 循环频率、延迟分位数(ms)、CPU占用与错误计数
+    """
+    extract = EXTRACTORS[color]
+    pid_x, pid_y = ProportionalPID(), ProportionalPID()
+    hists = {name: LatencyHistogram() for name in ('detect', 'pid', 'serial', 'end_to_end')}
+    failures = mismatches = 0
+
+    for i in range(warmup + iterations):
+        if i == warmup:
+            for hist in hists.values():
+                hist.reset()
+            failures = mismatches = 0
+            cpu_start, wall_start = cpu_seconds(), time.perf_counter()
+
+        t0 = time.perf_counter()
+        frame = frames[i % len(frames)]
+        mask = extract(image=frame, show=False)
+        offset = target_offset(extract_blobs(mask, min_area=50, top_k=5), frame.shape)
+        t1 = time.perf_counter()
+
+        if offset is None:
+            pid_x.reset()
+            pid_y.reset()
+            x = y = 127
+        else:
+            x, y = pid_x.update(offset[0]), pid_y.update(offset[1])
+        mp.msg[1], mp.msg[2] = int(x), int(y)
+        t2 = time.perf_counter()
+
+        sc.send()
+        result = sc.read(check_values=FEEDBACK_CHECK)
+        t3 = time.perf_counter()
+        if not result or not result[0]:
+            failures += 1
+        elif result[1][1] != mp.msg[1] or result[1][2] != mp.msg[2]:
+            mismatches += 1
+
+        hists['detect'].record(t1 - t0)
+        hists['pid'].record(t2 - t1)
+        hists['serial'].record(t3 - t2)
+        hists['end_to_end'].record(t3 - t0)
+
+    wall = time.perf_counter() - wall_start
+    cpu = cpu_seconds() - cpu_start
+    return {
+        'iterations': iterations,
+        'loop_hz': iterations / wall,
+        'cpu_percent': 100.0 * cpu / wall,
+        'serial_failures': failures,
+        'echo_mismatches': mismatches,
+        'latency_ms': {name: _ms(hist.summary()) for name, hist in hists.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无硬件端到端系统基准测试")
+    parser.add_argument('--frames', help="录制素材（图片目录或视频文件），默认使用合成帧")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"逗号分隔，可选: {','.join(SCENARIOS)}")
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--threads', type=int, help="cv2.setNumThreads，固定线程数以便复现")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--quick', action='store_true', help="只测VGA场景，迭代次数减少")
+    args = parser.parse_args(argv)
+
+    if not sys.platform.startswith('linux'):
+        print("system_bench需要Linux（pty与/proc）")
+        return 1
+    import resource     # pty、resource、/proc只在Linux上可用，检查平台后再导入
+    if args.threads is not None:
+        cv2.setNumThreads(args.threads)
+    names = args.scenarios.split(',')
+    if args.quick:
+        names = [n for n in names if n.startswith('vga')]
+        args.iterations, args.warmup = 60, 5
+    # 热路径日志只保留警告以上，避免终端输出影响计时
+    get_logger('serial', level=WARNING)
+    get_logger('pid', level=WARNING)
+
+    recorded = load_recorded_frames(args.frames) if args.frames else None
+    rx_check = {idx: mp.msg[idx] for idx in FEEDBACK_CHECK}
+    emulator = McuEmulator(rx_check)
+    emulator.start()
+    sc = mp.SerialCommunicator()
+    if not sc.open(emulator.port, 115200):
+        emulator.stop()
+        return 1
+
+    results = {}
+    rss_start = rss_bytes()
+    try:
+        for name in names:
+            scenario = SCENARIOS[name]
+            height, width = scenario['resolution']
+            if recorded is not None:
+                frames = [cv2.resize(f, (width, height)) for f in recorded]
+            else:
+                frames = [synthetic_frame(height, width, seed) for seed in range(8)]
+            results[name] = run_scenario(sc, frames, scenario['color'], args.iterations, args.warmup)
+            results[name]['rss_mb'] = rss_bytes() / 2 ** 20
+            r = results[name]
+            e2e = r['latency_ms']['end_to_end']
+            print(f"{name:<10} {r['loop_hz']:8.1f} Hz | 端到端 p50 {e2e['p50']:.2f}ms "
+                  f"p99 {e2e['p99']:.2f}ms | CPU {r['cpu_percent']:.0f}% | RSS {r['rss_mb']:.0f}MB | "
+                  f"串口失败 {r['serial_failures']} 回传不一致 {r['echo_mismatches']}")
+    finally:
+        sc.close()
+        emulator.stop()
+
+    report = {
+        'environment': environment(),
+        'source': args.frames or 'synthetic',
+        'results': results,
+        'emulator_frames': emulator.frames_seen.value,
+        'emulator_cpu_seconds': cpu_seconds(children=True),
+        'rss_start_mb': rss_start / 2 ** 20,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"结果已写入 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
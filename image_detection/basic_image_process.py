@@ -1,7 +1,62 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 import numpy as np
 
-def denoise_image(self, image, method='median', **params):
+COLOR_ORDERS = ('bgr', 'rgb', 'gray')
+
+
+def _apply_denoise(image, method, params):
+        """按method对BGR或灰度图像执行一次降噪，参数含义见denoise_image"""
+        if method == 'median':
+            ksize = params.get('ksize', 3)
+            # 确保ksize是奇数
+            if ksize % 2 == 0:
+                ksize += 1
+            result = cv2.medianBlur(image, ksize)
+        
+        elif method == 'gaussian':
+            ksize = params.get('ksize', (5, 5))
+            sigma_x = params.get('sigma_x', 0)
+            sigma_y = params.get('sigma_y', sigma_x)
+            result = cv2.GaussianBlur(image, ksize, sigma_x, sigma_y)
+        
+        elif method == 'mean':
+            ksize = params.get('ksize', (5, 5))
+            result = cv2.blur(image, ksize)
+        
+        elif method == 'bilateral':
+            d = params.get('d', 9)
+            sigma_color = params.get('sigma_color', 75)
+            sigma_space = params.get('sigma_space', 75)
+            result = cv2.bilateralFilter(image, d, sigma_color, sigma_space)
+        
+        elif method == 'non_local_means':
+            h = params.get('h', 10)
+            template_window_size = params.get('template_window_size', 7)
+            search_window_size = params.get('search_window_size', 21)
+            # 确保窗口大小是奇数
+            if template_window_size % 2 == 0:
+                template_window_size += 1
+            if search_window_size % 2 == 0:
+                search_window_size += 1
+            # 非局部均值滤波对彩色图像需要特殊处理
+            if len(image.shape) == 3:
+                result = cv2.fastNlMeansDenoisingColored(
+                    image, None, h, h, template_window_size, search_window_size
+                )
+            else:  # 灰度图像
+                result = cv2.fastNlMeansDenoising(
+                    image, None, h, template_window_size, search_window_size
+                )
+        
+        else:
+            raise ValueError(f"不支持的降噪方法: {method}，可选方法: 'median', 'gaussian', 'mean', 'bilateral', 'non_local_means'")
+        
+        return result
+
+def denoise_image(self, image, method='median', color_order=None, **params):
         """
         对输入图像进行降噪处理
         
@@ -12,7 +67,9 @@ def denoise_image(self, image, method='median', **params):
                 'gaussian' - 高斯模糊(适合高斯噪声)
                 'mean' - 均值滤波(简单平滑)
                 'bilateral' - 双边滤波(保留边缘)
-                'non_local_means' - 非局部均值滤波(效果好但速度慢)
+                'non_local_means' - 非局部均值滤波(效果好但速度慢，实时场景请用DenoiseEngine)
+            color_order: str - 通道顺序'bgr'/'rgb'/'gray'；None时按通道均值猜测（每次调用
+                多两次整帧求均值，已知格式时请显式传入）
             **params: 关键字参数，不同方法的具体参数:
                 对于'median':
                     ksize: int - 滤波核大小，必须是奇数，默认3
@@ -37,69 +94,24 @@ def denoise_image(self, image, method='median', **params):
         # 确保输入是正确的图像格式
         if not isinstance(image, np.ndarray) or len(image.shape) not in (2, 3):
             raise ValueError("输入必须是灰度图像(2D数组)或彩色图像(3D数组)")
+        if color_order is not None and color_order not in COLOR_ORDERS:
+            raise ValueError(f"不支持的通道顺序: {color_order}，可选: {COLOR_ORDERS}")
         
         # 保存输入图像的格式信息，用于后期转换
         is_rgb = False
         if len(image.shape) == 3 and image.shape[2] == 3:
+            if color_order is not None:
+                is_rgb = color_order == 'rgb'
             # 检查是否为RGB格式(通常由PIL等库加载)
             # 通过简单的统计判断，OpenCV默认BGR，通常蓝色通道值较低
-            if image[:, :, 0].mean() > image[:, :, 2].mean():
+            elif image[:, :, 0].mean() > image[:, :, 2].mean():
                 is_rgb = True
+            if is_rgb:
                 # 转换为BGR以便OpenCV处理
                 image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
         
         # 根据选择的方法进行降噪
-        if method == 'median':
-            ksize = params.get('ksize', 3)
-            # 确保ksize是奇数
-            if ksize % 2 == 0:
-                ksize += 1
-            result = cv2.medianBlur(image, ksize)
-        
-        elif method == 'gaussian':
-            ksize = params.get('ksize', (5, 5))
-            sigma_x = params.get('sigma_x', 0)
-            sigma_y = params.get('sigma_y', sigma_x)
-            result = cv2.GaussianBlur(image, ksize, sigma_x, sigma_y)
-        
-        elif method == 'mean':
-            ksize = params.get('ksize', (5, 5))
-            result = cv2.blur(image, ksize)
-        
-        elif method == 'bilateral':
-            d = params.get('d', 9)
-            sigma_color = params.get('sigma_color', 75)
-            sigma_space = params.get('sigma_space', 75)
-            result = cv2.bilateralFilter(image, d, sigma_color, sigma_space)
-        
-        elif method == 'non_local_means':
-            # 非局部均值滤波对彩色图像需要特殊处理
-            if len(image.shape) == 3:
-                h = params.get('h', 10)
-                template_window_size = params.get('template_window_size', 7)
-                search_window_size = params.get('search_window_size', 21)
-                # 确保窗口大小是奇数
-                if template_window_size % 2 == 0:
-                    template_window_size += 1
-                if search_window_size % 2 == 0:
-                    search_window_size += 1
-                result = cv2.fastNlMeansDenoisingColored(
-                    image, None, h, h, template_window_size, search_window_size
-                )
-            else:  # 灰度图像
-                h = params.get('h', 10)
-                template_window_size = params.get('template_window_size', 7)
-                search_window_size = params.get('search_window_size', 21)
-                if template_window_size % 2 == 0:
-                    template_window_size += 1
-                if search_window_size % 2 == 0:
-                    search_window_size += 1
-                result = cv2.fastNlMeansDenoising(
-                    image, None, h, template_window_size, search_window_size
-                )
-        
-        else:
-            raise ValueError(f"不支持的降噪方法: {method}，可选方法: 'median', 'gaussian', 'mean', 'bilateral', 'non_local_means'")
+        result = _apply_denoise(image, method, params)
         
         # 如果输入是RGB格式，转换回RGB
         if is_rgb:
@@ -107,4 +119,192 @@ def denoise_image(self, image, method='median', **params):
         
         return result
 
+
+class DenoiseEngine:
+    """
+    可复用的降噪引擎：整帧模式或只对检测框（ROI）降噪
+
+    整帧模式直接调用一次OpenCV滤波，由OpenCV内部线程并行（线程数用threads或
+    cv2.setNumThreads控制）。实测在fastNlMeansDenoisingColored上，按分块在线程池上
+    并行反而比整帧慢（VGA 0.85s对0.58s，720p约4-5s对1.7s），且分块接缝处与整帧结果
+    相差可达5个灰度级，因此不再分块。
+    ROI模式只处理各检测框（向外取roi_margin像素上下文），多个框在线程池上并行；
+    roi_margin不小于滤波支撑半径时框内结果与整帧一致，否则框边缘附近会有差异。
+
+    参数:
+        method: str - 降噪方法，同denoise_image，默认'non_local_means'
+        color_order: str - 输入通道顺序'bgr'/'rgb'/'gray'，不做猜测
+        workers: int - ROI模式的线程数，默认CPU核数
+        roi_margin: int - ROI模式下每个框向外取的上下文像素，默认16
+        threads: int - 可选，构造时调用cv2.setNumThreads(threads)（进程级设置，影响所有OpenCV调用）
+        **params: 传给具体降噪方法的参数，同denoise_image
+
+    用法:
+        engine = DenoiseEngine(color_order='bgr')
+        clean = engine.denoise(frame)                       # 整帧
+        clean = engine.denoise(frame, rois=[(x1, y1, x2, y2)])  # 只处理检测框
+    """
+
+    def __init__(self, method='non_local_means', color_order='bgr', workers=None, roi_margin=16,
+                 threads=None, **params):
+        if color_order not in COLOR_ORDERS:
+            raise ValueError(f"不支持的通道顺序: {color_order}，可选: {COLOR_ORDERS}")
+        self.method = method
+        self.color_order = color_order
+        self.roi_margin = roi_margin
+        self.params = params
+        if threads is not None:
+            cv2.setNumThreads(threads)
+        self.pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+
+    def _filter(self, image):
+        return _apply_denoise(image, self.method, self.params)
+
+    def _check_input(self, image):
+        if not isinstance(image, np.ndarray) or len(image.shape) not in (2, 3):
+            raise ValueError("输入必须是灰度图像(2D数组)或彩色图像(3D数组)")
+        if (image.ndim == 2) != (self.color_order == 'gray'):
+            raise ValueError(f"图像维度{image.shape}与color_order='{self.color_order}'不一致")
+
+    def denoise(self, image, rois=None):
+        """
+        降噪一帧
+
+        参数:
+            image: numpy.ndarray - 与color_order一致的uint8图像
+            rois: 可选，xyxy检测框列表或N×4数组；提供时只对框内降噪，其余像素原样返回
+
+        返回:
+            numpy.ndarray - 降噪后的图像，格式与输入相同
+        """
+        self._check_input(image)
+        # 只有彩色非局部均值依赖通道顺序（内部转Lab），其余滤波对各通道对称，无需转换
+        swap = self.color_order == 'rgb' and self.method == 'non_local_means'
+        if swap:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        if rois is None:
+            result = self._filter(image)
+        else:
+            result = self._denoise_rois(image, rois)
+        if swap:
+            result = cv2.cvtColor(result, cv2.COLOR_BGR2RGB)
+        return result
+
+    def _denoise_rois(self, image, rois):
+        height, width = image.shape[:2]
+        result = image.copy()
+        margin = self.roi_margin
+        jobs = []
+        for box in np.asarray(rois, dtype=np.float64).reshape(-1, 4):
+            x1, y1, x2, y2 = np.clip(np.rint(box), 0, [width, height, width, height]).astype(int)
+            if x2 <= x1 or y2 <= y1:
+                continue
+            # 向外扩出上下文，避免框边缘受滤波边界影响
+            cx1, cy1 = max(x1 - margin, 0), max(y1 - margin, 0)
+            cx2, cy2 = min(x2 + margin, width), min(y2 + margin, height)
+            future = self.pool.submit(self._filter, image[cy1:cy2, cx1:cx2])
+            jobs.append((future, x1 - cx1, y1 - cy1, x1, y1, x2, y2))
+        for future, ox, oy, x1, y1, x2, y2 in jobs:
+            patch = future.result()
+            result[y1:y2, x1:x2] = patch[oy:oy + y2 - y1, ox:ox + x2 - x1]
+        return result
+
+    def close(self):
+        """关闭线程池"""
+        self.pool.shutdown(wait=True)
+
+class TemporalDenoiser:
+    """
+    面向视频流的时域递归降噪（有状态）
+
+    对每个像素做运行加权累积：acc += alpha * (frame - acc)，其中
+    alpha = max(1 / (n + 1), alpha_min)，n为该分块连续静止的帧数，
+    静止区域相当于对最近若干帧求平均。每帧按分块比较输入与累积结果
+    的平均绝对差，超过motion_threshold的分块视为运动，计数清零并直接
+    采用当前帧，避免拖影。所有缓冲区按帧尺寸预分配，每帧只有几次逐像素运算。
+
+    参数:
+        alpha_min: float - 最小更新权重，越小降噪越强、对缓慢变化越迟钝，默认0.2
+        motion_threshold: float - 分块平均绝对差阈值（灰度级），默认12
+        block_size: int - 运动检测分块边长（像素），默认16
+
+    用法:
+        temporal = TemporalDenoiser()
+        while True:
+            clean = temporal.update(frame)  # 返回内部缓冲区，需保留时请copy()
+    """
+
+    def __init__(self, alpha_min=0.2, motion_threshold=12.0, block_size=16):
+        if not 0 < alpha_min <= 1:
+            raise ValueError("alpha_min必须在(0, 1]范围内")
+        self.alpha_min = alpha_min
+        self.motion_threshold = motion_threshold
+        self.block_size = block_size
+        # 计数上限：超过后alpha已固定为alpha_min
+        self._max_count = int(np.ceil(1.0 / alpha_min))
+        self._shape = None
+
+    def _allocate(self, frame):
+        height, width = frame.shape[:2]
+        grid = (max(1, -(-height // self.block_size)), max(1, -(-width // self.block_size)))
+        self._shape = frame.shape
+        self._grid = grid
+        self._acc = frame.astype(np.float32)              # 累积结果
+        self._delta = np.empty(frame.shape, np.float32)   # frame - acc
+        self._absdiff = np.empty(frame.shape, np.float32)
+        self._count = np.ones(grid, np.float32)           # 各分块连续静止帧数
+        self._alpha_blocks = np.empty(grid, np.float32)
+        # 按整块放大后裁剪，保证每个像素取到的正是其所在分块的权重
+        self._alpha_full = np.empty((grid[0] * self.block_size, grid[1] * self.block_size), np.float32)
+        self._alpha = self._alpha_full[:height, :width]
+        self._out = frame.copy()
+        self.moving_blocks = 0
+
+    def reset(self):
+        """清空历史，下一帧重新开始累积"""
+        self._shape = None
+
+    def update(self, frame):
+        """
+        输入一帧并返回时域降噪结果
+
+        参数:
+            frame: numpy.ndarray - uint8灰度或彩色图像，尺寸变化时自动重置
+
+        返回:
+            numpy.ndarray - 降噪后的uint8图像（内部缓冲区，下次调用会被覆盖）
+        """
+        if frame.shape != self._shape:
+            self._allocate(frame)
+            return self._out
+
+        acc, delta, absdiff = self._acc, self._delta, self._absdiff
+        np.subtract(frame, acc, out=delta, dtype=np.float32)
+        np.abs(delta, out=absdiff)
+
+        # 分块平均绝对差（INTER_AREA缩放即块均值），彩色图再对通道取均值
+        block_diff = cv2.resize(absdiff, (self._grid[1], self._grid[0]), interpolation=cv2.INTER_AREA)
+        if block_diff.ndim == 3:
+            block_diff = block_diff.mean(axis=2)
+        moving = block_diff > self.motion_threshold
+        self.moving_blocks = int(np.count_nonzero(moving))
+
+        count = self._count
+        count[moving] = 0
+        np.add(count, 1, out=count)
+        np.minimum(count, self._max_count, out=count)
+        np.divide(1.0, count, out=self._alpha_blocks)
+        np.maximum(self._alpha_blocks, self.alpha_min, out=self._alpha_blocks)
+
+        # 分块权重按最近邻展开到像素：运动块内每个像素alpha都为1，直接采用当前帧
+        # （双线性插值会让运动块边缘的alpha小于1，新出现的物体留下拖影）
+        cv2.resize(self._alpha_blocks, (self._alpha_full.shape[1], self._alpha_full.shape[0]),
+                   dst=self._alpha_full, interpolation=cv2.INTER_NEAREST)
+        alpha = self._alpha[:, :, None] if frame.ndim == 3 else self._alpha
+        np.multiply(delta, alpha, out=delta)
+        np.add(acc, delta, out=acc)
+
+        cv2.convertScaleAbs(acc, dst=self._out)
+        return self._out
+
 # waiting for update...
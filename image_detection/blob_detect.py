@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+# 连通域记录格式：面积、外接框(x, y, w, h)、质心(cx, cy)
+BLOB_DTYPE = np.dtype([
+    ('area', np.int32),
+    ('x', np.int32),
+    ('y', np.int32),
+    ('w', np.int32),
+    ('h', np.int32),
+    ('cx', np.float32),
+    ('cy', np.float32),
+])
+
+
+def extract_blobs(mask, min_area=0, max_area=None, top_k=None, connectivity=8):
+    """
+    从二值掩码中一次性提取所有连通域的面积、外接框和质心
+
+    参数:
+        mask: numpy.ndarray - 二值掩码(单通道uint8)，如extract_red_regions的返回值
+        min_area: int - 最小面积，小于该值的连通域被过滤，默认0
+        max_area: int - 最大面积，None表示不限制
+        top_k: int - 只保留面积最大的前k个连通域，None表示全部保留
+        connectivity: int - 连通性，4或8，默认8
+
+    返回:
+        numpy.recarray - BLOB_DTYPE格式的记录数组，按面积从大到小排序；
+                         无连通域时返回长度为0的数组
+    """
+    if mask is None:
+        return np.empty(0, dtype=BLOB_DTYPE).view(np.recarray)
+    if mask.ndim != 2:
+        raise ValueError("掩码必须是单通道二值图像(2D数组)")
+    if mask.dtype != np.uint8:
+        mask = mask.astype(np.uint8)
+
+    _, _, stats, centroids = cv2.connectedComponentsWithStats(
+        mask, connectivity=connectivity, ltype=cv2.CV_32S
+    )
+
+    # 第0个标签为背景，直接丢弃
+    stats = stats[1:]
+    centroids = centroids[1:]
+    areas = stats[:, cv2.CC_STAT_AREA]
+
+    # 面积过滤（向量化）
+    keep = areas >= min_area
+    if max_area is not None:
+        keep &= areas <= max_area
+    idx = np.flatnonzero(keep)
+
+    # 按面积取前k个：先argpartition取出候选，再只对候选排序
+    if top_k is not None and idx.size > top_k:
+        part = np.argpartition(-areas[idx], top_k - 1)[:top_k]
+        idx = idx[part]
+    idx = idx[np.argsort(-areas[idx], kind='stable')]
+
+    blobs = np.empty(idx.size, dtype=BLOB_DTYPE)
+    blobs['area'] = areas[idx]
+    blobs['x'] = stats[idx, cv2.CC_STAT_LEFT]
+    blobs['y'] = stats[idx, cv2.CC_STAT_TOP]
+    blobs['w'] = stats[idx, cv2.CC_STAT_WIDTH]
+    blobs['h'] = stats[idx, cv2.CC_STAT_HEIGHT]
+    blobs['cx'] = centroids[idx, 0]
+    blobs['cy'] = centroids[idx, 1]
+    return blobs.view(np.recarray)
+
+
+def target_offset(blobs, image_shape):
+    """
+    计算最大连通域质心相对图像中心的偏移，可直接作为ProportionalPID.update()的输入
+
+    参数:
+        blobs: extract_blobs的返回值
+        image_shape: 图像尺寸(高, 宽[, 通道])
+
+    返回:
+        (dx, dy) - 正数表示目标在中心右侧/下方；没有目标时返回None
+    """
+    if len(blobs) == 0:
+        return None
+    height, width = image_shape[:2]
+    # extract_blobs已按面积降序排列，第0个即最大目标
+    dx = float(blobs['cx'][0]) - width / 2
+    dy = float(blobs['cy'][0]) - height / 2
+    return dx, dy
@@ -1,13 +1,26 @@
 import cv2
 import numpy as np
 
-def extract_red_regions(image_path=None, image=None):
+# HSV阈值（红色在HSV中有两个范围，蓝色为连续范围）
+RED_HSV_RANGES = (
+    (np.array([0, 100, 70]), np.array([6, 240, 240])),      # 较低的红色范围
+    (np.array([174, 80, 110]), np.array([180, 240, 240])),  # 较高的红色范围
+)
+BLUE_HSV_RANGES = (
+    (np.array([100, 50, 50]), np.array([130, 255, 255])),
+)
+# 反光区域（高亮度、低饱和度）
+REFLECTION_HSV_RANGE = (np.array([0, 0, 220]), np.array([180, 80, 255]))
+MORPH_KERNEL = np.ones((5, 5), np.uint8)
+
+def extract_red_regions(image_path=None, image=None, show=True):
         """
         提取图像中的红色部分并返回二值化图像
         
         参数:
             image_path: 图像文件路径，如果提供则从路径加载图像
             image: 已加载的图像，如果提供则直接使用
+            show: 是否弹窗显示掩码，无图形环境或多进程中请设为False
             
         返回:
             二值化图像，红色区域
@@ -31,14 +44,8 @@ def extract_red_regions(image_path=None, image=None):
         # 将BGR图像转换为HSV颜色空间，HSV更适合颜色检测
         hsv_image = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
         
-        # 定义HSV中红色的范围（红色在HSV中有两个范围）
-        # 较低的红色范围
-        lower_red1 = np.array([0, 100, 70])
-        upper_red1 = np.array([6, 240, 240])
-        
-        # 较高的红色范围
-        lower_red2 = np.array([174, 80, 110])
-        upper_red2 = np.array([180, 240, 240])
+        # HSV中红色的范围（红色在HSV中有两个范围）
+        (lower_red1, upper_red1), (lower_red2, upper_red2) = RED_HSV_RANGES
         
         # 根据阈值范围创建掩码
         mask1 = cv2.inRange(hsv_image, lower_red1, upper_red1)
@@ -48,24 +55,26 @@ def extract_red_regions(image_path=None, image=None):
         red_mask = mask1 + mask2
         
         # 反光区域掩码
-        refl_mask = cv2.inRange(hsv_image, np.array([0, 0, 220]), np.array([180, 80, 255]))
+        refl_mask = cv2.inRange(hsv_image, *REFLECTION_HSV_RANGE)
         # 合并红色掩码和反光掩码
         combined_mask = cv2.bitwise_or(red_mask, refl_mask)
         
         # 对掩码进行一些形态学操作，去除噪声并填充空洞
-        kernel = np.ones((5, 5), np.uint8)
+        kernel = MORPH_KERNEL
         combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_CLOSE, kernel)
         combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_OPEN, kernel)
-        cv2.imshow("Red_Mask", combined_mask)
+        if show:
+            cv2.imshow("Red_Mask", combined_mask)
         return combined_mask
 
-def extract_blue_regions(image_path=None, image=None):
+def extract_blue_regions(image_path=None, image=None, show=True):
     """
     提取图像中的蓝色部分并返回二值化图像
     
     参数:
         image_path: 图像文件路径，如果提供则从路径加载图像
         image: 已加载的图像，如果提供则直接使用
+        show: 是否弹窗显示掩码，无图形环境或多进程中请设为False
         
     返回:
         二值化图像，蓝色区域
@@ -89,24 +98,24 @@ def extract_blue_regions(image_path=None, image=None):
     # 将BGR图像转换为HSV颜色空间，HSV更适合颜色检测
     hsv_image = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
     
-    # 定义HSV中蓝色的范围（蓝色为连续范围）
-    # 可根据实际场景调整阈值（H:100-130左右，S和V根据亮度调整）
-    lower_blue = np.array([100, 50, 50])    # 较低的蓝色范围
-    upper_blue = np.array([130, 255, 255])  # 较高的蓝色范围
+    # HSV中蓝色的范围（蓝色为连续范围）
+    # 可根据实际场景调整BLUE_HSV_RANGES（H:100-130左右，S和V根据亮度调整）
+    (lower_blue, upper_blue), = BLUE_HSV_RANGES
     
     # 根据阈值范围创建蓝色掩码
     blue_mask = cv2.inRange(hsv_image, lower_blue, upper_blue)
     
     # 反光区域掩码（高亮度、低饱和度区域，适用于蓝色反光）
-    refl_mask = cv2.inRange(hsv_image, np.array([0, 0, 220]), np.array([180, 80, 255]))
+    refl_mask = cv2.inRange(hsv_image, *REFLECTION_HSV_RANGE)
     # 合并蓝色掩码和反光掩码
     combined_mask = cv2.bitwise_or(blue_mask, refl_mask)
     
     # 形态学操作：去除噪声并填充空洞
-    kernel = np.ones((5, 5), np.uint8)
+    kernel = MORPH_KERNEL
     combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_CLOSE, kernel)  # 填充空洞
     combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_OPEN, kernel)   # 去除噪声
-    cv2.imshow("Blue_Mask", combined_mask)  # 窗口名同步修改
+    if show:
+        cv2.imshow("Blue_Mask", combined_mask)  # 窗口名同步修改
     return combined_mask
 
 def red_regions_minus_edges(self, image_path=None, image=None):
@@ -152,4 +161,67 @@ def red_regions_minus_edges(self, image_path=None, image=None):
 
     return result
 
+HSV_RANGES = {
+    'red': RED_HSV_RANGES,
+    'blue': BLUE_HSV_RANGES,
+}
+
+def extract_regions_in_depth_band(image, depth_image, depth_scale=0.001, min_depth=0.1,
+                                  max_depth=5.0, color='red', show=False):
+    """
+    深度门控的颜色分割：只对工作深度范围内的像素做颜色分类和形态学操作
+
+    先用深度范围生成门控掩码并求其外接矩形，HSV转换、阈值分割和形态学
+    只在该矩形内进行；矩形内超出深度范围的像素（多为背景反光）直接置零。
+
+    参数:
+        image: 已加载的BGR图像
+        depth_image: 与image对齐的原始深度图(z16, uint16)，如RealSenseCamera.get_aligned_frames()的返回值
+        depth_scale: 深度单位（米/单位），RealSenseCamera.depth_scale，D415默认0.001
+        min_depth: 最小深度值（米）
+        max_depth: 最大深度值（米）
+        color: 'red' 或 'blue'
+        show: 是否弹窗显示掩码
+
+    返回:
+        二值化图像（与image同尺寸），深度范围内的目标颜色区域
+    """
+    if color not in HSV_RANGES:
+        raise ValueError(f"不支持的颜色: {color}，可选: {list(HSV_RANGES)}")
+    if depth_image.shape[:2] != image.shape[:2]:
+        raise ValueError("深度图必须与彩色图对齐且尺寸一致")
+
+    height, width = image.shape[:2]
+    result = np.zeros((height, width), np.uint8)
+
+    # 把深度范围换算为原始深度单位，直接在uint16上比较，省去整帧浮点乘法
+    lo = int(np.ceil(min_depth / depth_scale))
+    hi = int(max_depth / depth_scale)
+    band_mask = cv2.inRange(depth_image, lo, hi)
+
+    # 深度范围的外接矩形，外扩半个核宽，保证形态学在边界处结果与整帧一致
+    x, y, w, h = cv2.boundingRect(band_mask)
+    if w == 0 or h == 0:
+        return result
+    pad = MORPH_KERNEL.shape[0] // 2
+    x0, y0 = max(x - pad, 0), max(y - pad, 0)
+    x1, y1 = min(x + w + pad, width), min(y + h + pad, height)
+
+    hsv_roi = cv2.cvtColor(image[y0:y1, x0:x1], cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv_roi, *REFLECTION_HSV_RANGE)
+    for lower, upper in HSV_RANGES[color]:
+        cv2.bitwise_or(mask, cv2.inRange(hsv_roi, lower, upper), dst=mask)
+
+    # 深度门控：形态学之前去掉范围外的像素，避免它们参与闭运算把相邻区域连起来；
+    # 闭运算会把门控边缘附近的范围外像素重新填上，因此形态学之后再门控一次
+    band_roi = band_mask[y0:y1, x0:x1]
+    cv2.bitwise_and(mask, band_roi, dst=mask)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, MORPH_KERNEL)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, MORPH_KERNEL)
+    result[y0:y1, x0:x1] = cv2.bitwise_and(mask, band_roi)
+
+    if show:
+        cv2.imshow("Depth_Gated_Mask", result)
+    return result
+
 #waiting for update...
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+视觉处理的自适应降级（CPU过载时保证控制环的截止时间）
+
+LoadShedder用每帧处理耗时的指数加权平均(EWMA)与预算比较，按LEVELS逐级降低画质:
+    full → no_denoise → half_scale → roi → skip_1 → skip_2
+（流水线没有配置降噪时用denoise=False，no_denoise与full相同，被去掉）
+EWMA超过预算即降一级；低于预算的recover_ratio倍并保持足够帧数后升一级。
+两个阈值之间留有间隔，且每次切换后至少保持hold帧，避免在两级之间来回抖动；
+严重超时（超过预算panic_ratio倍）时只需2帧即可继续降级。切换后EWMA重新开始统计。
+因超时离开某一级别时记下其耗时，retry_interval秒内不会再升回该级别（否则会在
+"便宜级别满足升级条件 → 升回昂贵级别 → 再次超时"之间反复）。
+每次切换都通过fast_log以WARNING级别记录。
+
+prepare_frame / restore_blobs 负责按当前级别缩放、裁剪ROI，并把检测结果换算回原图坐标。
+
+用法:
+    shedder = LoadShedder(budget=0.020)                 # 每帧预算20ms
+    if shedder.should_process():
+        start = time.perf_counter()
+        level = shedder.level
+        if level.denoise:
+            frame = engine.denoise(frame)
+        image, transform = prepare_frame(frame, level, roi_box=last_box)
+        blobs = restore_blobs(detect(image), transform)
+        shedder.record(time.perf_counter() - start)
+"""
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from basic_functional.fast_log import get_logger
+
+log = get_logger('load_shedder')
+
+# denoise: 是否降噪; scale: 分割前的缩放比例; roi: 只处理上一帧目标附近; skip: 每处理1帧后跳过的帧数
+QualityLevel = namedtuple('QualityLevel', ['name', 'denoise', 'scale', 'roi', 'skip'])
+
+LEVELS = (
+    QualityLevel('full', True, 1.0, False, 0),
+    QualityLevel('no_denoise', False, 1.0, False, 0),
+    QualityLevel('half_scale', False, 0.5, False, 0),
+    QualityLevel('roi', False, 0.5, True, 0),
+    QualityLevel('skip_1', False, 0.5, True, 1),     # 每2帧处理1帧
+    QualityLevel('skip_2', False, 0.5, True, 2),     # 每3帧处理1帧
+)
+
+
+def effective_levels(levels=LEVELS, denoise=True):
+    """
+    按流水线实际能做的处理整理级别序列：denoise为False时各级别都不降噪；
+    与上一级除名称外完全相同的级别切换过去不会减少开销，直接去掉
+    """
+    kept = []
+    for level in levels:
+        if not denoise:
+            level = level._replace(denoise=False)
+        if not kept or level[1:] != kept[-1][1:]:
+            kept.append(level)
+    return tuple(kept)
+
+
+class LoadShedder:
+    """
+    按处理耗时自动切换画质级别
+
+    参数:
+        budget: float - 每帧处理耗时预算（秒）
+        levels: 画质级别序列，从高到低
+        alpha: float - EWMA平滑系数，默认0.2
+        degrade_ratio: float - EWMA超过budget*degrade_ratio时降级，默认1.0
+        recover_ratio: float - EWMA低于budget*recover_ratio时升级，默认0.6
+        hold: int - 切换后至少处理多少帧才允许再次降级，默认10
+        panic_ratio: float - EWMA超过budget*panic_ratio时不等hold帧，2帧后即降级，默认3
+        recover_hold: int - 升级前需连续满足条件的帧数，默认3*hold（降级快、恢复慢）
+        retry_interval: float - 因超时离开的级别，多少秒后才允许再次尝试，默认10
+        start: int - 初始级别下标
+        name: str - 日志中的名称
+        denoise: bool - 流水线是否配置了降噪；为False时各级别都不降噪，
+                 并去掉因此与上一级完全相同的级别（如no_denoise），避免切换到不省任何开销的级别
+    """
+
+    def __init__(self, budget, levels=LEVELS, alpha=0.2, degrade_ratio=1.0, recover_ratio=0.6,
+                 hold=10, panic_ratio=3.0, recover_hold=None, retry_interval=10.0, start=0,
+                 name='vision', denoise=True):
+        if budget <= 0:
+            raise ValueError("budget必须为正数")
+        self.budget = budget
+        self.levels = effective_levels(levels, denoise=denoise)
+        self.alpha = alpha
+        self.degrade_ratio = degrade_ratio
+        self.recover_ratio = recover_ratio
+        self.hold = hold
+        self.panic_ratio = panic_ratio
+        self.recover_hold = 3 * hold if recover_hold is None else recover_hold
+        self.retry_interval = retry_interval
+        self.name = name
+        self.index = start
+        self.ewma = None
+        self.transitions = []       # [(time.monotonic(), 原级别名, 新级别名, EWMA)]
+        self.processed = 0
+        self.skipped = 0
+        self._since = 0             # 本级别已处理的帧数
+        self._calm = 0              # 连续满足升级条件的帧数
+        self._skip_left = 0
+        self._overloaded = {}       # 级别下标 -> 因超时离开该级别的时间
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def should_process(self):
+        """每来一帧调用一次；当前级别要求跳帧时返回False"""
+        if self._skip_left > 0:
+            self._skip_left -= 1
+            self.skipped += 1
+            return False
+        self._skip_left = self.level.skip
+        return True
+
+    def record(self, elapsed):
+        """
+        记录一帧的处理耗时（秒），必要时切换级别
+        :return: 切换后的当前级别
+        """
+        self.processed += 1
+        self.ewma = elapsed if self.ewma is None else self.ewma + self.alpha * (elapsed - self.ewma)
+        self._since += 1
+        if self.ewma < self.budget * self.recover_ratio:
+            self._calm += 1
+        else:
+            self._calm = 0
+
+        hold = 2 if self.ewma > self.budget * self.panic_ratio else self.hold
+        if self._since >= hold and self.ewma > self.budget * self.degrade_ratio \
+                and self.index < len(self.levels) - 1:
+            self._switch(self.index + 1)
+        elif self._calm >= self.recover_hold and self.index > 0:
+            left = self._overloaded.get(self.index - 1)
+            if left is None or time.monotonic() - left >= self.retry_interval:
+                self._switch(self.index - 1)
+        return self.level
+
+    def _switch(self, index):
+        old = self.level
+        ewma = self.ewma
+        if index > self.index:
+            self._overloaded[self.index] = time.monotonic()
+        self.index = index
+        self.ewma = None
+        self._since = 0
+        self._calm = 0
+        self._skip_left = 0
+        self.transitions.append((time.monotonic(), old.name, self.level.name, ewma))
+        log.warning("%s画质 %s -> %s：处理耗时EWMA %.1fms，预算 %.1fms",
+                    self.name, old.name, self.level.name, ewma * 1000, self.budget * 1000)
+
+    def stats(self):
+        return {
+            'level': self.level.name,
+            'ewma': self.ewma,
+            'budget': self.budget,
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'transitions': len(self.transitions),
+        }
+
+
+def prepare_frame(frame, level, roi_box=None, margin=32, interpolation=cv2.INTER_AREA):
+    """
+    按级别裁剪ROI并缩放
+
+    参数:
+        frame: 原始图像
+        level: QualityLevel
+        roi_box: 上一帧目标的外接框(x, y, w, h)（原图坐标），level.roi为True且不为None时只处理其附近
+        margin: ROI向外扩展的像素数（另加目标自身尺寸的一半，以容纳帧间运动）
+        interpolation: 缩放插值方式，深度图等不能混合相邻值的数据用cv2.INTER_NEAREST
+
+    返回:
+        (image, transform) - 待处理图像与坐标变换(x0, y0, scale)，交给restore_blobs
+    """
+    x0 = y0 = 0
+    if level.roi and roi_box is not None:
+        x, y, w, h = roi_box
+        height, width = frame.shape[:2]
+        pad_x, pad_y = margin + w // 2, margin + h // 2
+        x0, y0 = max(int(x - pad_x), 0), max(int(y - pad_y), 0)
+        x1, y1 = min(int(x + w + pad_x), width), min(int(y + h + pad_y), height)
+        if x1 > x0 and y1 > y0:
+            frame = frame[y0:y1, x0:x1]
+        else:
+            x0 = y0 = 0
+    scale = level.scale
+    if scale != 1.0:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=interpolation)
+    return frame, (x0, y0, scale)
+
+
+def restore_blobs(blobs, transform):
+    """把在prepare_frame输出上得到的BLOB_DTYPE结果换算回原图坐标"""
+    x0, y0, scale = transform
+    if scale == 1.0 and x0 == 0 and y0 == 0:
+        return blobs
+    blobs = blobs.copy()
+    inv = 1.0 / scale
+    blobs['area'] = np.rint(blobs['area'] * inv * inv)
+    blobs['x'] = np.floor(blobs['x'] * inv) + x0
+    blobs['y'] = np.floor(blobs['y'] * inv) + y0
+    blobs['w'] = np.ceil(blobs['w'] * inv)
+    blobs['h'] = np.ceil(blobs['h'] * inv)
+    # 像素中心约定：缩放后坐标c对应原图(c + 0.5) / scale - 0.5
+    blobs['cx'] = (blobs['cx'] + 0.5) * inv - 0.5 + x0
+    blobs['cy'] = (blobs['cy'] + 0.5) * inv - 0.5 + y0
+    return blobs
@@ -0,0 +1,327 @@
+import multiprocessing
+import queue
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from image_detection.blob_detect import extract_blobs
+from image_detection.color_detect import extract_blue_regions, extract_red_regions
+
+
+# ---------------------- 工作进程中执行的检测阶段 ----------------------
+# 必须是模块级函数，spawn 启动方式下子进程才能按名字找到
+def detect_red_blobs(frame, min_area=50, top_k=5):
+    """红色掩码 + 连通域提取，返回BLOB_DTYPE记录数组"""
+    mask = extract_red_regions(image=frame, show=False)
+    return extract_blobs(mask, min_area=min_area, top_k=top_k)
+
+
+def detect_blue_blobs(frame, min_area=50, top_k=5):
+    """蓝色掩码 + 连通域提取，返回BLOB_DTYPE记录数组"""
+    mask = extract_blue_regions(image=frame, show=False)
+    return extract_blobs(mask, min_area=min_area, top_k=top_k)
+
+
+STAGES = {
+    'red': detect_red_blobs,
+    'blue': detect_blue_blobs,
+}
+
+
+def _attach_shared_memory(name):
+    """子进程按名字挂载共享内存；Python 3.13+ 关闭资源追踪，避免子进程退出时误删"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(worker_id, shm_name, ring_shape, dtype, task_q, result_q, stage, stage_params):
+    """
+    工作进程主循环：从任务队列取 (帧号, 槽位)，直接在共享内存槽位上运行检测阶段
+
+    结果通过result_q返回 (帧号, 槽位, 工作进程号, 结果, 耗时, 错误信息)，
+    只有检测结果（几十字节的记录数组）经过pickle，帧本身不复制。
+    """
+    shm = _attach_shared_memory(shm_name)
+    frames = np.ndarray(ring_shape, dtype=dtype, buffer=shm.buf)
+    fn = STAGES[stage] if isinstance(stage, str) else stage
+    try:
+        while True:
+            task = task_q.get()
+            if task is None:  # 退出信号
+                break
+            frame_id, slot = task
+            t0 = time.perf_counter()
+            try:
+                result, error = fn(frames[slot], **stage_params), None
+            except Exception as e:
+                result, error = None, repr(e)
+            result_q.put((frame_id, slot, worker_id, result, time.perf_counter() - t0, error))
+    finally:
+        del frames
+        shm.close()
+
+
+class SharedFrameRing:
+    """
+    共享内存帧环：slots个与帧同尺寸的槽位，父进程写入、工作进程原地读取
+
+    参数:
+        slots: int - 槽位数量，即同时在途的最大帧数
+        frame_shape: tuple - 帧尺寸，如(480, 640, 3)
+        dtype: 帧数据类型，默认uint8
+    """
+
+    def __init__(self, slots, frame_shape, dtype=np.uint8):
+        self.slots = slots
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.ring_shape = (slots,) + self.frame_shape
+        nbytes = int(np.prod(self.ring_shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.frames = np.ndarray(self.ring_shape, dtype=self.dtype, buffer=self.shm.buf)
+        self.free = deque(range(slots))  # 空闲槽位，仅父进程访问
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, slot, frame):
+        """把帧拷贝进指定槽位（一次memcpy）"""
+        np.copyto(self.frames[slot], frame)
+
+    def close(self):
+        """释放共享内存（只在父进程调用）"""
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ParallelVisionPipeline:
+    """
+    多进程视觉流水线：帧经共享内存环分发到进程池，结果按帧号重新排序输出
+
+    参数:
+        frame_shape: tuple - 输入帧尺寸，如(480, 640, 3)
+        stage: str或函数 - 检测阶段，'red'/'blue'或模块级函数 fn(frame, **stage_params)
+        workers: int - 工作进程数，默认CPU核数
+        slots: int - 共享内存槽位数（在途帧上限），默认workers的2倍
+        stage_params: dict - 传给检测阶段的关键字参数
+        start_method: str - multiprocessing启动方式，None表示平台默认
+
+    用法:
+        with ParallelVisionPipeline((480, 640, 3), stage='red') as pipe:
+            pipe.submit(frame)
+            for frame_id, blobs in pipe.results():
+                ...
+    """
+
+    def __init__(self, frame_shape, stage='red', workers=None, slots=None,
+                 stage_params=None, start_method=None):
+        if isinstance(stage, str) and stage not in STAGES:
+            raise ValueError(f"不支持的检测阶段: {stage}，可选: {list(STAGES)}")
+        self.workers = workers or multiprocessing.cpu_count()
+        self.ring = SharedFrameRing(slots or 2 * self.workers, frame_shape)
+        ctx = multiprocessing.get_context(start_method)
+        self._task_q = ctx.Queue()
+        self._result_q = ctx.Queue()
+        self._procs = [
+            ctx.Process(
+                target=_worker_main,
+                args=(i, self.ring.name, self.ring.ring_shape, self.ring.dtype,
+                      self._task_q, self._result_q, stage, stage_params or {}),
+                daemon=True,
+            )
+            for i in range(self.workers)
+        ]
+        for p in self._procs:
+            p.start()
+
+        self._next_id = 0        # 下一个分配的帧号
+        self._next_out = 0       # 下一个按顺序输出的帧号
+        self._pending = {}       # 已完成但尚未按序输出的结果
+        self._in_flight = 0
+        # 统计信息
+        self._t_start = time.perf_counter()
+        self._submitted = 0
+        self._dropped = 0        # 无空闲槽位被丢弃的帧（反压）
+        self._blocked_time = 0.0 # 阻塞等待空闲槽位的总时长
+        self._completed = 0
+        self._errors = 0
+        self._worker_busy = [0.0] * self.workers
+        self._worker_frames = [0] * self.workers
+        self.last_error = None
+
+    # ---------------------- 提交与收集 ----------------------
+    def _collect(self, timeout=None):
+        """取回一个工作进程结果并释放槽位；timeout=0为非阻塞。无结果返回False"""
+        try:
+            if timeout == 0:
+                item = self._result_q.get_nowait()
+            else:
+                item = self._result_q.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        frame_id, slot, worker_id, result, busy, error = item
+        self.ring.free.append(slot)
+        self._in_flight -= 1
+        self._completed += 1
+        self._worker_busy[worker_id] += busy
+        self._worker_frames[worker_id] += 1
+        if error is not None:
+            self._errors += 1
+            self.last_error = error
+        self._pending[frame_id] = result
+        return True
+
+    def _drain(self):
+        while self._collect(timeout=0):
+            pass
+
+    def submit(self, frame, block=False, timeout=None):
+        """
+        提交一帧
+
+        参数:
+            frame: numpy.ndarray - 与frame_shape一致的帧
+            block: bool - 没有空闲槽位时是否等待；False时直接丢帧并计入反压统计
+            timeout: float - block=True时的最长等待时间（秒）
+
+        返回:
+            分配的帧号；帧被丢弃时返回None
+        """
+        if frame.shape != self.ring.frame_shape:
+            raise ValueError(f"帧尺寸{frame.shape}与流水线尺寸{self.ring.frame_shape}不一致")
+        self._drain()
+        if not self.ring.free:
+            if not block:
+                self._dropped += 1
+                return None
+            t0 = time.perf_counter()
+            deadline = None if timeout is None else t0 + timeout
+            while not self.ring.free:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._collect(timeout=remaining)
+            self._blocked_time += time.perf_counter() - t0
+            if not self.ring.free:
+                self._dropped += 1
+                return None
+
+        slot = self.ring.free.popleft()
+        self.ring.write(slot, frame)
+        frame_id = self._next_id
+        self._next_id += 1
+        self._in_flight += 1
+        self._submitted += 1
+        self._task_q.put((frame_id, slot))
+        return frame_id
+
+    def results(self, wait=False, timeout=None):
+        """
+        按帧号顺序产出已完成的结果 (frame_id, result)
+
+        参数:
+            wait: bool - 是否等待所有在途帧完成
+            timeout: float - wait=True时单次等待的最长时间（秒）
+        """
+        self._drain()
+        while True:
+            while self._next_out in self._pending:
+                frame_id = self._next_out
+                self._next_out += 1
+                yield frame_id, self._pending.pop(frame_id)
+            if not wait or self._next_out >= self._next_id:
+                return
+            if not self._collect(timeout=timeout):
+                return
+
+    # ---------------------- 统计 ----------------------
+    def stats(self):
+        """
+        返回流水线统计信息
+
+        返回:
+            dict - submitted/completed/dropped/errors/in_flight/blocked_time/fps，
+                   以及workers列表（每个进程处理帧数、忙碌时间与利用率）
+        """
+        self._drain()
+        elapsed = max(time.perf_counter() - self._t_start, 1e-9)
+        return {
+            'submitted': self._submitted,
+            'completed': self._completed,
+            'dropped': self._dropped,
+            'errors': self._errors,
+            'in_flight': self._in_flight,
+            'free_slots': len(self.ring.free),
+            'blocked_time': self._blocked_time,
+            'fps': self._completed / elapsed,
+            'workers': [
+                {'frames': n, 'busy': busy, 'utilization': busy / elapsed}
+                for n, busy in zip(self._worker_frames, self._worker_busy)
+            ],
+        }
+
+    # ---------------------- 资源释放 ----------------------
+    def close(self):
+        """通知所有工作进程退出并释放共享内存"""
+        for _ in self._procs:
+            self._task_q.put(None)
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._task_q.close()
+        self._result_q.close()
+        self.ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _load_frames(source, count):
+    """读取录制视频的前count帧；source为None时生成合成帧"""
+    import cv2
+    frames = []
+    if source is not None:
+        cap = cv2.VideoCapture(source)
+        while len(frames) < count:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+    if not frames:
+        rng = np.random.default_rng(0)
+        for i in range(count):
+            frame = rng.integers(0, 60, (480, 640, 3), dtype=np.uint8)
+            cv2.circle(frame, (100 + 4 * i % 440, 240), 40, (0, 0, 200), -1)
+            frames.append(frame)
+    return frames
+
+
+# 示例：在录制视频上测试不同进程数的吞吐量
+if __name__ == "__main__":
+    import sys
+
+    frames = _load_frames(sys.argv[1] if len(sys.argv) > 1 else None, 300)
+    for n in sorted({1, 2, multiprocessing.cpu_count()}):
+        with ParallelVisionPipeline(frames[0].shape, stage='red', workers=n) as pipe:
+            t0 = time.perf_counter()
+            for frame in frames:
+                pipe.submit(frame, block=True)
+                for _ in pipe.results():
+                    pass
+            for _ in pipe.results(wait=True):
+                pass
+            elapsed = time.perf_counter() - t0
+            s = pipe.stats()
+            util = ", ".join(f"{w['utilization']:.0%}" for w in s['workers'])
+            print(f"进程数={n}: {len(frames) / elapsed:.1f} fps | 反压阻塞 {s['blocked_time']:.2f}s | 利用率 [{util}]")
@@ -1 +1,605 @@
-from HAL import depth_camera as camera
\ No newline at end of file
+"""
+MCMS运行入口：采集 → 检测 → 控制 → 发送 流水线
+
+每个阶段运行在独立线程中，相邻阶段之间用有界的"新值优先"队列(LatestQueue)连接：
+采集第N+1帧与检测第N帧同时进行；下游处理不过来时直接丢弃旧帧（计入dropped），
+不会在队列里堆积延迟。控制阶段由ControlLoop定频驱动，每个周期使用最新的检测结果，
+检测卡顿时控制和发送频率不变。阶段的组成和参数来自JSON配置文件（默认config/runtime.json），
+相机、串口等硬件模块只在配置用到时才导入。
+
+用法:
+    python main.py                                # 使用config/runtime.json
+    python main.py --config my.json --duration 30
+
+配置格式:
+    {
+      "queue_size": 1,                # 每个队列的容量
+      "stats_interval": 1.0,          # 打印统计的间隔（秒），0为不打印
+      "tracing": {"enabled": false, "port": null, "dump": null},   # 逐帧延迟追踪，见basic_functional/tracing.py
+      "stages": [
+        {"type": "capture", "source": "realsense"},     # 或 "synthetic" / "video"(需"path")
+        {"type": "detect", "color": "red", "min_area": 50, "top_k": 5,
+         "denoise": null, "budget_ms": null,     # denoise如"median"；budget_ms开启自动降级
+         "depth_band": null},                    # 如[0.3, 3.0]（米）：只检测该深度范围内的目标，需realsense
+        {"type": "control", "kp": 0.5, "ki": 0.1, "kd": 0.2, "channels": {"yaw": 1, "pitch": 2},
+         "nominal_dt": 0.01, "stale_after": 0.1},   # 按1/nominal_dt定频运行，不随检测帧率变化
+        {"type": "transmit", "sink": "serial", "port": "/dev/ttyUSB0", "baudrate": 115200,
+         "keyboard": null}           # 如{"start": 15}：WSAD按键写入msg[15:19]，不能与控制通道或校验位重叠
+      ]
+    }
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from basic_functional.control_loop import ControlLoop
+from basic_functional.fast_log import get_logger
+from basic_functional.histogram import LatencyHistogram
+from basic_functional.tracing import Tracer
+
+log = get_logger('runtime')
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'runtime.json')
+DEFAULT_CHANNELS = {'yaw': 1, 'pitch': 2}     # 控制通道名 -> msg下标
+DEFAULT_NOMINAL_DT = 0.01                    # 控制周期（秒），控制阶段按其倒数定频运行
+DEFAULT_STALE_AFTER = 0.1                    # 超过该时间（秒）没有新检测结果即视为丢失目标
+
+
+class LatestQueue:
+    """
+    有界"新值优先"队列：满时丢弃最旧的元素并计数，下游总是拿到最新的数据
+
+    参数:
+        maxsize: int - 容量，默认1（只保留最新一帧）
+    """
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """取出最旧的元素；超时或队列已关闭且为空时返回None"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self.closed, timeout)
+            return self._items.popleft() if self._items else None
+
+    def get_latest(self):
+        """不等待：取出最新的元素并丢弃更旧的（计入dropped）；队列为空时返回None"""
+        with self._cond:
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+    def close(self):
+        """上游结束：唤醒等待的下游，取完剩余元素后下游退出"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Stage(threading.Thread):
+    """
+    流水线阶段线程：从inbox取数据，调用func处理，结果非None时放入outbox
+
+    inbox为None的阶段是数据源，每轮调用func(None)；func抛出StopIteration表示数据源结束，
+    之后各下游阶段处理完剩余数据后依次退出。
+    """
+
+    def __init__(self, name, func, inbox=None, outbox=None, cleanup=None):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.cleanup = cleanup
+        self.processed = 0
+        self.errors = 0
+        self.busy = 0.0         # func累计耗时（秒）
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                if self.inbox is None:
+                    item = None
+                else:
+                    item = self.inbox.get(timeout=0.1)
+                    if item is None:
+                        if self.inbox.closed:
+                            break
+                        continue
+                if not self._process(item):
+                    break
+        finally:
+            self._finish()
+
+    def _process(self, item, *args):
+        """调用func(item, *args)并把结果放入outbox；func抛出StopIteration时返回False"""
+        trace = item.get('trace') if isinstance(item, dict) else None
+        if trace is not None:
+            trace.mark(f'{self.name}.queue')
+        start = time.perf_counter()
+        try:
+            out = self.func(item, *args)
+        except StopIteration:
+            return False
+        except Exception as e:
+            self.errors += 1
+            log.error("%s阶段异常：%s", self.name, e, every=1.0)
+            return True
+        finally:
+            self.busy += time.perf_counter() - start
+        self.processed += 1
+        if out is not None and self.outbox is not None:
+            self.outbox.put(out)
+        return True
+
+    def _finish(self):
+        if self.outbox is not None:
+            self.outbox.close()
+        if self.cleanup is not None:
+            self.cleanup()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class ClockedStage(Stage):
+    """
+    定频阶段：由ControlLoop按rate_hz驱动，每个周期取inbox中最新的数据调用func(item, dt)
+
+    没有新数据时item为None，由func自行沿用上一次的数据，因此上游（如检测）卡顿时
+    本阶段仍按固定频率输出；dt为ControlLoop实测的周期。inbox关闭且取空后退出。
+    """
+
+    def __init__(self, name, func, inbox, outbox=None, cleanup=None, rate_hz=100, spin=0.0005):
+        if inbox is None:
+            raise ValueError(f"定频阶段{name}需要上游阶段")
+        super().__init__(name, func, inbox, outbox, cleanup)
+        self.loop = ControlLoop(rate_hz, self._tick, spin=spin)
+
+    def _tick(self, dt):
+        if self._stop_event.is_set():
+            return False
+        item = self.inbox.get_latest()
+        if item is None and self.inbox.closed:
+            return False
+        return self._process(item, dt)
+
+    def run(self):
+        try:
+            self.loop.run()
+        finally:
+            self._finish()
+
+
+# ---------------------- 阶段工厂：make_xxx(cfg, runtime) -> (func, cleanup) ----------------------
+def _synthetic_source(cfg):
+    """无硬件时的测试画面：灰色背景上做圆周运动的红色方块，按fps限速"""
+    height, width = cfg.get('height', 480), cfg.get('width', 640)
+    period = 1.0 / cfg.get('fps', 60)
+    base = np.full((height, width, 3), 90, dtype=np.uint8)
+    state = {'k': 0, 'next': time.perf_counter()}
+
+    def grab(trace=None):
+        delay = state['next'] - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        state['next'] = max(state['next'] + period, time.perf_counter() - period)
+        k = state['k']
+        state['k'] += 1
+        frame = base.copy()
+        cx = int(width / 2 + width / 4 * np.cos(k / 30))
+        cy = int(height / 2 + height / 4 * np.sin(k / 30))
+        frame[cy - 20:cy + 20, cx - 20:cx + 20] = (40, 40, 200)
+        if trace is not None:
+            trace.mark('acquire')
+        return frame, None
+
+    return grab, None
+
+
+def make_capture(cfg, runtime):
+    source = cfg.get('source', 'realsense')
+    if runtime.needs_depth and source != 'realsense':
+        raise ValueError(f"检测阶段配置了depth_band，但采集源{source}没有深度图")
+    if source == 'realsense':
+        from HAL.depth_camera import RealSenseCamera
+        cam = RealSenseCamera()
+        cleanup = cam.stop
+        if runtime.needs_depth:
+            runtime.depth_scale = cam.depth_scale
+            grab = cam.get_aligned_frames
+        else:
+            # 不需要深度时只取彩色帧，省去逐帧对齐
+            def grab(trace=None):
+                return cam.get_rgb_frame(trace=trace), None
+    elif source == 'video':
+        import cv2
+        cap = cv2.VideoCapture(cfg['path'])
+
+        def grab(trace=None):
+            ok, frame = cap.read()
+            if not ok:
+                if not cfg.get('loop', False):
+                    raise StopIteration
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, frame = cap.read()
+            if trace is not None:
+                trace.mark('acquire')
+            return frame, None
+        cleanup = cap.release
+    elif source == 'synthetic':
+        grab, cleanup = _synthetic_source(cfg)
+    else:
+        raise ValueError(f"不支持的采集源: {source}")
+
+    max_frames = cfg.get('max_frames')     # 可选，采集指定帧数后结束
+    state = {'id': 0}
+
+    def capture(_):
+        frame_id = state['id']
+        if max_frames is not None and frame_id >= max_frames:
+            raise StopIteration
+        state['id'] += 1
+        trace = runtime.tracer.begin(frame_id)
+        color, depth = grab(trace=trace)
+        if color is None:
+            return None
+        return {'id': frame_id, 't_capture': time.monotonic(), 'frame': color, 'depth': depth,
+                'trace': trace}
+
+    return capture, cleanup
+
+
+def make_detect(cfg, runtime):
+    import cv2
+    from image_detection.blob_detect import extract_blobs, target_offset
+    from image_detection.load_shedder import LoadShedder, prepare_frame, restore_blobs
+    from image_detection.parallel_pipeline import STAGES
+
+    color = cfg.get('color', 'red')
+    min_area, top_k = cfg.get('min_area', 50), cfg.get('top_k', 5)
+    depth_band = cfg.get('depth_band')
+    if depth_band:
+        # 深度门控分割，见image_detection/color_detect.py的extract_regions_in_depth_band
+        from image_detection.color_detect import extract_regions_in_depth_band
+        min_depth, max_depth = depth_band
+
+        def detect(frame, depth, min_area, top_k):
+            mask = extract_regions_in_depth_band(frame, depth, depth_scale=runtime.depth_scale,
+                                                 min_depth=min_depth, max_depth=max_depth, color=color)
+            return extract_blobs(mask, min_area=min_area, top_k=top_k)
+    else:
+        color_detect = STAGES[color]
+
+        def detect(frame, depth, min_area, top_k):
+            return color_detect(frame, min_area=min_area, top_k=top_k)
+    engine = None
+    if cfg.get('denoise'):
+        from image_detection.basic_image_process import DenoiseEngine
+        engine = DenoiseEngine(method=cfg['denoise'], color_order='bgr')
+    # 设置budget_ms时按处理耗时自动降级，见image_detection/load_shedder.py
+    shedder = None
+    if cfg.get('budget_ms'):
+        # 没有配置降噪时去掉只差降噪的级别，full的下一级直接是half_scale
+        shedder = LoadShedder(cfg['budget_ms'] / 1000.0, denoise=engine is not None,
+                              **cfg.get('shedder', {}))
+        runtime.shedder = shedder
+    state = {'box': None}
+
+    def run(item):
+        if shedder is not None and not shedder.should_process():
+            return None
+        start = time.perf_counter()
+        frame = item.pop('frame')
+        depth = item.pop('depth', None)
+        if shedder is None:
+            if engine is not None:
+                frame = engine.denoise(frame)
+            blobs = detect(frame, depth, min_area=min_area, top_k=top_k)
+        else:
+            level = shedder.level
+            if engine is not None and level.denoise:
+                frame = engine.denoise(frame)
+            image, transform = prepare_frame(frame, level, roi_box=state['box'])
+            if depth is not None:
+                # 深度图用最近邻缩放，避免无效深度(0)与有效值混合
+                depth, _ = prepare_frame(depth, level, roi_box=state['box'],
+                                         interpolation=cv2.INTER_NEAREST)
+            scaled_area = max(1, int(min_area * level.scale * level.scale))
+            blobs = restore_blobs(detect(image, depth, min_area=scaled_area, top_k=top_k), transform)
+            # ROI模式跟踪上一帧的最大目标；丢失目标时下一帧回到整帧
+            state['box'] = tuple(int(blobs[0][k]) for k in ('x', 'y', 'w', 'h')) if len(blobs) else None
+            item['quality'] = level.name
+        item['blobs'] = blobs
+        item['offset'] = target_offset(blobs, frame.shape)
+        if shedder is not None:
+            shedder.record(time.perf_counter() - start)
+        if item['trace'] is not None:
+            item['trace'].mark('segment')
+        return item
+
+    cleanup = engine.close if engine is not None else None
+    return run, cleanup
+
+
+def make_control(cfg, runtime):
+    """
+    控制阶段运行在ClockedStage上，按1/nominal_dt的固定频率计算PID：每个周期使用最新的
+    检测结果，检测卡顿时沿用上一次的偏移；超过stale_after秒没有新结果即视为丢失目标
+    """
+    from basic_functional.pid_bank import MODE_REMOTE, MODE_SYMMETRIC, PIDBank
+
+    channels = cfg.get('channels', DEFAULT_CHANNELS)
+    if len(channels) != 2:
+        # 检测阶段的offset为(dx, dy)，按顺序对应两个通道，如{"yaw": 1, "pitch": 2}
+        raise ValueError(f"control.channels必须恰好有两个通道，依次对应目标偏移(dx, dy)，当前为{channels}")
+    symmetric = cfg.get('mode', 'remote') == 'symmetric'
+    bank = PIDBank(kp=cfg.get('kp', 0.5), ki=cfg.get('ki', 0.1), kd=cfg.get('kd', 0.2),
+                   deadband=cfg.get('deadband', 0.1), max_output=cfg.get('max_output', 127),
+                   mode=MODE_SYMMETRIC if symmetric else MODE_REMOTE,
+                   nominal_dt=cfg.get('nominal_dt', DEFAULT_NOMINAL_DT), names=list(channels))
+    indices = list(channels.values())
+    use_dt = cfg.get('use_dt', True)
+    stale_after = cfg.get('stale_after', DEFAULT_STALE_AFTER)
+    state = {'item': None, 'received': None}
+
+    def run(item, dt):
+        now = time.monotonic()
+        fresh = item is not None
+        if fresh:
+            state['item'], state['received'] = item, now
+        latest = state['item']
+        if latest is None:
+            return None     # 尚未收到任何检测结果
+        if latest['offset'] is None or now - state['received'] > stale_after:
+            # 丢失目标或检测超时：清空积分，输出中立值
+            bank.reset()
+            values = np.full(len(indices), 127)
+        else:
+            output = bank.update(latest['offset'], 0.0, dt=dt if use_dt else None)
+            # 对称模式输出±max_output，平移到0-255
+            values = np.clip(np.rint(output + (127 if symmetric else 0)), 0, 255).astype(int)
+        # 每个周期输出新的字典；只有取到新检测结果的那个周期带上trace并计入端到端延迟
+        trace = latest['trace'] if fresh else None
+        if trace is not None:
+            trace.mark('pid')
+        return {'id': latest['id'], 't_capture': latest['t_capture'], 'offset': latest['offset'],
+                'outputs': dict(zip(indices, values.tolist())), 'fresh': fresh, 'trace': trace}
+
+    return run, None
+
+
+def _control_indices(runtime):
+    """控制阶段写入的msg下标；按键字段不能与其重叠，否则按键和PID输出会互相覆盖"""
+    return [index for spec in runtime.config['stages'] if spec['type'] == 'control'
+            for index in spec.get('channels', DEFAULT_CHANNELS).values()]
+
+
+def make_transmit(cfg, runtime):
+    sink = cfg.get('sink', 'serial')
+    keyboard = cfg.get('keyboard')
+    if sink == 'serial':
+        from HAL import message_process as mp
+        if keyboard:
+            # 按键变化时直接写入msg的独立字段，见HAL/pc_remote.py的KeyboardInputSource；
+            # 字段越界或与校验位、控制通道重叠时bind_frame抛出ValueError，此时还未打开串口
+            from HAL import pc_remote
+            pc_remote.keyboard_source.bind_frame(mp.msg, start=keyboard.get('start', 15),
+                                                 reserved=_control_indices(runtime))
+        sc = mp.SerialCommunicator()
+        baudrate = cfg.get('baudrate', 115200)
+        port = cfg.get('port', 'auto')
+        if port == 'auto':
+            check_values = {int(k): v for k, v in cfg['check_values'].items()}
+            ok = sc.open_auto(check_values, baudrate) is not None
+        else:
+            ok = sc.open(port, baudrate)
+        if not ok:
+            if keyboard:
+                pc_remote.keyboard_source.unbind_frame(mp.msg)
+            raise RuntimeError(f"串口{port}打开失败")
+
+        def send(outputs, trace):
+            for index, value in outputs.items():
+                mp.msg[index] = value
+            sc.send(trace=trace)
+        cleanup = sc.close
+
+        if keyboard:
+            listener = pc_remote.keyboard.Listener(on_press=pc_remote.on_key_press,
+                                                   on_release=pc_remote.on_key_release)
+            listener.start()
+
+            def cleanup():
+                listener.stop()
+                pc_remote.keyboard_source.unbind_frame(mp.msg)
+                sc.close()
+    elif sink == 'null':
+        if keyboard:
+            raise ValueError("transmit.keyboard需要串口发送(sink为serial)，null发送时不会绑定按键")
+        def send(outputs, trace):
+            if trace is not None:
+                trace.mark('transmit')
+        cleanup = None
+    else:
+        raise ValueError(f"不支持的发送方式: {sink}")
+
+    def run(item):
+        send(item['outputs'], item['trace'])
+        if item.get('fresh', True):
+            # 控制阶段沿用旧结果的周期不计入采集到发送的延迟
+            runtime.tracer.finish(item['trace'])
+            runtime.latency.record(time.monotonic() - item['t_capture'])
+        runtime.last_item = item
+        return None
+
+    return run, cleanup
+
+
+STAGE_TYPES = {
+    'capture': make_capture,
+    'detect': make_detect,
+    'control': make_control,
+    'transmit': make_transmit,
+}
+# 这些阶段用ClockedStage按1/nominal_dt定频运行，其余阶段由上游数据驱动
+CLOCKED_STAGES = ('control',)
+
+
+class Runtime:
+    """
+    按配置组装并运行流水线
+
+    参数:
+        config: dict - 配置（格式见模块说明）
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.latency = LatencyHistogram()   # 采集到发送的端到端延迟
+        self.last_item = None
+        self.shedder = None                 # 检测阶段配置budget_ms时的LoadShedder
+        # 只有检测阶段配置了depth_band时才对齐并传递深度图；depth_scale由采集阶段填入
+        self.needs_depth = any(spec['type'] == 'detect' and spec.get('depth_band')
+                               for spec in config['stages'])
+        self.depth_scale = None
+        tracing = config.get('tracing', {})
+        self.tracer = Tracer(enabled=tracing.get('enabled', False))
+        specs = config['stages']
+        size = config.get('queue_size', 1)
+        self.queues = [LatestQueue(size) for _ in range(len(specs) - 1)]
+        self.stages = []
+        for i, spec in enumerate(specs):
+            kind = spec['type']
+            if kind not in STAGE_TYPES:
+                raise ValueError(f"未知的阶段类型: {kind}，可选: {list(STAGE_TYPES)}")
+            func, cleanup = STAGE_TYPES[kind](spec, self)
+            inbox = self.queues[i - 1] if i > 0 else None
+            outbox = self.queues[i] if i < len(self.queues) else None
+            name = spec.get('name', kind)
+            if kind in CLOCKED_STAGES:
+                rate_hz = 1.0 / spec.get('nominal_dt', DEFAULT_NOMINAL_DT)
+                stage = ClockedStage(name, func, inbox, outbox, cleanup, rate_hz=rate_hz,
+                                     spin=spec.get('spin', 0.0005))
+            else:
+                stage = Stage(name, func, inbox, outbox, cleanup)
+            self.stages.append(stage)
+        self.started = None
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_CONFIG):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def start(self):
+        self.started = time.perf_counter()
+        port = self.config.get('tracing', {}).get('port')
+        if self.tracer.enabled and port is not None:
+            port = self.tracer.serve(port)
+            print(f"延迟追踪: http://127.0.0.1:{port}/ （/json为JSON）")
+        # 从下游往上游启动，保证第一帧产生时各阶段都已就绪
+        for stage in reversed(self.stages):
+            stage.start()
+
+    def stop(self, timeout=2.0):
+        for stage in self.stages:
+            stage.stop()
+        for stage in self.stages:
+            stage.join(timeout)
+        dump = self.config.get('tracing', {}).get('dump')
+        if self.tracer.enabled and dump:
+            self.tracer.dump_json(dump)
+        self.tracer.close()
+
+    def running(self):
+        return any(stage.is_alive() for stage in self.stages)
+
+    def stats(self):
+        """各阶段处理速率/占用率、各队列丢帧数与端到端延迟（可JSON序列化）"""
+        elapsed = max(time.perf_counter() - self.started, 1e-9) if self.started else 0.0
+        return {
+            'elapsed': elapsed,
+            'stages': {
+                s.name: {
+                    'processed': s.processed,
+                    'fps': s.processed / elapsed if elapsed else 0.0,
+                    'busy': s.busy / elapsed if elapsed else 0.0,
+                    'errors': s.errors,
+                } for s in self.stages
+            },
+            'dropped': {f'{a.name}->{b.name}': q.dropped
+                        for a, b, q in zip(self.stages, self.stages[1:], self.queues)},
+            'latency': self.latency.summary(),
+            'tracing': self.tracer.summary()['stages'] if self.tracer.enabled else None,
+            'load_shedding': self.shedder.stats() if self.shedder is not None else None,
+            'control_loop': {s.name: s.loop.stats() for s in self.stages if isinstance(s, ClockedStage)},
+        }
+
+    def run(self, duration=None):
+        """启动并阻塞，直到数据源结束、达到duration秒或Ctrl+C"""
+        interval = self.config.get('stats_interval', 1.0)
+        self.start()
+        next_report = time.perf_counter() + interval
+        try:
+            while self.running():
+                time.sleep(0.05)
+                now = time.perf_counter()
+                if duration is not None and now - self.started >= duration:
+                    break
+                if interval and now >= next_report:
+                    next_report = now + interval
+                    self.print_stats()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+        return self.stats()
+
+    def print_stats(self):
+        s = self.stats()
+        stages = ' | '.join(f"{name} {v['fps']:.1f}fps {v['busy']:.0%}" for name, v in s['stages'].items())
+        dropped = sum(s['dropped'].values())
+        p50, p99 = s['latency']['p50'], s['latency']['p99']
+        latency = f"{p50 * 1000:.1f}/{p99 * 1000:.1f}ms" if p50 is not None else "-"
+        quality = f" | 画质 {s['load_shedding']['level']}" if s['load_shedding'] else ""
+        print(f"{stages} | 丢帧 {dropped} | 延迟p50/p99 {latency}{quality}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCMS运行入口：采集→检测→控制→发送")
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help="JSON配置文件路径")
+    parser.add_argument('--duration', type=float, default=None, help="运行秒数，默认一直运行")
+    args = parser.parse_args()
+
+    runtime = Runtime.from_file(args.config)
+    stats = runtime.run(args.duration)
+    print(json.dumps(stats, indent=2, ensure_ascii=False))
+    if runtime.tracer.enabled:
+        print(runtime.tracer.report())
+
+
+if __name__ == "__main__":
+    main()
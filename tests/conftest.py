@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 测试按仓库根目录的包路径导入（basic_functional.xxx、HAL.xxx）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
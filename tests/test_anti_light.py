@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from basic_functional.anti_light import (calculate_gray_variance, calculate_gray_variance_batch,
+                                         collect_yolo_boxes, process_yolo_results)
+
+
+def _frame(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+
+def _boxes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    x1 = rng.uniform(0, 140, count)
+    y1 = rng.uniform(0, 100, count)
+    w = rng.uniform(1, 160 - x1)
+    h = rng.uniform(1, 120 - y1)
+    return np.stack([x1, y1, x1 + w, y1 + h], axis=1)
+
+
+@pytest.mark.parametrize('gray', [False, True])
+def test_batch_matches_scalar(gray):
+    image = _frame()
+    if gray:
+        image = image[:, :, 0].copy()
+    boxes = _boxes(40)
+    variances, means = calculate_gray_variance_batch(image, boxes)
+    for box, var, mean in zip(boxes, variances, means):
+        ref_var, ref_mean = calculate_gray_variance(image, list(box))
+        assert mean == pytest.approx(ref_mean, rel=1e-9)
+        assert var == pytest.approx(ref_var, rel=1e-6, abs=1e-6)
+
+
+def test_batch_accepts_six_columns_and_flags_empty_boxes():
+    image = _frame(1)
+    boxes = [[10, 10, 50, 40, 0.9, 0], [30, 30, 30, 60, 0.8, 1], [0, 0, 160, 120, 0.5, 2]]
+    variances, means = calculate_gray_variance_batch(image, boxes)
+    assert np.isnan(variances[1]) and np.isnan(means[1])
+    ref = calculate_gray_variance(image, boxes[0])
+    assert (variances[0], means[0]) == pytest.approx(ref)
+    assert calculate_gray_variance_batch(image, np.empty((0, 4)))[0].size == 0
+    with pytest.raises(ValueError):
+        calculate_gray_variance_batch(image, [[1, 2, 3]])
+
+
+def test_process_yolo_results_picks_max_variance_box():
+    image = np.full((100, 100, 3), 128, np.uint8)
+    image[60:80, 60:80:2] = 255                       # 条纹块方差最大
+    boxes = [[0, 0, 30, 30], [55, 55, 85, 85], [20, 60, 40, 90]]
+    center, variance = process_yolo_results(image, boxes)
+    assert center == [70.0, 70.0]
+    assert variance == pytest.approx(calculate_gray_variance(image, boxes[1])[0])
+    assert process_yolo_results(image, []) == ([], -1)
+
+
+class _FakeTensor:
+    """模拟torch张量：记录设备到主机的拷贝次数"""
+    transfers = 0
+
+    def __init__(self, array):
+        self.array = np.asarray(array, dtype=np.float32)
+
+    def cpu(self):
+        _FakeTensor.transfers += 1
+        return self
+
+    def numpy(self):
+        return self.array
+
+
+class _FakeBoxes:
+    def __init__(self, data):
+        self.data = _FakeTensor(data)
+
+
+class _FakeResult:
+    def __init__(self, data):
+        self.boxes = _FakeBoxes(data)
+
+
+def test_collect_yolo_boxes_single_transfer_for_predict_and_track_layouts():
+    predict = [[0, 0, 10, 10, 0.9, 0], [5, 5, 20, 20, 0.3, 0], [1, 2, 3, 4, 0.8, 2]]
+    # track()多一列id，位于xyxy与conf之间
+    track = [[30, 30, 40, 40, 7, 0.95, 0], [50, 50, 60, 60, 8, 0.6, 1]]
+    results = [_FakeResult(predict), _FakeResult(track), _FakeResult(np.empty((0, 6)))]
+    _FakeTensor.transfers = 0
+    boxes = collect_yolo_boxes(results, classes={0}, conf_threshold=0.5)
+    assert _FakeTensor.transfers == len(results)
+    np.testing.assert_array_equal(boxes, [[0, 0, 10, 10], [30, 30, 40, 40]])
+
+
+def test_collect_yolo_boxes_plain_lists():
+    boxes = collect_yolo_boxes([[1, 2, 3, 4], [5, 6, 7, 8]], classes={0})
+    np.testing.assert_array_equal(boxes, [[1, 2, 3, 4], [5, 6, 7, 8]])
+    assert collect_yolo_boxes([]).shape == (0, 4)
@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.bench_vision import compare, main, measure, synthetic_frame
+
+
+def test_synthetic_frames_are_reproducible():
+    a, b = synthetic_frame(120, 160, seed=3), synthetic_frame(120, 160, seed=3)
+    assert a.shape == (120, 160, 3) and a.dtype == np.uint8
+    np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(a, synthetic_frame(120, 160, seed=4))
+
+
+def test_measure_respects_min_iters():
+    calls = []
+    samples = measure(lambda: calls.append(1), min_iters=7, min_time=0.0, warmup=2)
+    assert samples.size >= 7 and len(calls) == samples.size + 2
+    assert (samples >= 0).all()
+
+
+def test_compare_flags_only_regressions_over_threshold():
+    baseline = {'a@vga': {'p50_ms': 1.0}, 'b@vga': {'p50_ms': 1.0}}
+    results = {'a@vga': {'p50_ms': 1.05}, 'b@vga': {'p50_ms': 1.5}, 'c@vga': {'p50_ms': 9.0}}
+    regressions = compare(results, baseline, threshold=0.10)
+    assert [r[0] for r in regressions] == ['b@vga']
+    assert results['a@vga']['change'] == pytest.approx(0.05)
+    assert 'change' not in results['c@vga']
+
+
+def test_quick_run_writes_report(tmp_path):
+    output = tmp_path / 'latest.json'
+    code = main(['--quick', '--filter', 'extract_blobs', '--output', str(output),
+                 '--baseline', str(tmp_path / 'missing.json')])
+    assert code == 0
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert list(report['results']) == ['extract_blobs@vga']
+    assert report['results']['extract_blobs@vga']['iterations'] >= 5
@@ -0,0 +1,50 @@
+import cv2
+import numpy as np
+import pytest
+
+from image_detection.blob_detect import BLOB_DTYPE, extract_blobs, target_offset
+
+
+def _mask():
+    mask = np.zeros((120, 160), np.uint8)
+    mask[10:20, 10:30] = 255      # 面积200，质心(19.5, 14.5)
+    mask[50:90, 100:140] = 255    # 面积1600
+    mask[100:103, 5:8] = 255      # 面积9
+    return mask
+
+
+def test_blobs_sorted_by_area_with_stats():
+    blobs = extract_blobs(_mask())
+    assert blobs.dtype == BLOB_DTYPE
+    np.testing.assert_array_equal(blobs['area'], [1600, 200, 9])
+    big, mid = blobs[0], blobs[1]
+    assert (big['x'], big['y'], big['w'], big['h']) == (100, 50, 40, 40)
+    assert (mid['cx'], mid['cy']) == pytest.approx((19.5, 14.5))
+
+
+def test_area_filters_and_top_k():
+    np.testing.assert_array_equal(extract_blobs(_mask(), min_area=10)['area'], [1600, 200])
+    np.testing.assert_array_equal(extract_blobs(_mask(), max_area=1000)['area'], [200, 9])
+    np.testing.assert_array_equal(extract_blobs(_mask(), top_k=1)['area'], [1600])
+
+
+def test_matches_find_contours_count():
+    rng = np.random.default_rng(0)
+    mask = (rng.random((200, 200)) > 0.97).astype(np.uint8) * 255
+    n, _ = cv2.connectedComponents(mask, connectivity=8)
+    blobs = extract_blobs(mask)
+    assert len(blobs) == n - 1
+    assert blobs['area'].sum() == np.count_nonzero(mask)
+
+
+def test_empty_and_invalid_masks():
+    assert len(extract_blobs(np.zeros((10, 10), np.uint8))) == 0
+    assert len(extract_blobs(None)) == 0
+    with pytest.raises(ValueError):
+        extract_blobs(np.zeros((10, 10, 3), np.uint8))
+
+
+def test_target_offset():
+    blobs = extract_blobs(_mask())
+    assert target_offset(blobs, (120, 160, 3)) == pytest.approx((119.5 - 80, 69.5 - 60))
+    assert target_offset(extract_blobs(np.zeros((5, 5), np.uint8)), (5, 5)) is None
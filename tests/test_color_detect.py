@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from image_detection.blob_detect import extract_blobs
+from image_detection.color_detect import extract_red_regions, extract_regions_in_depth_band
+
+RED = (40, 40, 200)
+
+
+def _scene():
+    """灰色背景上三个红色方块：近处(0.8m)、远处(4m)，以及一个跨越深度边界的方块"""
+    image = np.full((240, 320, 3), 90, np.uint8)
+    depth = np.full((240, 320), 4000, np.uint16)
+    image[40:80, 40:80] = RED
+    depth[40:80, 40:80] = 800
+    image[150:190, 200:240] = RED            # 远处，范围外
+    image[100:140, 120:160] = RED
+    depth[100:140, 120:142] = 800            # 左半部分在范围内，右半部分在范围外
+    return image, depth
+
+
+def test_out_of_band_pixels_never_in_mask():
+    image, depth = _scene()
+    mask = extract_regions_in_depth_band(image, depth, min_depth=0.5, max_depth=2.0, show=False)
+    in_band = (depth >= 500) & (depth <= 2000)
+    assert np.count_nonzero(mask[~in_band]) == 0
+    # 范围内的部分与整帧颜色分割一致
+    full = extract_red_regions(image=image, show=False)
+    np.testing.assert_array_equal(mask[in_band], full[in_band])
+
+
+def test_only_near_targets_are_detected():
+    image, depth = _scene()
+    mask = extract_regions_in_depth_band(image, depth, min_depth=0.5, max_depth=2.0, show=False)
+    blobs = extract_blobs(mask, min_area=50)
+    np.testing.assert_array_equal(np.sort(blobs['area']), [40 * 22, 40 * 40])
+
+
+def test_empty_band_returns_empty_mask():
+    image, depth = _scene()
+    mask = extract_regions_in_depth_band(image, depth, min_depth=5.0, max_depth=6.0, show=False)
+    assert mask.shape == image.shape[:2] and not mask.any()
+
+
+def test_invalid_arguments():
+    image, depth = _scene()
+    with pytest.raises(ValueError):
+        extract_regions_in_depth_band(image, depth, color='green', show=False)
+    with pytest.raises(ValueError):
+        extract_regions_in_depth_band(image, depth[:100], show=False)
@@ -0,0 +1,43 @@
+import time
+
+from basic_functional.control_loop import ControlLoop
+
+
+def test_runs_at_rate_and_reports_dt():
+    dts = []
+    loop = ControlLoop(200, dts.append)
+    start = time.perf_counter()
+    loop.run(max_cycles=40)
+    elapsed = time.perf_counter() - start
+    assert loop.cycles == 40 and len(dts) == 40
+    assert 0.15 <= elapsed < 0.5
+    assert dts[0] == loop.period
+    stats = loop.stats()
+    assert stats['cycles'] == 40 and stats['dt']['count'] == 40
+
+
+def test_overrun_skips_missed_cycles_and_false_stops():
+    calls = []
+
+    def step(dt):
+        calls.append(dt)
+        if len(calls) == 2:
+            time.sleep(0.035)       # 超时3个多周期
+        return len(calls) < 5
+
+    loop = ControlLoop(100, step)
+    loop.run()
+    assert len(calls) == 5
+    assert loop.overruns >= 1 and loop.skipped >= 3
+    assert calls[2] >= 0.035
+
+
+def test_start_stop_in_background():
+    loop = ControlLoop(100, lambda dt: None)
+    loop.start()
+    time.sleep(0.1)
+    loop.stop()
+    assert loop.cycles > 0
+    cycles = loop.cycles
+    time.sleep(0.05)
+    assert loop.cycles == cycles
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from image_detection.basic_image_process import DenoiseEngine, denoise_image
+
+
+def _noisy(shape=(120, 160, 3), seed=0):
+    rng = np.random.default_rng(seed)
+    image = np.full(shape, 100, np.uint8)
+    image[30:90, 40:120] = 180
+    noise = rng.integers(-25, 26, shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize('method', ['median', 'gaussian', 'non_local_means'])
+def test_full_frame_matches_denoise_image(method):
+    image = _noisy()
+    engine = DenoiseEngine(method=method, color_order='bgr')
+    try:
+        np.testing.assert_array_equal(engine.denoise(image),
+                                      denoise_image(None, image, method=method, color_order='bgr'))
+    finally:
+        engine.close()
+
+
+def test_roi_mode_only_touches_boxes_and_matches_full_frame_inside():
+    image = _noisy()
+    boxes = [(10, 10, 50, 40), (100, 60, 160, 120)]
+    engine = DenoiseEngine(method='median', color_order='bgr', roi_margin=4)
+    try:
+        result = engine.denoise(image, rois=boxes)
+        full = engine.denoise(image)
+    finally:
+        engine.close()
+    inside = np.zeros(image.shape[:2], bool)
+    for x1, y1, x2, y2 in boxes:
+        inside[y1:y2, x1:x2] = True
+    np.testing.assert_array_equal(result[~inside], image[~inside])
+    # 中值3×3的支撑半径为1，小于roi_margin，框内与整帧结果逐位一致
+    np.testing.assert_array_equal(result[inside], full[inside])
+
+
+def test_rgb_input_is_swapped_for_color_nlm():
+    image = _noisy(seed=1)
+    engine = DenoiseEngine(method='non_local_means', color_order='rgb')
+    try:
+        result = engine.denoise(image[:, :, ::-1].copy())
+    finally:
+        engine.close()
+    expected = denoise_image(None, image, method='non_local_means', color_order='bgr')
+    np.testing.assert_array_equal(result, expected[:, :, ::-1])
+
+
+def test_input_must_match_color_order():
+    engine = DenoiseEngine(method='median', color_order='gray')
+    try:
+        with pytest.raises(ValueError):
+            engine.denoise(_noisy())
+        assert engine.denoise(_noisy((40, 40))).shape == (40, 40)
+    finally:
+        engine.close()
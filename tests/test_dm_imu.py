@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('serial')
+
+from HAL.dm_imu import (PACKET_SIZE, REG_ACCEL, REG_EULER, REG_GYRO, SAMPLE_DTYPE, ImuRingBuffer,
+                        decode_packets, encode_packets)
+
+
+def _frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    regs = np.resize([REG_ACCEL, REG_GYRO, REG_EULER], n)
+    data = rng.normal(size=(n, 3)).astype(np.float32)
+    return regs, data
+
+
+def test_round_trip():
+    regs, data = _frames(50)
+    packets, ends, consumed, crc_errors = decode_packets(encode_packets(regs, data, slave_id=3))
+    assert crc_errors == 0
+    assert consumed == 50 * PACKET_SIZE
+    np.testing.assert_array_equal(packets['reg'], regs)
+    np.testing.assert_array_equal(packets['data'], data)
+    assert (packets['slave_id'] == 3).all()
+    np.testing.assert_array_equal(ends, np.arange(1, 51) * PACKET_SIZE)
+
+
+def test_corrupted_crc_is_rejected():
+    regs, data = _frames(5)
+    buf = bytearray(encode_packets(regs, data))
+    buf[2 * PACKET_SIZE + 6] ^= 0xFF            # 破坏第3帧的数据区
+    packets, _, consumed, crc_errors = decode_packets(bytes(buf))
+    assert crc_errors == 1
+    assert consumed == len(buf)
+    np.testing.assert_array_equal(packets['data'], data[[0, 1, 3, 4]])
+
+
+def test_garbage_between_frames():
+    regs, data = _frames(3)
+    raw = encode_packets(regs, data)
+    buf = b'\x00\x55\xAA\x0A' + raw[:PACKET_SIZE] + b'\x55\x13' + raw[PACKET_SIZE:]
+    packets, _, _, _ = decode_packets(buf)
+    np.testing.assert_array_equal(packets['data'], data)
+
+
+@pytest.mark.parametrize('split', [1, 2, PACKET_SIZE - 1, PACKET_SIZE + 7, 3 * PACKET_SIZE - 4])
+def test_frame_split_across_reads(split):
+    """模拟DMIMU.poll的用法：丢弃consumed字节，剩余部分与下一次读取拼接"""
+    regs, data = _frames(4)
+    raw = encode_packets(regs, data)
+    buf = bytearray(raw[:split])
+    first, _, consumed, _ = decode_packets(bytes(buf))
+    del buf[:consumed]
+    buf += raw[split:]
+    second, _, consumed, crc_errors = decode_packets(bytes(buf))
+    assert crc_errors == 0
+    assert consumed == len(buf)
+    decoded = np.concatenate((first['data'], second['data']))
+    np.testing.assert_array_equal(decoded, data)
+
+
+def _samples(start, n):
+    samples = np.zeros(n, dtype=SAMPLE_DTYPE)
+    samples['data'][:, 0] = np.arange(start, start + n)
+    return samples
+
+
+@pytest.mark.parametrize('sizes', [[3, 4, 5], [1, 17], [7, 10, 2, 9], [25]])
+def test_ring_buffer_keeps_latest_in_order(sizes):
+    ring = ImuRingBuffer(capacity=8)
+    written = 0
+    for n in sizes:
+        ring.push(_samples(written, n))
+        written += n
+        assert ring.total == written
+        expected = np.arange(max(0, written - 8), written)
+        np.testing.assert_array_equal(ring.latest()['data'][:, 0], expected)
+        np.testing.assert_array_equal(ring.latest(3)['data'][:, 0], expected[-3:])
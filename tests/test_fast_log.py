@@ -0,0 +1,80 @@
+import io
+import math
+
+import numpy as np
+import pytest
+
+from basic_functional import fast_log
+
+
+@pytest.fixture
+def logger():
+    """每个用例一个独立logger，输出写入StringIO"""
+    stream = io.StringIO()
+    fast_log.flush()
+    fast_log.set_stream(stream)
+    log = fast_log.FastLogger('test')
+    yield log, stream
+    fast_log.flush()
+    fast_log.set_stream(None)
+
+
+def _lines(stream):
+    fast_log.flush()
+    return stream.getvalue().splitlines()
+
+
+def test_level_filter_and_rate_limit(logger, monkeypatch):
+    log, stream = logger
+    now = [100.0]
+    monkeypatch.setattr(fast_log.time, 'monotonic', lambda: now[0])
+    log.debug("hidden %d", 1)
+    for i in range(5):
+        log.info("x=%d", i, every=1.0)
+    now[0] += 1.5
+    log.info("x=%d", 5, every=1.0)
+    lines = _lines(stream)
+    assert len(lines) == 2
+    assert lines[0].endswith("INFO test: x=0")
+    assert lines[1].endswith("INFO test: x=5 (已抑制4条)")
+
+
+def test_dump_round_trip_keeps_argument_order_and_types(logger, tmp_path):
+    log, _ = logger
+    log.enable_ring(8)
+    frame = bytes(range(20))
+    log.info("frame %r from %s after %d tries, err=%.2f", frame, '/dev/ttyUSB0', 3, 0.25)
+    log.info("value %s, then %r", float('nan'), b'\x01\x02')
+    log.info("name=%s code=%x", 'yaw', 255)
+    log.info("obj %s", {'k': [1, 2]})
+    log.warning("big %d", 10 ** 20)
+    log.info("huge %s", 10 ** 30)
+    path = tmp_path / 'dump.npz'
+    assert log.dump(path)
+    lines = fast_log.load_dump(path)
+    messages = [line.split(': ', 1)[1] for line in lines]
+    assert messages == [
+        f"frame {frame!r} from /dev/ttyUSB0 after 3 tries, err=0.25",
+        "value nan, then b'\\x01\\x02'",
+        "name=yaw code=ff",
+        "obj {'k': [1, 2]}",
+        "big 100000000000000000000",
+        f"huge {str(10 ** 30)[:fast_log.RAW_BYTES]}",
+    ]
+    assert ' WARNING test: ' in lines[-2]
+
+
+def test_dump_truncates_long_arguments_and_keeps_latest(logger, tmp_path):
+    log, _ = logger
+    log.enable_ring(3)
+    for i in range(5):
+        log.info("%d %s", i, 'é' * 20)          # 40字节UTF-8，截断在字符中间
+    path = tmp_path / 'dump.npz'
+    log.dump(path)
+    messages = [line.split(': ', 1)[1] for line in fast_log.load_dump(path)]
+    assert messages == [f"{i} {'é' * (fast_log.RAW_BYTES // 2)}" for i in (2, 3, 4)]
+
+
+def test_dump_without_ring_returns_false(logger, tmp_path):
+    log, _ = logger
+    assert log.dump(tmp_path / 'none.npz') is False
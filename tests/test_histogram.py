@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from basic_functional.histogram import LatencyHistogram
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_percentiles_match_numpy(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=np.log(0.002), sigma=1.0, size=20000)   # 约0.1ms~100ms
+    hist = LatencyHistogram()
+    for v in values:
+        hist.record(v)
+    # 默认precision_bits=5，相对误差不超过2^-4
+    tolerance = 2.0 ** -(hist.precision_bits - 1)
+    for p in PERCENTILES:
+        expected = np.percentile(values, p, method='inverted_cdf')
+        assert hist.percentile(p) == pytest.approx(expected, rel=tolerance)
+    assert hist.count == values.size
+    assert hist.min == values.min() and hist.max == values.max()
+    assert hist.mean == pytest.approx(values.mean())
+
+
+def test_small_values_are_exact():
+    hist = LatencyHistogram()
+    values = np.arange(1, 32) * 1e-6          # 小于2^precision_bits个单位时每个值独占一个桶
+    for v in values:
+        hist.record(v)
+    for p in (10, 50, 90):
+        expected = np.percentile(values, p, method='inverted_cdf')
+        assert hist.percentile(p) == pytest.approx(expected, abs=1e-9)
+
+
+def test_merge_equals_single_histogram():
+    rng = np.random.default_rng(3)
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for v in rng.exponential(0.005, 5000):
+        (a if rng.random() < 0.5 else b).record(v)
+        both.record(v)
+    a.merge(b)
+    assert a.counts == both.counts
+    assert [a.percentile(p) for p in PERCENTILES] == [both.percentile(p) for p in PERCENTILES]
+
+
+def test_empty_histogram():
+    hist = LatencyHistogram()
+    assert hist.percentile(50) is None
+    assert hist.summary()['count'] == 0
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from image_detection.blob_detect import extract_blobs
+from image_detection.load_shedder import LEVELS, LoadShedder, effective_levels, prepare_frame, restore_blobs
+
+
+def _feed(shedder, elapsed, frames):
+    for _ in range(frames):
+        if shedder.should_process():
+            shedder.record(elapsed)
+    return shedder.level.name
+
+
+def test_degrades_after_hold_and_recovers_slowly():
+    shedder = LoadShedder(0.010, hold=5, recover_hold=20, retry_interval=0.0)
+    assert _feed(shedder, 0.012, 4) == 'full'
+    assert _feed(shedder, 0.012, 1) == 'no_denoise'
+    assert _feed(shedder, 0.012, 5) == 'half_scale'
+    # 低于预算的recover_ratio倍，需连续recover_hold帧才升一级
+    assert _feed(shedder, 0.004, 19) == 'half_scale'
+    assert _feed(shedder, 0.004, 1) == 'no_denoise'
+    # 处于预算与recover_ratio之间：保持不动
+    assert _feed(shedder, 0.008, 100) == 'no_denoise'
+    assert [t[1:3] for t in shedder.transitions] == [
+        ('full', 'no_denoise'), ('no_denoise', 'half_scale'), ('half_scale', 'no_denoise')]
+
+
+def test_panic_degrades_every_two_frames_and_skips_frames():
+    shedder = LoadShedder(0.010, hold=10)
+    assert _feed(shedder, 0.050, 2) == 'no_denoise'
+    _feed(shedder, 0.050, 6)
+    assert shedder.level.name == 'skip_1'
+    processed = shedder.processed
+    assert [shedder.should_process() for _ in range(4)] == [True, False, True, False]
+    assert shedder.skipped == 2 and shedder.processed == processed
+
+
+def test_retry_interval_blocks_returning_to_overloaded_level():
+    shedder = LoadShedder(0.010, hold=2, recover_hold=3, retry_interval=60.0)
+    _feed(shedder, 0.012, 2)
+    assert shedder.level.name == 'no_denoise'
+    assert _feed(shedder, 0.001, 50) == 'no_denoise'
+
+
+def test_levels_without_denoise_skip_noops():
+    levels = effective_levels(LEVELS, denoise=False)
+    assert [level.name for level in levels] == ['full', 'half_scale', 'roi', 'skip_1', 'skip_2']
+    assert not any(level.denoise for level in levels)
+    assert effective_levels(LEVELS) == LEVELS
+    shedder = LoadShedder(0.010, hold=2, denoise=False)
+    assert _feed(shedder, 0.012, 2) == 'half_scale'
+
+
+@pytest.mark.parametrize('level', LEVELS)
+def test_prepare_and_restore_blobs(level):
+    mask = np.zeros((240, 320), np.uint8)
+    mask[100:140, 200:260] = 255
+    full = extract_blobs(mask)
+    box = tuple(int(full[0][k]) for k in ('x', 'y', 'w', 'h'))
+    image, transform = prepare_frame(mask, level, roi_box=box)
+    if level.roi:
+        assert image.shape[0] < 240 * level.scale
+    restored = restore_blobs(extract_blobs(image), transform)
+    assert len(restored) == 1
+    for key in ('x', 'y', 'w', 'h', 'cx', 'cy'):
+        assert restored[0][key] == pytest.approx(full[0][key], abs=1.0)
+    assert restored[0]['area'] == pytest.approx(full[0]['area'], rel=0.02)
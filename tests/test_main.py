@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+import main
+
+
+def _config(detect, control=None, capture=None):
+    return {
+        'queue_size': 1,
+        'stats_interval': 0,
+        'stages': [
+            dict({'type': 'capture', 'source': 'synthetic', 'fps': 60, 'width': 160, 'height': 120},
+                 **(capture or {})),
+            dict({'type': 'detect'}, **detect),
+            dict({'type': 'control', 'nominal_dt': 0.01, 'stale_after': 0.1}, **(control or {})),
+            {'type': 'transmit', 'sink': 'null'},
+        ],
+    }
+
+
+def _stalling_detect(cfg, runtime):
+    """前几帧立即给出偏移，之后每帧卡顿cfg['stall']秒"""
+    def run(item):
+        item.pop('frame')
+        item.pop('depth', None)
+        if item['id'] >= 3:
+            time.sleep(cfg['stall'])
+        item['blobs'] = None
+        item['offset'] = (5.0, -3.0)
+        return item
+    return run, None
+
+
+def test_control_keeps_its_rate_when_detection_stalls(monkeypatch):
+    monkeypatch.setitem(main.STAGE_TYPES, 'detect', _stalling_detect)
+    runtime = main.Runtime(_config({'stall': 0.8}))
+    stats = runtime.run(duration=0.6)
+    control = stats['stages']['control']
+    # 检测只完成了3帧，控制阶段仍按100Hz运行（单核机器上留足余量）
+    assert stats['stages']['detect']['processed'] <= 4
+    assert control['processed'] >= 30
+    assert abs(stats['control_loop']['control']['dt']['p50'] - 0.01) < 0.002
+    assert stats['stages']['transmit']['processed'] >= 20
+    # 只有取到新检测结果的周期计入端到端延迟
+    assert stats['latency']['count'] <= 4
+    # 检测超过stale_after没有新结果：按丢失目标处理，输出中立值
+    assert runtime.last_item['fresh'] is False
+    assert runtime.last_item['outputs'] == {1: 127, 2: 127}
+
+
+def test_pipeline_drains_and_exits_when_source_ends():
+    runtime = main.Runtime(_config({'color': 'red'}, capture={'max_frames': 10}))
+    start = time.perf_counter()
+    stats = runtime.run(duration=5.0)
+    assert time.perf_counter() - start < 2.0
+    assert stats['stages']['capture']['processed'] == 10
+    assert all(s['errors'] == 0 for s in stats['stages'].values())
+    assert runtime.last_item['offset'] is not None
+
+
+def test_latest_queue_drops_oldest():
+    q = main.LatestQueue(2)
+    for i in range(5):
+        q.put(i)
+    assert q.dropped == 3 and len(q) == 2
+    assert q.get(timeout=0) == 3
+    q.put(5)
+    q.put(6)
+    assert q.get_latest() == 6 and q.dropped == 5
+    assert q.get(timeout=0.01) is None
+    q.put(7)
+    q.close()
+    assert q.get() == 7 and q.get() is None and q.closed
+
+
+def test_latest_queue_wakes_waiting_consumer_on_close():
+    import threading
+    q = main.LatestQueue()
+    result = []
+    consumer = threading.Thread(target=lambda: result.append(q.get(timeout=5)))
+    consumer.start()
+    time.sleep(0.05)
+    q.close()
+    consumer.join(1.0)
+    assert result == [None]
+
+
+def test_control_requires_two_channels():
+    with pytest.raises(ValueError):
+        main.Runtime(_config({'color': 'red'}, control={'channels': {'yaw': 1}}))
+
+
+def test_null_sink_rejects_keyboard():
+    config = _config({'color': 'red'})
+    config['stages'][-1]['keyboard'] = {'start': 15}
+    with pytest.raises(ValueError):
+        main.Runtime(config)
+
+
+def test_depth_band_requires_realsense():
+    with pytest.raises(ValueError):
+        main.Runtime(_config({'color': 'red', 'depth_band': [0.3, 3.0]}))
+
+
+def test_load_shedder_skips_denoise_level_without_denoise():
+    runtime = main.Runtime(_config({'color': 'red', 'budget_ms': 10}))
+    names = [level.name for level in runtime.shedder.levels]
+    assert 'no_denoise' not in names and names[:2] == ['full', 'half_scale']
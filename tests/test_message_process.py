@@ -0,0 +1,39 @@
+import pytest
+
+# message_process导入时会初始化pygame并依赖pyserial
+pytest.importorskip('pygame')
+pytest.importorskip('serial')
+
+from HAL.message_process import FRAME_SIZE, find_frame
+
+CHECK = {0: 0xA5, 5: 0x5A, 13: 0x3C, 19: 0xC3}
+
+
+def _frame(fill=0x11):
+    frame = bytearray([fill] * FRAME_SIZE)
+    for idx, val in CHECK.items():
+        frame[idx] = val
+    return bytes(frame)
+
+
+def test_frame_at_start():
+    assert find_frame(_frame(), CHECK) == 0
+
+
+def test_frame_after_noise():
+    data = bytes([0xA5, 0x00, 0x5A] * 5) + _frame() + _frame(0x22)
+    assert find_frame(data, CHECK) == 15
+
+
+def test_partial_frame_not_found():
+    frame = _frame()
+    assert find_frame(frame[:-1], CHECK) == -1
+    assert find_frame(b'', CHECK) == -1
+    assert find_frame(frame[3:] + frame[:3], CHECK) == -1
+
+
+def test_one_wrong_check_byte():
+    frame = bytearray(_frame())
+    frame[13] = 0x3D
+    assert find_frame(bytes(frame), CHECK) == -1
+    assert find_frame(bytes(frame) + _frame(), CHECK) == FRAME_SIZE
@@ -0,0 +1,29 @@
+import numpy as np
+
+from image_detection.parallel_pipeline import ParallelVisionPipeline, _load_frames, detect_red_blobs
+
+
+def test_results_match_serial_detection_in_order():
+    frames = _load_frames(None, 12)
+    with ParallelVisionPipeline(frames[0].shape, stage='red', workers=2, slots=3,
+                                stage_params={'min_area': 50, 'top_k': 3}) as pipe:
+        for frame in frames:
+            assert pipe.submit(frame, block=True, timeout=10) is not None
+        results = list(pipe.results(wait=True, timeout=10))
+        stats = pipe.stats()
+    assert [frame_id for frame_id, _ in results] == list(range(len(frames)))
+    for frame, (_, blobs) in zip(frames, results):
+        np.testing.assert_array_equal(blobs, detect_red_blobs(frame, min_area=50, top_k=3))
+    assert stats['completed'] == len(frames) and stats['errors'] == 0
+    assert stats['free_slots'] == 3
+
+
+def test_non_blocking_submit_drops_when_ring_is_full():
+    frames = _load_frames(None, 1)
+    with ParallelVisionPipeline(frames[0].shape, stage='red', workers=1, slots=1) as pipe:
+        ids = [pipe.submit(frames[0]) for _ in range(20)]
+        list(pipe.results(wait=True, timeout=10))
+        stats = pipe.stats()
+    assert ids[0] == 0
+    assert stats['dropped'] == ids.count(None) > 0
+    assert stats['submitted'] + stats['dropped'] == 20
@@ -0,0 +1,77 @@
+import pytest
+
+# pc_remote导入时需要pynput和图形环境（读取屏幕尺寸）
+pc_remote = pytest.importorskip('HAL.pc_remote')
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    """屏幕中心固定为(500, 400)，回中移动只记录调用并返回中心坐标"""
+    monkeypatch.setattr(pc_remote, 'center_x', 500.0)
+    monkeypatch.setattr(pc_remote, 'center_y', 400.0)
+    warps = []
+
+    def move(dx, dy):
+        warps.append((dx, dy))
+        return (500, 400)
+
+    monkeypatch.setattr(pc_remote, 'move_mouse_relative', move)
+    return warps
+
+
+def test_drain_accumulates_between_polls(screen):
+    capture = pc_remote.MouseDeltaCapture()
+    capture._last = (100, 100)
+    for x, y in [(103, 100), (110, 95), (108, 95)]:
+        capture._on_move(x, y)
+    assert capture.drain() == (8.0, -5.0, 3)
+    assert capture.drain() == (0.0, 0.0, 0)
+    assert screen == []
+
+
+def test_recenter_skips_only_the_warp_event(screen):
+    capture = pc_remote.MouseDeltaCapture(recenter=True, recenter_margin=50)
+    capture._last = (500, 400)
+    capture._on_move(560, 400)          # 超出margin，触发回中
+    assert screen == [(-60, 0)]
+    capture._on_move(500, 400)          # 回中产生的事件，忽略
+    capture._on_move(505, 398)
+    assert capture.drain() == (65.0, -2.0, 2)
+
+
+def test_lost_warp_event_does_not_jump(screen):
+    capture = pc_remote.MouseDeltaCapture(recenter=True, recenter_margin=50)
+    capture._last = (500, 400)
+    capture._on_move(440, 420)
+    # 回中事件丢失（或与真实移动合并），下一事件以回中目标为参考
+    capture._on_move(503, 401)
+    assert capture.drain() == (-57.0, 21.0, 2)
+
+
+def test_bind_frame_writes_current_and_later_keys():
+    source = pc_remote.KeyboardInputSource([127, 127, 127, 127])
+    frame = [0] * 20
+    source.bind_frame(frame)
+    assert frame[15:19] == [127] * 4
+    snapshot = source.publish([255, 0, 127, 127])
+    assert snapshot.seq == 1 and frame[15:19] == [255, 0, 127, 127]
+    assert source.publish([255, 0, 127, 127]) is snapshot      # 未变化不增加序号
+    source.unbind_frame(frame)
+    source.publish([0, 0, 0, 0])
+    assert frame[15:19] == [255, 0, 127, 127]
+
+
+@pytest.mark.parametrize('start, reserved', [
+    (17, ()),         # 超出20字节帧
+    (-1, ()),
+    (10, ()),         # 覆盖校验位13
+    (1, (1, 2)),      # 覆盖PID控制通道
+    (14, (16,)),
+])
+def test_bind_frame_rejects_bad_fields(start, reserved):
+    source = pc_remote.KeyboardInputSource([127, 127, 127, 127])
+    frame = [0] * 20
+    with pytest.raises(ValueError):
+        source.bind_frame(frame, start=start, reserved=reserved)
+    source.publish([1, 2, 3, 4])
+    assert frame == [0] * 20
@@ -0,0 +1,27 @@
+import pytest
+
+from basic_functional import pid, pid_new
+
+
+@pytest.mark.parametrize('module', [pid, pid_new])
+@pytest.mark.parametrize('dt', [1e-7, 0.0, 0.0005, 0.5, 10.0])
+def test_out_of_range_dt_uses_nominal_period(module, dt):
+    nominal, odd = module.ProportionalPID(), module.ProportionalPID()
+    for c in (nominal, odd):
+        c.update(1.0, dt=0.01)
+    assert odd.update(3.0, dt=dt) == nominal.update(3.0, dt=0.01)
+
+
+def test_dt_scales_integral_and_derivative():
+    c = pid.ProportionalPID(kp=0.0, ki=1.0, kd=0.0)
+    c.update(1.0, dt=0.02)
+    assert c.error_sum == pytest.approx(2.0)     # 两倍标称周期，积分累加两倍
+    d = pid.ProportionalPID(kp=0.0, ki=0.0, kd=1.0)
+    d.update(1.0, dt=0.01)
+    assert 127 - d.update(2.0, dt=0.02) == pytest.approx(0.5)   # 误差变化1，周期加倍，微分减半
+
+
+def test_without_dt_matches_fixed_period():
+    a, b = pid_new.ProportionalPID(), pid_new.ProportionalPID()
+    for x in (2.0, -1.0, 4.0):
+        assert a.update(x) == b.update(x, dt=b.nominal_dt)
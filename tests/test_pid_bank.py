@@ -0,0 +1,51 @@
+import numpy as np
+
+from basic_functional import pid, pid_new
+from basic_functional.pid_bank import MODE_REMOTE, MODE_SYMMETRIC, PIDBank
+
+
+def _random_dt(rng):
+    """大部分为标称周期附近的抖动，夹杂首帧(接近0)和卡顿(远大于标称)等超出合理范围的值"""
+    r = rng.random()
+    if r < 0.05:
+        return 1e-7
+    if r < 0.1:
+        return 1.0
+    if r < 0.2:
+        return None
+    return rng.uniform(0.005, 0.02)
+
+
+def test_bank_matches_scalar_controllers():
+    rng = np.random.default_rng(0)
+    kp, ki, kd = [0.5, 1.2, 0.3, 2.0], [0.1, 0.0, 0.05, 0.2], [0.2, 0.4, 0.0, 0.1]
+    modes = [MODE_REMOTE, MODE_SYMMETRIC, MODE_REMOTE, MODE_SYMMETRIC]
+    scalars = [
+        (pid.ProportionalPID if m == MODE_REMOTE else pid_new.ProportionalPID)(
+            kp=kp[i], ki=ki[i], kd=kd[i], deadband=0.1, max_output=127, nominal_dt=0.01)
+        for i, m in enumerate(modes)
+    ]
+    bank = PIDBank(kp=kp, ki=ki, kd=kd, deadband=0.1, max_output=127, mode=modes, nominal_dt=0.01)
+
+    for step in range(2000):
+        current = rng.normal(0, 3, 4)
+        current[rng.random(4) < 0.1] = 0.05          # 落入死区
+        dt = _random_dt(rng)
+        expected = [c.update(x, dt=dt) for c, x in zip(scalars, current)]
+        np.testing.assert_allclose(bank.update(current, dt=dt), expected, rtol=1e-12, atol=1e-9,
+                                   err_msg=f"step {step}, dt={dt}")
+        if step % 500 == 499:
+            bank.reset()
+            for c in scalars:
+                c.reset()
+
+
+def test_from_controllers_copies_state():
+    a, b = pid.ProportionalPID(kp=0.8), pid_new.ProportionalPID(kd=0.5)
+    for x in (1.0, 2.5, -0.7):
+        a.update(x)
+        b.update(x)
+    bank = PIDBank.from_controllers([a, b])
+    np.testing.assert_allclose(bank.update([1.5, 1.5], dt=0.012),
+                               [a.update(1.5, dt=0.012), b.update(1.5, dt=0.012)])
+
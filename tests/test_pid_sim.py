@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from basic_functional import pid, pid_new
+from basic_functional.pid_bank import MODE_REMOTE, MODE_SYMMETRIC
+from basic_functional.pid_sim import best, gain_grid, simulate
+
+
+def _scalar_trajectory(controller, mode, setpoint, steps, dt, plant, tau=0.1, gain=1.0,
+                       delay_steps=0, u_limit=None, pass_dt=False):
+    """逐步调用标量ProportionalPID的参考仿真，对象与simulate相同"""
+    target = -setpoint if mode == MODE_REMOTE else setpoint
+    offset = 127.0 if mode == MODE_REMOTE else 0.0
+    alpha = 1.0 - np.exp(-dt / tau)
+    pending = [0.0] * delay_steps
+    y, out = 0.0, []
+    for _ in range(steps):
+        u = controller.update(y, target, dt=dt if pass_dt else None) - offset
+        if delay_steps:
+            pending.append(u)
+            u = pending.pop(0)
+        if u_limit is not None:
+            u = min(max(u, -u_limit), u_limit)
+        if plant == 'first':
+            y += alpha * (gain * u - y)
+        else:
+            y += dt * gain * u
+        out.append(y)
+    return np.array(out)
+
+
+@pytest.mark.parametrize('mode, module', [(MODE_REMOTE, pid), (MODE_SYMMETRIC, pid_new)])
+@pytest.mark.parametrize('plant, delay, u_limit, pass_dt', [
+    ('first', 0.0, None, False),
+    ('first', 0.04, 20.0, True),
+    ('integrator', 0.02, None, False),
+])
+def test_simulate_matches_scalar_pid(mode, module, plant, delay, u_limit, pass_dt):
+    kp, ki, kd, db = gain_grid([0.2, 1.0], [0.0, 0.05], [0.0, 0.3], [0.1, 2.0])
+    dt, duration, setpoint = 0.01, 1.0, 30.0
+    _, traj = simulate(kp, ki, kd, db, mode=mode, setpoint=setpoint, duration=duration, dt=dt,
+                       plant=plant, delay=delay, u_limit=u_limit, pass_dt=pass_dt,
+                       return_trajectory=True)
+    steps = int(round(duration / dt))
+    for i in range(len(kp)):
+        controller = module.ProportionalPID(kp=kp[i], ki=ki[i], kd=kd[i], deadband=db[i], nominal_dt=dt)
+        expected = _scalar_trajectory(controller, mode, setpoint, steps, dt, plant,
+                                      delay_steps=int(round(delay / dt)), u_limit=u_limit, pass_dt=pass_dt)
+        np.testing.assert_allclose(traj[:, i], expected, rtol=1e-9, atol=1e-9, err_msg=f"gain set {i}")
+
+
+def test_metrics_and_best():
+    kp, ki, kd, db = gain_grid([0.01, 0.5, 1.5], [0.0, 0.1], [0.0], [0.1])
+    results = simulate(kp, ki, kd, db, setpoint=50.0, duration=3.0, plant='first', tau=0.15)
+    assert len(results) == 6
+    slow = results[(results.kp == 0.01) & (results.ki == 0.0)][0]
+    assert slow.settling_time == np.inf and slow.final_error > 10
+    top = best(results, n=2)
+    assert len(top) <= 2 and np.all(np.isfinite(top.settling_time))
+    assert np.all(np.diff(top.iae) >= 0)
+    with pytest.raises(ValueError):
+        simulate(1.0, 0.0, 0.0, plant='unknown')
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from HAL.sensor_sync import SensorStream
+
+
+def _reference(ts, vs, t, mode):
+    """逐个样本暴力查找的参考实现"""
+    if mode == 'previous':
+        candidates = np.flatnonzero(ts <= t)
+        return None if candidates.size == 0 else (ts[candidates[-1]], vs[candidates[-1]])
+    i = int(np.searchsorted(ts, t, 'left'))
+    lo, hi = max(i - 1, 0), min(i, ts.size - 1)
+    if mode == 'nearest':
+        k = lo if abs(t - ts[lo]) <= abs(ts[hi] - t) else hi
+        return ts[k], vs[k]
+    if lo == hi or ts[hi] == ts[lo]:
+        k = lo if abs(t - ts[lo]) <= abs(ts[hi] - t) else hi
+        return ts[k], vs[k]
+    w = (t - ts[lo]) / (ts[hi] - ts[lo])
+    return t, vs[lo] + (vs[hi] - vs[lo]) * w
+
+
+@pytest.mark.parametrize('mode', ['nearest', 'previous', 'linear'])
+def test_at_matches_brute_force(mode):
+    rng = np.random.default_rng(1)
+    capacity = 64
+    stream = SensorStream('imu', shape=(3,), capacity=capacity)
+    ts = np.cumsum(rng.uniform(0.001, 0.01, 200))
+    vs = rng.normal(size=(200, 3))
+    for k in range(ts.size):
+        stream.push(vs[k], t=ts[k])
+        # 缓冲区绕回后，有效样本为最近capacity个
+        start = max(0, k + 1 - capacity)
+        kept_t, kept_v = ts[start:k + 1], vs[start:k + 1]
+        queries = np.concatenate((rng.uniform(kept_t[0] - 0.01, kept_t[-1] + 0.01, 5),
+                                  kept_t[rng.integers(0, kept_t.size, 2)]))   # 含恰好等于样本时间的查询
+        for t in queries:
+            expected = _reference(kept_t, kept_v, t, mode)
+            got = stream.at(t, mode=mode)
+            if expected is None:
+                assert got is None
+            else:
+                assert got[0] == pytest.approx(expected[0])
+                np.testing.assert_allclose(got[1], expected[1])
+
+
+def test_tolerance_and_between():
+    stream = SensorStream('depth', capacity=16)
+    stream.push_many(np.arange(10.0), t=np.arange(10) * 0.1)
+    assert stream.at(0.42, tolerance=0.01) is None
+    assert stream.at(0.41, tolerance=0.02)[1] == 4.0
+    t, v = stream.between(0.2, 0.5)
+    np.testing.assert_array_equal(v, [2.0, 3.0, 4.0, 5.0])
+
+
+def test_out_of_order_samples_are_dropped():
+    stream = SensorStream('cam', capacity=8)
+    assert stream.push(1.0, t=1.0)
+    assert not stream.push(0.5, t=0.5)
+    assert stream.dropped == 1
+    assert len(stream) == 1
@@ -0,0 +1,30 @@
+import json
+import sys
+
+import pytest
+
+# 串口闭环依赖pyserial，message_process导入时还会初始化pygame
+pytest.importorskip('serial')
+pytest.importorskip('pygame')
+
+from benchmarks import system_bench
+
+
+def test_non_linux_exits_before_platform_modules(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, 'platform', 'win32')
+    output = tmp_path / 'system.json'
+    assert system_bench.main(['--quick', '--output', str(output)]) == 1
+    assert not output.exists()
+    # 模块级不引用仅POSIX可用的模块
+    assert not hasattr(system_bench, 'tty') and not hasattr(system_bench, 'resource')
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="需要Linux的pty与/proc")
+def test_quick_run_closes_the_loop(tmp_path):
+    output = tmp_path / 'system.json'
+    assert system_bench.main(['--quick', '--scenarios', 'vga_red', '--output', str(output)]) == 0
+    report = json.loads(output.read_text(encoding='utf-8'))
+    result = report['results']['vga_red']
+    assert result['serial_failures'] == 0 and result['echo_mismatches'] == 0
+    assert result['loop_hz'] > 0
+    assert report['emulator_frames'] > 0
@@ -0,0 +1,42 @@
+import numpy as np
+
+from image_detection.basic_image_process import TemporalDenoiser
+
+
+def test_static_noise_is_averaged():
+    rng = np.random.default_rng(0)
+    clean = np.full((96, 128), 100, np.uint8)
+    denoiser = TemporalDenoiser(alpha_min=0.1, motion_threshold=12)
+    for _ in range(30):
+        noisy = np.clip(clean + rng.normal(0, 5, clean.shape), 0, 255).astype(np.uint8)
+        out = denoiser.update(noisy)
+    assert denoiser.moving_blocks == 0
+    # 单帧噪声标准差约5，递归平均后明显下降
+    assert np.abs(out.astype(int) - 100).std() < 2.5
+
+
+def test_moving_blocks_take_current_frame_without_ghosting():
+    for shape in [(96, 128), (95, 130), (96, 128, 3)]:
+        background = np.full(shape, 100, np.uint8)
+        denoiser = TemporalDenoiser()
+        for _ in range(10):
+            denoiser.update(background)
+        frame = background.copy()
+        # 目标覆盖整块（block_size=16），包括右下角的不完整分块
+        frame[16:48, 32:64] = 200
+        frame[80:, 112:] = 200
+        out = denoiser.update(frame)
+        np.testing.assert_array_equal(out, frame)
+        # 目标消失后同样立即恢复背景
+        out = denoiser.update(background)
+        np.testing.assert_array_equal(out, background)
+
+
+def test_shape_change_and_reset_restart_accumulation():
+    denoiser = TemporalDenoiser()
+    first = np.full((32, 32), 50, np.uint8)
+    np.testing.assert_array_equal(denoiser.update(first), first)
+    other = np.full((16, 16), 70, np.uint8)
+    np.testing.assert_array_equal(denoiser.update(other), other)
+    denoiser.reset()
+    np.testing.assert_array_equal(denoiser.update(first), first)
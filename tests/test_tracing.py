@@ -0,0 +1,78 @@
+import json
+import urllib.request
+
+import pytest
+
+from basic_functional.tracing import Tracer
+
+
+def _trace(tracer, frame_id, offsets):
+    trace = tracer.begin(frame_id)
+    for stage, t in offsets:
+        trace.mark(stage, t=t)
+    tracer.finish(trace)
+
+
+def test_stage_and_end_to_end_histograms():
+    tracer = Tracer()
+    for i in range(10):
+        _trace(tracer, i, [('acquire', 0.0), ('segment', 0.004), ('pid', 0.005), ('transmit', 0.007)])
+    s = tracer.summary()
+    assert s['frames'] == 10
+    assert list(s['stages']) == ['segment', 'pid', 'transmit']
+    assert s['stages']['segment']['p50'] == pytest.approx(0.004, rel=0.05)
+    assert s['stages']['transmit']['max'] == pytest.approx(0.002, rel=0.05)
+    assert s['end_to_end']['count'] == 10
+    assert s['end_to_end']['p99'] == pytest.approx(0.007, rel=0.05)
+    assert s['recent'][-1]['frame_id'] == 9
+    assert s['recent'][-1]['marks'][-1] == ('transmit', pytest.approx(0.007))
+    assert 'segment' in tracer.report()
+
+
+def test_disabled_and_incomplete_traces_are_ignored():
+    tracer = Tracer(enabled=False)
+    assert tracer.begin(0) is None
+    tracer.finish(None)
+    tracer = Tracer()
+    _trace(tracer, 0, [('acquire', 0.0)])
+    assert tracer.summary()['frames'] == 0
+
+
+def test_dump_json_and_http_endpoint(tmp_path):
+    tracer = Tracer(keep=2)
+    for i in range(3):
+        _trace(tracer, i, [('acquire', 0.0), ('transmit', 0.003)])
+    path = tmp_path / 'trace.json'
+    tracer.dump_json(path)
+    dumped = json.loads(path.read_text(encoding='utf-8'))
+    assert dumped['frames'] == 3 and [r['frame_id'] for r in dumped['recent']] == [1, 2]
+    port = tracer.serve(0)
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/json', timeout=5) as resp:
+            assert json.load(resp)['frames'] == 3
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=5) as resp:
+            assert 'end_to_end' in resp.read().decode('utf-8')
+    finally:
+        tracer.close()
+    tracer.reset()
+    assert tracer.summary()['frames'] == 0
+
+
+def test_runtime_traces_each_detected_frame():
+    import main
+    config = {
+        'stats_interval': 0,
+        'tracing': {'enabled': True},
+        'stages': [
+            {'type': 'capture', 'source': 'synthetic', 'fps': 60, 'width': 160, 'height': 120,
+             'max_frames': 8},
+            {'type': 'detect', 'color': 'red'},
+            {'type': 'control'},
+            {'type': 'transmit', 'sink': 'null'},
+        ],
+    }
+    runtime = main.Runtime(config)
+    stats = runtime.run(duration=5.0)
+    stages = stats['tracing']
+    assert {'detect.queue', 'segment', 'control.queue', 'pid', 'transmit'} <= set(stages)
+    assert runtime.tracer.summary()['frames'] == stats['latency']['count'] > 0
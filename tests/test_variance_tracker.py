@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from basic_functional.anti_light import VarianceTargetTracker, calculate_gray_variance, process_yolo_results
+
+
+def _scene():
+    image = np.full((120, 160, 3), 100, np.uint8)
+    image[20:50, 20:50:2] = 200       # 方差最大
+    image[70:100, 100:130:3] = 180
+    return image
+
+
+BOXES = [[20, 20, 50, 50], [100, 70, 130, 100], [60, 10, 80, 30]]
+
+
+def test_matches_process_yolo_results_and_reuses_cached_scores():
+    image = _scene()
+    tracker = VarianceTargetTracker(rescore_interval=5)
+    assert tracker.update(image, BOXES) == process_yolo_results(image, BOXES)
+    assert tracker.rescored == 3 and tracker.reused == 0
+
+    # 框抖动一个像素：IoU仍高于reuse_iou，全部沿用缓存方差
+    jittered = [[x1 + 0.5, y1, x2 + 0.5, y2] for x1, y1, x2, y2 in BOXES]
+    center, variance = tracker.update(image, jittered)
+    assert tracker.rescored == 0 and tracker.reused == 3
+    assert center == [35.5, 35.0]
+    assert variance == pytest.approx(calculate_gray_variance(image, BOXES[0])[0])
+
+    # 新出现的框单独打分，其余照常沿用
+    tracker.update(image, jittered + [[0, 100, 20, 120]])
+    assert tracker.rescored == 1 and tracker.reused == 3
+
+
+def test_cached_scores_expire_after_rescore_interval():
+    image = _scene()
+    tracker = VarianceTargetTracker(rescore_interval=3)
+    tracker.update(image, BOXES)
+    rescored = []
+    for _ in range(5):
+        tracker.update(image, BOXES)
+        rescored.append(tracker.rescored)
+    assert rescored == [0, 0, 3, 0, 0]
+
+
+def test_switch_margin_and_lost_tracks():
+    image = _scene()
+    tracker = VarianceTargetTracker(switch_margin=10.0, max_missed=1)
+    center, _ = tracker.update(image, BOXES[1:])
+    assert center == [115.0, 85.0]
+    # 更好的目标出现，但优势不足switch_margin，不切换
+    assert tracker.update(image, BOXES)[0] == [115.0, 85.0]
+    # 当前目标消失后立即切换到剩余方差最大的框
+    assert tracker.update(image, [BOXES[0], BOXES[2]])[0] == [35.0, 35.0]
+    assert tracker.update(image, []) == ([], -1)
+    tracker.update(image, [])
+    assert tracker.tracks == []